@@ -1,3 +1,5 @@
+import importlib
+
 from . import decorators, facade, initialize, logger, util
 
 # re-export init functions
@@ -26,3 +28,46 @@ instrument = decorators.instrument
 # re-export logger functions
 handle_logs = logger.handle_logs
 ignore_logs = logger.ignore_logs
+
+# submodules that aren't imported by `import jot`, but can be reached as attributes of it
+_LAZY_SUBMODULES = frozenset(
+    {
+        "bench",
+        "calltree",
+        "chrometrace",
+        "debugserver",
+        "dedupe",
+        "errors",
+        "fanout",
+        "filesink",
+        "flightrecorder",
+        "influxdb",
+        "orphans",
+        "otlp",
+        "overhead",
+        "periodic",
+        "pg",
+        "print",
+        "profiler",
+        "prometheus",
+        "query",
+        "ratelimit",
+        "resources",
+        "rollbar",
+        "sampling",
+        "sentry",
+        "spanmetrics",
+        "sqlite",
+        "stats",
+        "store",
+        "tracebuffer",
+        "wrapper",
+        "zipkin",
+    }
+)
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
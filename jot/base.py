@@ -2,6 +2,31 @@ from time import monotonic_ns, time_ns
 
 from . import log, util
 
+_observers = []
+_sampler = None
+
+
+def add_observer(observer):
+    """Register an object to be notified when spans start and finish.
+
+    Observers must implement `span_started(span)` and `span_finished(span, tags)`.
+    """
+    _observers.append(observer)
+
+
+def remove_observer(observer):
+    _observers.remove(observer)
+
+
+def set_sampler(sampler):
+    """Install an object that decides whether new traces are sampled, or None to sample all.
+
+    The sampler must implement `sample(name)`, returning a tuple of whether a root span with that
+    name is sampled and the probability with which it was chosen. Child spans follow their parent.
+    """
+    global _sampler
+    _sampler = sampler
+
 
 class Meter:
     """The instrumentation interface"""
@@ -16,15 +41,17 @@ class Meter:
     def span(self, name, /, *, trace_id=None, parent_id=None, **kwtags):
         tags = {**self.tags, **kwtags}
         if trace_id is not None:
-            trace_id = trace_id
-            parent_id = parent_id
+            span = Span(trace_id=trace_id, parent_id=parent_id, name=name)
+            span.is_local_root = True
         elif self.active_span is not None:
-            trace_id = self.active_span.trace_id
-            parent_id = self.active_span.id
+            parent = self.active_span
+            span = Span(trace_id=parent.trace_id, parent_id=parent.id, name=name)
+            span.sampled = parent.sampled
+            span.sample_rate = parent.sample_rate
         else:
-            trace_id = None
-            parent_id = None
-        span = Span(trace_id=trace_id, parent_id=parent_id, name=name)
+            span = Span(name=name)
+            if _sampler is not None:
+                span.sampled, span.sample_rate = _sampler.sample(name)
         return Meter(self.target, span, **tags)
 
     def start(self, name=None, /, *, trace_id=None, parent_id=None, **kwtags):
@@ -37,6 +64,8 @@ class Meter:
             raise RuntimeError("No active span to start")
 
         self.active_span.start()
+        for observer in _observers:
+            observer.span_started(self.active_span)
 
     def finish(self, /, **kwtags):
         if self.active_span is None:
@@ -46,7 +75,14 @@ class Meter:
 
         tags = {**self.tags, **kwtags}
         self.active_span.finish()
-        self.target.finish(tags, self.active_span)
+        for observer in _observers:
+            observer.span_finished(self.active_span, tags)
+        if self.active_span.sampled:
+            if self.active_span.sample_rate < 1.0:
+                tags["sampling.rate"] = self.active_span.sample_rate
+            self.target.finish(tags, self.active_span)
+        else:
+            self.target.finish_unsampled(tags, self.active_span)
 
     def event(self, name, /, **kwtags):
         tags = {**self.tags, **kwtags}
@@ -118,6 +154,11 @@ class Span:
         self.name = name
         self.events = []
         self.baggage = {}
+        # the first span of the trace in this process, which finishes last; Meter.span sets this
+        # for spans that continue a remote trace
+        self.is_local_root = parent_id is None
+        self.sampled = True
+        self.sample_rate = 1.0
         self.start_time = None
         self._clock_start = None
         self._clock_finish = None
@@ -184,6 +225,14 @@ class Target:
     def finish(self, tags, span):
         pass
 
+    def finish_unsampled(self, tags, span):
+        """Called instead of `finish` for spans of traces that weren't sampled.
+
+        Targets that export spans should ignore these. Targets that compute metrics from spans or
+        hold state until a span finishes should still count or release it.
+        """
+        pass
+
     def event(self, name, tags, span=None):
         if span:
             event = Event(name, tags=tags)
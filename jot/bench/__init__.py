@@ -0,0 +1,52 @@
+"""Benchmarks for jot itself. Run `python -m jot.bench --help` for the available suites."""
+
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+
+def environment():
+    """Describe the interpreter and machine, to record alongside results"""
+    return {
+        "python": platform.python_version(),
+        "implementation": sys.implementation.name,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.time(),
+    }
+
+
+def measure(fn, number=None, repeat=5):
+    """Time calls to `fn`, returning the best and median time per call in nanoseconds.
+
+    If `number` is None, it is chosen so that each repetition takes at least 0.2 seconds.
+    """
+    timer = timeit.Timer(fn)
+    if number is None:
+        number, _ = timer.autorange()
+    per_call = [t / number * 1e9 for t in timer.repeat(repeat, number)]
+    return {
+        "number": number,
+        "repeat": repeat,
+        "best_ns": min(per_call),
+        "median_ns": statistics.median(per_call),
+    }
+
+
+def write_json(results, path):
+    document = {"environment": environment(), "results": results}
+    if path == "-":
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(path, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)["results"]
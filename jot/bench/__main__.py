@@ -0,0 +1,128 @@
+import argparse
+import sys
+
+from . import load_json, write_json
+
+
+def _progress(line):
+    print(line, file=sys.stderr)
+
+
+def micro(args):
+    from . import micro
+
+    results = micro.run(args.filter, args.number, args.repeat, _progress)
+    if args.compare:
+        for line in micro.compare(results, load_json(args.compare)):
+            print(line)
+    if args.json:
+        write_json(results, args.json)
+
+
+def load(args):
+    from . import load
+
+    results = load.run(
+        args.targets.split(","),
+        args.operations,
+        args.workers,
+        load.parse_mix(args.mix),
+        args.asyncio,
+        _progress,
+    )
+    if args.json:
+        write_json(results, args.json)
+
+
+def memory(args):
+    from . import memory
+
+    results = memory.run(
+        args.targets.split(","), args.items, args.open_spans, args.series, _progress
+    )
+    if args.json:
+        write_json(results, args.json)
+    if args.budget:
+        path = memory.DEFAULT_BUDGETS if args.budget is True else args.budget
+        failures = memory.check_budgets(results, memory.load_budgets(path))
+        for line in failures:
+            print(line, file=sys.stderr)
+        if failures:
+            sys.exit(1)
+
+
+def imports(args):
+    from . import imports
+
+    env = imports.parse_env(args.env)
+    results = imports.run(
+        args.modules or imports.DEFAULT_MODULES, args.runs, env, args.top, _progress
+    )
+    if args.json:
+        write_json(results, args.json)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m jot.bench")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    micro_parser = commands.add_parser("micro", help="time the per-call cost of jot's hot paths")
+    micro_parser.add_argument("--filter", help="only run benchmarks whose names match this regex")
+    micro_parser.add_argument("--number", type=int, help="calls per repetition (default: auto)")
+    micro_parser.add_argument("--repeat", type=int, default=5, help="repetitions per benchmark")
+    micro_parser.add_argument("--json", metavar="PATH", help="write results as JSON, - for stdout")
+    micro_parser.add_argument("--compare", metavar="PATH", help="compare with a previous JSON run")
+    micro_parser.set_defaults(run=micro)
+
+    load_parser = commands.add_parser("load", help="drive exporters against stub collectors")
+    load_parser.add_argument(
+        "--targets",
+        default="zipkin,influxdb2,influxdb3,otlp",
+        help="comma-separated targets to run",
+    )
+    load_parser.add_argument("--operations", type=int, default=1000, help="calls per worker")
+    load_parser.add_argument("--workers", type=int, default=4, help="threads or tasks")
+    load_parser.add_argument(
+        "--mix", default="spans=1,logs=1,metrics=1", help="relative weights of each operation"
+    )
+    load_parser.add_argument("--asyncio", action="store_true", help="use tasks, not threads")
+    load_parser.add_argument("--json", metavar="PATH", help="write results as JSON, - for stdout")
+    load_parser.set_defaults(run=load)
+
+    memory_parser = commands.add_parser("memory", help="measure memory used per item and at scale")
+    memory_parser.add_argument(
+        "--targets",
+        default="Target,PrintTarget,ZipkinTarget,InfluxDB3Target,OTLPTarget,PrometheusTarget",
+        help="comma-separated target classes to measure",
+    )
+    memory_parser.add_argument("--items", type=int, default=1000, help="items per measurement")
+    memory_parser.add_argument("--open-spans", type=int, default=100_000)
+    memory_parser.add_argument("--series", type=int, default=1_000_000, help="Prometheus series")
+    memory_parser.add_argument("--json", metavar="PATH", help="write results as JSON, - for stdout")
+    memory_parser.add_argument(
+        "--budget",
+        nargs="?",
+        const=True,
+        metavar="PATH",
+        help="JSON {name: max bytes}, by default the committed budgets; exit 1 if any is exceeded",
+    )
+    memory_parser.set_defaults(run=memory)
+
+    imports_parser = commands.add_parser("imports", help="measure import time in a new interpreter")
+    imports_parser.add_argument("modules", nargs="*", help="modules to import (default: jot)")
+    imports_parser.add_argument("--runs", type=int, default=5, help="runs per module")
+    imports_parser.add_argument("--top", type=int, default=10, help="slowest modules to report")
+    imports_parser.add_argument(
+        "--env", action="append", metavar="NAME=VALUE", help="set an environment variable"
+    )
+    imports_parser.add_argument(
+        "--json", metavar="PATH", help="write results as JSON, - for stdout"
+    )
+    imports_parser.set_defaults(run=imports)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""The time taken to import jot, measured in fresh interpreters.
+
+Each run starts a new Python process with `-X importtime` and imports one module. `total_us` is
+the cumulative import time of that module, including everything it imports, and `top` lists the
+modules that took the most time themselves. Setting environment variables lets you measure the
+cost of the targets `jot.init_from_environment()` would import.
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = ("jot",)
+DEFAULT_RUNS = 5
+DEFAULT_TOP = 10
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(output):
+    """Parse `-X importtime` output into a list of (module, self_us, cumulative_us, depth)"""
+    records = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+def measure_module(module, env=None, top=DEFAULT_TOP):
+    """Import a module in a new interpreter and return its import time breakdown"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records = parse_importtime(proc.stderr)
+
+    # site and its imports are loaded before the -c code runs, so only count what comes after
+    for i, (name, *_rest, depth) in enumerate(records):
+        if name == "site" and depth == 0:
+            records = records[i + 1 :]
+            break
+
+    total = sum(cumulative for _, _, cumulative, depth in records if depth == 0)
+    slowest = sorted(records, key=lambda r: r[1], reverse=True)[:top]
+    return {
+        "total_us": total,
+        "modules": len(records),
+        "top": [{"module": name, "self_us": self_us} for name, self_us, _, _ in slowest],
+    }
+
+
+def run(modules=DEFAULT_MODULES, runs=DEFAULT_RUNS, env=None, top=DEFAULT_TOP, progress=None):
+    """Measure each module's import time over several runs and return the median run"""
+    results = {}
+    for module in modules:
+        samples = [measure_module(module, env, top) for _ in range(runs)]
+        median = statistics.median_low([s["total_us"] for s in samples])
+        result = next(s for s in samples if s["total_us"] == median)
+        result["runs"] = runs
+        results[module] = result
+        if progress is not None:
+            progress(format_result(module, result))
+    return results
+
+
+def parse_env(assignments):
+    """Parse a list of NAME=VALUE strings into a dict"""
+    env = {}
+    for assignment in assignments or ():
+        name, sep, value = assignment.partition("=")
+        if not sep:
+            raise ValueError(f"Expected NAME=VALUE, got {assignment!r}")
+        env[name] = value
+    return env
+
+
+def format_result(module, result):
+    slowest = ", ".join(f"{m['module']} {m['self_us']}us" for m in result["top"][:3])
+    return (
+        f"{module}: {result['total_us'] / 1000:.1f}ms, "
+        f"{result['modules']} modules (slowest: {slowest})"
+    )
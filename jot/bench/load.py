@@ -0,0 +1,262 @@
+"""End-to-end throughput of the HTTP exporters against stub collectors on localhost.
+
+A single local server stands in for Zipkin, InfluxDB 2 and 3 and an OTLP/HTTP collector,
+accepting every request and counting requests and bytes. Each target is driven in turn by
+worker threads or asyncio tasks issuing a mix of spans, logs and metrics.
+"""
+
+import asyncio
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter, perf_counter_ns
+
+from .. import log, stats
+from ..base import Meter
+
+DEFAULT_MIX = {"spans": 1, "logs": 1, "metrics": 1}
+DEFAULT_OPERATIONS = 1000
+DEFAULT_WORKERS = 4
+
+# the URL paths each target sends to
+TARGETS = {
+    "zipkin": ("/api/v2/spans",),
+    "influxdb2": ("/api/v2/write",),
+    "influxdb3": ("/api/v3/write_lp",),
+    "otlp": ("/v1/traces", "/v1/logs", "/v1/metrics"),
+}
+
+
+class StubCollector:
+    """An HTTP server that accepts any POST and counts the requests and bytes per path"""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.requests = {}
+        self.bytes = {}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), _handler(self))
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self.server.serve_forever,
+            kwargs={"poll_interval": 0.1},
+            name="jot-stub-collector",
+            daemon=True,
+        )
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join(3.0)
+
+    def record(self, path, size):
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            self.bytes[path] = self.bytes.get(path, 0) + size
+
+    def totals(self, paths):
+        with self._lock:
+            requests = sum(self.requests.get(p, 0) for p in paths)
+            size = sum(self.bytes.get(p, 0) for p in paths)
+        return requests, size
+
+
+def _handler(collector):
+    class StubRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            collector.record(self.path.split("?", 1)[0], length)
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubRequestHandler
+
+
+def create_target(name, url):
+    """Create a target of the given kind that sends to the collector at `url`"""
+    if name == "zipkin":
+        from ..zipkin import ZipkinTarget
+
+        return ZipkinTarget(f"{url}/api/v2/spans", level=log.ALL)
+    if name == "influxdb2":
+        from ..influxdb import InfluxDB2Target
+
+        return InfluxDB2Target(url, "bench", level=log.ALL)
+    if name == "influxdb3":
+        from ..influxdb import InfluxDB3Target
+
+        return InfluxDB3Target(url, "bench", level=log.ALL)
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http._log_exporter import OTLPLogExporter
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        from ..otlp import OTLPTarget
+
+        return OTLPTarget(
+            span_exporter=OTLPSpanExporter(endpoint=f"{url}/v1/traces"),
+            log_exporter=OTLPLogExporter(endpoint=f"{url}/v1/logs"),
+            metric_exporter=OTLPMetricExporter(endpoint=f"{url}/v1/metrics"),
+            level=log.ALL,
+        )
+    raise ValueError(f"Unknown target: {name}")
+
+
+def _operations(mix, count, seed):
+    kinds = [kind for kind, weight in mix.items() for _ in range(weight)]
+    rng = random.Random(seed)
+    return [rng.choice(kinds) for _ in range(count)]
+
+
+def _perform(meter, kind):
+    started = perf_counter_ns()
+    if kind == "spans":
+        with meter.span("load", route="/bench"):
+            pass
+    elif kind == "logs":
+        meter.info("load", route="/bench")
+    else:
+        meter.count("load.requests", 1, route="/bench")
+    return perf_counter_ns() - started
+
+
+def _run_threads(meter, plans):
+    latencies = [[] for _ in plans]
+
+    def work(i):
+        latencies[i] = [_perform(meter, kind) for kind in plans[i]]
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(len(plans))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [ns for worker in latencies for ns in worker]
+
+
+def _run_tasks(meter, plans):
+    async def work(plan):
+        latencies = []
+        for kind in plan:
+            latencies.append(_perform(meter, kind))
+            await asyncio.sleep(0)
+        return latencies
+
+    async def run():
+        return await asyncio.gather(*(work(plan) for plan in plans))
+
+    return [ns for worker in asyncio.run(run()) for ns in worker]
+
+
+def run_target(
+    name,
+    collector,
+    operations=DEFAULT_OPERATIONS,
+    workers=DEFAULT_WORKERS,
+    mix=DEFAULT_MIX,
+    use_asyncio=False,
+):
+    """Drive one target with `workers` threads or tasks, each issuing `operations` calls"""
+    paths = TARGETS[name]
+    target = create_target(name, collector.url)
+    meter = Meter(target)
+    plans = [_operations(mix, operations, seed) for seed in range(workers)]
+
+    before_requests, before_bytes = collector.totals(paths)
+    before = _exporter_totals(target.stats_name)
+    started = perf_counter()
+    latencies = (_run_tasks if use_asyncio else _run_threads)(meter, plans)
+    elapsed = perf_counter() - started
+    after_requests, after_bytes = collector.totals(paths)
+    after = _exporter_totals(target.stats_name)
+
+    latencies.sort()
+    return {
+        "target": name,
+        "mode": "asyncio" if use_asyncio else "threads",
+        "workers": workers,
+        "operations": len(latencies),
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else None,
+        "latency_ns": {
+            "p50": _percentile(latencies, 50),
+            "p90": _percentile(latencies, 90),
+            "p99": _percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None,
+        },
+        "requests": after_requests - before_requests,
+        "bytes": after_bytes - before_bytes,
+        "failures": after["failures"] - before["failures"],
+        "dropped": after["dropped"] - before["dropped"],
+    }
+
+
+def run(
+    targets=tuple(TARGETS),
+    operations=DEFAULT_OPERATIONS,
+    workers=DEFAULT_WORKERS,
+    mix=DEFAULT_MIX,
+    use_asyncio=False,
+    progress=None,
+):
+    """Run each target in turn against a fresh stub collector, skipping uninstalled ones"""
+    collector = StubCollector().start()
+    results = []
+    try:
+        for name in targets:
+            try:
+                result = run_target(name, collector, operations, workers, mix, use_asyncio)
+            except ImportError as e:
+                if progress is not None:
+                    progress(f"{name}: skipped ({e})")
+                continue
+            results.append(result)
+            if progress is not None:
+                progress(format_result(result))
+    finally:
+        collector.stop()
+    return results
+
+
+def parse_mix(text):
+    """Parse a mix like "spans=2,logs=1,metrics=1" into a dict of weights"""
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation in mix: {kind}")
+        mix[kind] = int(weight or 1)
+    return mix
+
+
+def format_result(result):
+    latency = result["latency_ns"]
+    return (
+        f"{result['target']:<10} {result['throughput']:>10.0f} ops/s"
+        f"  p50 {latency['p50'] / 1000:>8.1f}us  p99 {latency['p99'] / 1000:>8.1f}us"
+        f"  {result['requests']:>6} requests  {result['bytes']:>10} bytes"
+        f"  {result['failures']} failed  {result['dropped']} dropped"
+    )
+
+
+def _exporter_totals(name):
+    totals = stats.snapshot()["targets"].get(name)
+    return {key: totals[key] if totals else 0 for key in ("failures", "dropped")}
+
+
+def _percentile(values, percentile):
+    if not values:
+        return None
+    rank = max(-(-percentile * len(values) // 100), 1)
+    return values[rank - 1]
@@ -0,0 +1,227 @@
+"""Memory used by jot per span, log record and metric point, and at scale.
+
+Memory is measured with tracemalloc. For each target, `bytes` is the mean peak allocation above
+the baseline while recording one item, and `retained_bytes` is what is still allocated per item
+afterwards. The scale benchmarks report the peak for many open spans and many counter series.
+"""
+
+import gc
+import json
+import os
+import tracemalloc
+
+from .. import log
+from ..base import Meter, Target
+from .micro import _stub_session
+
+DEFAULT_ITEMS = 1000
+DEFAULT_OPEN_SPANS = 100_000
+DEFAULT_SERIES = 1_000_000
+KINDS = ("span", "log", "metric")
+
+# measured with the default settings on CPython 3.12, with about 50% headroom
+DEFAULT_BUDGETS = os.path.join(os.path.dirname(__file__), "memory_budgets.json")
+
+
+class _Discard:
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def _null():
+    return Target(log.ALL)
+
+
+def _print():
+    from ..print import PrintTarget
+
+    return PrintTarget(log.ALL, file=_Discard())
+
+
+def _zipkin():
+    from ..zipkin import ZipkinTarget
+
+    return _stub_session(ZipkinTarget("http://localhost:9411/api/v2/spans", level=log.ALL))
+
+
+def _influxdb():
+    from ..influxdb import InfluxDB3Target
+
+    return _stub_session(InfluxDB3Target("http://localhost:8181", "bench", level=log.ALL))
+
+
+def _otlp():
+    from ..otlp import OTLPTarget
+
+    class Exporter:
+        def export(self, data):
+            pass
+
+    exporter = Exporter()
+    return OTLPTarget(exporter, exporter, exporter, level=log.ALL)
+
+
+def _prometheus():
+    from ..prometheus import PrometheusTarget
+
+    return PrometheusTarget(log.ALL, port=None)
+
+
+TARGETS = {
+    "Target": _null,
+    "PrintTarget": _print,
+    "ZipkinTarget": _zipkin,
+    "InfluxDB3Target": _influxdb,
+    "OTLPTarget": _otlp,
+    "PrometheusTarget": _prometheus,
+}
+
+
+def _operation(kind, meter, prefix):
+    if kind == "span":
+
+        def span(i):
+            with meter.span("bench", route="/"):
+                pass
+
+        return span
+    if kind == "log":
+        return lambda i: meter.info("bench", route="/")
+    # a fixed name and tags, so each point updates the same series
+    return lambda i: meter.count(f"{prefix}_requests", 1, route="/")
+
+
+def measure_items(fn, items=DEFAULT_ITEMS):
+    """Return the mean peak and retained bytes per call of `fn(i)`"""
+    for i in range(10):
+        fn(i)
+    gc.collect()
+    peaks = 0
+    start, _ = tracemalloc.get_traced_memory()
+    for i in range(items):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn(i)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks += peak - before
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    return {"bytes": peaks / items, "retained_bytes": max(end - start, 0) / items}
+
+
+def measure_open_spans(count=DEFAULT_OPEN_SPANS):
+    """Return the peak memory for `count` spans that have been started and not finished"""
+    meter = Meter(Target())
+    return _measure_scale(lambda: [meter.start("bench", route="/") for _ in range(count)], count)
+
+
+def measure_counter_series(count=DEFAULT_SERIES, prefix="jot_bench_memory"):
+    """Return the peak memory for `count` distinct counter series in a PrometheusTarget"""
+    target = _prometheus()
+
+    def create():
+        for i in range(count):
+            target.count(f"{prefix}_series", 1, {"series": str(i)})
+        return target
+
+    return _measure_scale(create, count)
+
+
+def _measure_scale(fn, count):
+    gc.collect()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    kept = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    current, _ = tracemalloc.get_traced_memory()
+    del kept
+    return {
+        "count": count,
+        "bytes": peak - before,
+        "retained_bytes": current - before,
+        "bytes_per_item": (current - before) / count,
+    }
+
+
+_runs = 0
+
+
+def run(
+    targets=tuple(TARGETS),
+    items=DEFAULT_ITEMS,
+    open_spans=DEFAULT_OPEN_SPANS,
+    series=DEFAULT_SERIES,
+    progress=None,
+):
+    """Run the memory benchmarks, skipping targets whose dependencies aren't installed"""
+    global _runs
+    _runs += 1
+    # prometheus metrics are registered globally, so each run needs its own names
+    prefix = f"jot_bench_memory_{_runs}"
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    results = []
+    try:
+        for name in targets:
+            try:
+                target = TARGETS[name]()
+            except ImportError as e:
+                if progress is not None:
+                    progress(f"{name}: skipped ({e})")
+                continue
+            meter = Meter(target)
+            for kind in KINDS:
+                result = {
+                    "name": f"{kind}.{name}",
+                    **measure_items(_operation(kind, meter, prefix), items),
+                }
+                results.append(result)
+                if progress is not None:
+                    progress(format_result(result))
+
+        scale = [("open_spans", lambda: measure_open_spans(open_spans))]
+        if "PrometheusTarget" in targets:
+            scale.append(("counter_series", lambda: measure_counter_series(series, prefix)))
+        for name, measure in scale:
+            try:
+                result = {"name": name, **measure()}
+            except ImportError as e:
+                if progress is not None:
+                    progress(f"{name}: skipped ({e})")
+                continue
+            results.append(result)
+            if progress is not None:
+                progress(format_result(result))
+    finally:
+        if started:
+            tracemalloc.stop()
+    return results
+
+
+def load_budgets(path=DEFAULT_BUDGETS):
+    """Load a budget file mapping result names to a maximum number of bytes"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def check_budgets(results, budgets):
+    """Return a line for each result whose `bytes` exceeds its budget in `budgets`"""
+    failures = []
+    for result in results:
+        budget = budgets.get(result["name"])
+        if budget is not None and result["bytes"] > budget:
+            failures.append(f"{result['name']}: {result['bytes']:.0f} bytes > budget {budget}")
+    return failures
+
+
+def format_result(result):
+    line = f"{result['name']:<28} {result['bytes']:>14,.0f} bytes"
+    line += f"  retained {result['retained_bytes']:>12,.0f}"
+    if "count" in result:
+        line += f"  for {result['count']:,} ({result['bytes_per_item']:,.0f} each)"
+    return line
@@ -0,0 +1,289 @@
+"""Micro-benchmarks of the per-call cost of the Meter and targets.
+
+Exporters are stubbed out, so the target benchmarks measure formatting and bookkeeping only.
+"""
+
+import asyncio
+import atexit
+import io
+import itertools
+import os
+import re
+import shutil
+import tempfile
+
+from .. import facade, log, util
+from ..base import Meter, Target
+from ..decorators import instrument
+from ..fanout import FanOutTarget
+from . import measure
+
+# async benchmarks await the instrumented function this many times per measured call, to
+# amortise the cost of running the event loop
+ASYNC_BATCH = 100
+
+BENCHMARKS = {}
+
+_prometheus_runs = itertools.count()
+
+
+def benchmark(name):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+
+    return register
+
+
+class _Response:
+    status_code = 200
+    text = ""
+
+
+def _stub_session(target):
+    target.session.post = lambda *args, **kwargs: _Response()
+    return target
+
+
+def _span(target, name="bench"):
+    meter = Meter(target).start(name)
+    meter.finish()
+    return meter.active_span
+
+
+# Meter
+
+
+@benchmark("meter.span")
+def meter_span():
+    meter = Meter(Target())
+    return lambda: meter.span("bench")
+
+
+@benchmark("meter.start_finish")
+def meter_start_finish():
+    meter = Meter(Target())
+
+    def run():
+        meter.start("bench").finish()
+
+    return run
+
+
+@benchmark("meter.context_manager")
+def meter_context_manager():
+    meter = Meter(Target(), None, service="bench")
+
+    def run():
+        with meter.span("bench", n=1):
+            pass
+
+    return run
+
+
+@benchmark("meter.log_accepted")
+def meter_log_accepted():
+    meter = Meter(Target(log.ALL))
+    return lambda: meter.info("hello", n=1)
+
+
+@benchmark("meter.log_rejected")
+def meter_log_rejected():
+    meter = Meter(Target(log.WARNING))
+    return lambda: meter.debug("hello", n=1)
+
+
+@benchmark("meter.count")
+def meter_count():
+    meter = Meter(Target())
+    return lambda: meter.count("requests", 1, route="/")
+
+
+@benchmark("meter.magnitude")
+def meter_magnitude():
+    meter = Meter(Target())
+    return lambda: meter.magnitude("load", 0.5, route="/")
+
+
+# decorators
+
+
+@benchmark("instrument.sync")
+def instrument_sync():
+    @instrument
+    def work():
+        pass
+
+    def run():
+        previous = facade.active_meter
+        facade.active_meter = Meter(Target())
+        try:
+            work()
+        finally:
+            facade.active_meter = previous
+
+    return run
+
+
+@benchmark("instrument.async")
+def instrument_async():
+    @instrument
+    async def work():
+        pass
+
+    async def batch():
+        for _ in range(ASYNC_BATCH):
+            await work()
+
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(batch())
+
+
+# dispatch and ids
+
+
+@benchmark("fanout.count")
+def fanout_count():
+    meter = Meter(FanOutTarget(Target(), Target(), Target()))
+    return lambda: meter.count("requests", 1, route="/")
+
+
+@benchmark("ids.trace_id")
+def ids_trace_id():
+    return util.generate_trace_id
+
+
+@benchmark("ids.span_id")
+def ids_span_id():
+    return util.generate_span_id
+
+
+# targets
+
+
+@benchmark("target.print.text")
+def target_print_text():
+    from ..print import PrintTarget
+
+    target = PrintTarget(log.ALL, file=io.StringIO())
+    span = _span(target)
+    return lambda: target.finish({"route": "/"}, span)
+
+
+@benchmark("target.print.json")
+def target_print_json():
+    from ..print import PrintTarget
+
+    target = PrintTarget(log.ALL, file=io.StringIO(), format="json")
+    span = _span(target)
+    return lambda: target.finish({"route": "/"}, span)
+
+
+@benchmark("target.zipkin.finish")
+def target_zipkin_finish():
+    from ..zipkin import ZipkinTarget
+
+    target = _stub_session(ZipkinTarget("http://localhost:9411/api/v2/spans"))
+    span = _span(target)
+    return lambda: target.finish({"route": "/"}, span)
+
+
+@benchmark("target.influxdb.count")
+def target_influxdb_count():
+    from ..influxdb import InfluxDB3Target
+
+    target = _stub_session(InfluxDB3Target("http://localhost:8181", "bench"))
+    return lambda: target.count("requests", 1, {"route": "/"})
+
+
+@benchmark("target.otlp.finish")
+def target_otlp_finish():
+    from ..otlp import OTLPTarget
+
+    class Exporter:
+        def export(self, data):
+            pass
+
+    target = OTLPTarget(span_exporter=Exporter())
+    span = _span(target)
+    return lambda: target.finish({"route": "/"}, span)
+
+
+@benchmark("target.otlp.count")
+def target_otlp_count():
+    from ..otlp import OTLPTarget
+
+    class Exporter:
+        def export(self, data):
+            pass
+
+    target = OTLPTarget(metric_exporter=Exporter())
+    return lambda: target.count("requests", 1, {"route": "/"})
+
+
+@benchmark("target.prometheus.count")
+def target_prometheus_count():
+    from ..prometheus import PrometheusTarget
+
+    # metrics are registered globally, so each run needs its own name
+    name = f"jot_bench_requests_{next(_prometheus_runs)}"
+    target = PrometheusTarget(port=None)
+    return lambda: target.count(name, 1, {"route": "/"})
+
+
+@benchmark("target.flightrecorder.finish")
+def target_flightrecorder_finish():
+    from ..flightrecorder import FlightRecorderTarget
+
+    directory = tempfile.mkdtemp(prefix="jot-bench-")
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    path = os.path.join(directory, "bench.rec")
+    target = FlightRecorderTarget(path, size=1024 * 1024)
+    span = _span(target)
+    return lambda: target.finish({"route": "/"}, span)
+
+
+def run(pattern=None, number=None, repeat=5, progress=None):
+    """Run the benchmarks whose names match `pattern`, returning a list of results.
+
+    Benchmarks whose optional dependencies aren't installed are skipped.
+    """
+    results = []
+    for name, setup in BENCHMARKS.items():
+        if pattern is not None and not re.search(pattern, name):
+            continue
+        try:
+            fn = setup()
+        except ImportError as e:
+            if progress is not None:
+                progress(f"{name}: skipped ({e})")
+            continue
+        result = {"name": name, **measure(fn, number, repeat)}
+        if name == "instrument.async":
+            for key in ("best_ns", "median_ns"):
+                result[key] /= ASYNC_BATCH
+        results.append(result)
+        if progress is not None:
+            progress(_format(result))
+    return results
+
+
+def compare(results, baseline):
+    """Return lines comparing the best time of each benchmark with a baseline run"""
+    before = {r["name"]: r for r in baseline}
+    lines = []
+    for result in results:
+        old = before.get(result["name"])
+        if old is None:
+            lines.append(f"{result['name']:<32} {result['best_ns']:>10.0f}ns (new)")
+            continue
+        change = (result["best_ns"] - old["best_ns"]) / old["best_ns"] * 100
+        lines.append(
+            f"{result['name']:<32} {old['best_ns']:>10.0f}ns -> {result['best_ns']:>10.0f}ns"
+            f" {change:+7.1f}%"
+        )
+    return lines
+
+
+def _format(result):
+    return f"{result['name']:<32} {result['best_ns']:>10.0f}ns (median {result['median_ns']:.0f}ns)"
@@ -0,0 +1,163 @@
+import json
+import threading
+
+from . import base, facade, flush, log, store
+from .periodic import Periodic
+
+DEFAULT_EXPORT_INTERVAL = 60.0
+FOLDED = "folded"
+JSON = "json"
+
+_tree = None
+
+
+def enable(export_interval=DEFAULT_EXPORT_INTERVAL, path=None, format=FOLDED):
+    """Start aggregating finished spans into a call tree.
+
+    Each span is placed in the tree under the chain of span names leading to it from its local
+    root, and its self time is its duration less the time spent in its children. Every
+    `export_interval` seconds, and when `jot.flush` is called, the tree is exported, either as
+    folded stacks weighted by self time in microseconds or as JSON. If `path` is given the output
+    is appended to that file; otherwise it is logged to the active target.
+    """
+    global _tree
+    disable()
+    _tree = CallTree(export_interval, path, format)
+    _tree.start()
+    return _tree
+
+
+def disable():
+    global _tree
+    if _tree is not None:
+        _tree.stop()
+        _tree = None
+
+
+class _Open:
+    __slots__ = ("path", "child_time")
+
+    def __init__(self, path):
+        self.path = path
+        self.child_time = 0
+
+
+class _Node:
+    __slots__ = ("count", "total", "self_time")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.self_time = 0
+
+
+class CallTree:
+    """A span observer that aggregates total and self time along call paths"""
+
+    def __init__(
+        self,
+        export_interval=DEFAULT_EXPORT_INTERVAL,
+        path=None,
+        format=FOLDED,
+        max_spans=store.DEFAULT_MAX_SIZE,
+        span_ttl=store.DEFAULT_TTL,
+    ):
+        if format not in (FOLDED, JSON):
+            raise ValueError(f"Unknown call tree format: {format}")
+        self.path = path
+        self.format = format
+        self._open = store.BoundedStore(max_spans, span_ttl)
+        self._nodes = {}
+        self._lock = threading.Lock()
+        self._exporter = Periodic(export_interval, self.export, "jot-calltree-export")
+
+    def start(self):
+        base.add_observer(self)
+        flush.add_handler(self.export)
+        if self._exporter.interval:
+            self._exporter.start()
+
+    def stop(self):
+        self._exporter.stop()
+        base.remove_observer(self)
+        flush.remove_handler(self.export)
+        self.export()
+
+    def span_started(self, span):
+        parent = self._open.get(span.parent_id) if span.parent_id is not None else None
+        path = (*parent.path, span.name) if parent is not None else (span.name,)
+        self._open[span.id] = _Open(path)
+
+    def span_finished(self, span, tags):
+        entry = self._open.pop(span.id)
+        if entry is None:
+            return
+        duration = span.duration
+        parent = self._open.get(span.parent_id) if span.parent_id is not None else None
+        with self._lock:
+            if parent is not None:
+                parent.child_time += duration
+            node = self._nodes.get(entry.path)
+            if node is None:
+                node = self._nodes[entry.path] = _Node()
+            node.count += 1
+            node.total += duration
+            # children running concurrently can add up to more than the parent's duration
+            node.self_time += max(duration - entry.child_time, 0)
+
+    def edges(self):
+        """Return {(parent name, child name): (count, total ns, self ns)} for the current tree"""
+        edges = {}
+        with self._lock:
+            for path, node in self._nodes.items():
+                key = (path[-2] if len(path) > 1 else None, path[-1])
+                count, total, self_time = edges.get(key, (0, 0, 0))
+                edges[key] = (count + node.count, total + node.total, self_time + node.self_time)
+        return edges
+
+    def folded(self, nodes=None):
+        nodes = nodes if nodes is not None else self._snapshot()
+        lines = []
+        for path, node in sorted(nodes.items()):
+            weight = node.self_time // 1000
+            if weight > 0:
+                lines.append(f"{';'.join(path)} {weight}")
+        return "\n".join(lines)
+
+    def tree(self, nodes=None):
+        nodes = nodes if nodes is not None else self._snapshot()
+        roots = []
+        children = {}
+        for path, node in sorted(nodes.items()):
+            siblings = children.get(path[:-1])
+            entry = {
+                # a span whose parent isn't in the tree is listed at the top with its full path
+                "name": path[-1] if siblings is not None else ";".join(path),
+                "count": node.count,
+                "total_ns": node.total,
+                "self_ns": node.self_time,
+                "children": [],
+            }
+            children[path] = entry["children"]
+            (siblings if siblings is not None else roots).append(entry)
+        return roots
+
+    def export(self):
+        with self._lock:
+            nodes, self._nodes = self._nodes, {}
+        if not nodes:
+            return
+
+        output = self.folded(nodes) if self.format == FOLDED else json.dumps(self.tree(nodes))
+        if self.path is not None:
+            if output:
+                with open(self.path, "a") as f:
+                    f.write(output + "\n")
+            return
+
+        tags = {"calltree.spans": sum(n.count for n in nodes.values()), "calltree.tree": output}
+        facade.active_meter.target.maybe_log(log.INFO, "Call tree", tags)
+
+    def _snapshot(self):
+        with self._lock:
+            return dict(self._nodes)
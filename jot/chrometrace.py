@@ -0,0 +1,129 @@
+"""A target that writes spans to a file in the Chrome Trace Event format.
+
+The file can be opened in chrome://tracing or https://ui.perfetto.dev. Events are appended as they
+happen and the closing bracket of the JSON array is never written, which both viewers allow, so
+the file can be opened while it is still being written, or after the process has died.
+"""
+
+import json
+import os
+import sys
+import threading
+from time import time_ns
+
+from . import errors, flush, log
+from .base import Target
+from .filesink import DEFAULT_BACKUP_COUNT, RotatingFileWriter
+from .util import format_span_id, format_trace_id, get_env
+
+
+class ChromeTraceTarget(Target):
+    """A target that writes spans, events and metrics as Chrome trace events.
+
+    Finished spans become complete ("X") events on the thread that finished them, span events
+    and logs become instant ("i") events, and magnitudes and running totals of counts become
+    counter ("C") tracks. The file is rotated when it grows past `max_bytes`.
+    """
+
+    @classmethod
+    def from_environment(cls):
+        path = get_env("CHROME_TRACE_PATH")
+        if path:
+            max_bytes = int(get_env("CHROME_TRACE_MAX_BYTES", 0))
+            backup_count = int(get_env("CHROME_TRACE_BACKUP_COUNT", DEFAULT_BACKUP_COUNT))
+            return cls(path, max_bytes, backup_count)
+
+    def __init__(self, path, max_bytes=0, backup_count=DEFAULT_BACKUP_COUNT, level=None):
+        super().__init__(level)
+        self.pid = os.getpid()
+        self._totals = {}
+        self._lock = threading.Lock()
+        metadata = {
+            "name": "process_name",
+            "ph": "M",
+            "pid": self.pid,
+            "args": {"name": os.path.basename(sys.argv[0]) or "python"},
+        }
+        self.file = RotatingFileWriter(
+            path,
+            max_bytes=max_bytes,
+            backup_count=backup_count,
+            header=f"[\n{json.dumps(metadata)},\n",
+        )
+        flush.add_handler(self.flush)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        flush.remove_handler(self.flush)
+        self.file.close()
+
+    def finish(self, tags, span):
+        args = {
+            **tags,
+            "trace_id": format_trace_id(span.trace_id),
+            "span_id": format_span_id(span.id),
+        }
+        if span.parent_id is not None:
+            args["parent_id"] = format_span_id(span.parent_id)
+        self._write(
+            {
+                "name": span.name,
+                "cat": "span",
+                "ph": "X",
+                "ts": span.start_time / 1000,
+                "dur": span.duration / 1000,
+                "args": args,
+            }
+        )
+        for event in span.events:
+            self._instant(event.name, "event", event.tags, event.timestamp)
+
+    def event(self, name, tags, span=None):
+        if span is not None:
+            super().event(name, tags, span)
+        else:
+            self._instant(name, "event", tags)
+
+    def log(self, level, message, tags, span=None):
+        self._instant(message, "log", {**tags, "level": log.name(level)})
+
+    def error(self, message, exception, tags, span=None):
+        record = errors.describe(exception)
+        args = {
+            **tags,
+            "exception.type": record.type,
+            "exception.message": record.message,
+            "exception.stacktrace": record.stacktrace,
+        }
+        self._instant(message, "error", args)
+
+    def magnitude(self, name, value, tags, span=None):
+        self._counter(name, value)
+
+    def count(self, name, value, tags, span=None):
+        with self._lock:
+            total = self._totals[name] = self._totals.get(name, 0) + value
+        self._counter(name, total)
+
+    def _instant(self, name, category, tags, timestamp=None):
+        event = {"name": name, "cat": category, "ph": "i", "s": "t", "args": tags}
+        if timestamp is not None:
+            event["ts"] = timestamp / 1000
+        self._write(event)
+
+    def _counter(self, name, value):
+        self._write({"name": name, "ph": "C", "args": {"value": value}})
+
+    def _write(self, event):
+        event.setdefault("ts", time_ns() / 1000)
+        event["pid"] = self.pid
+        event["tid"] = threading.get_native_id()
+        self.file.write(json.dumps(event, default=_default) + ",\n")
+
+
+def _default(value):
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
@@ -0,0 +1,200 @@
+import json
+import math
+import os
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import time_ns
+from urllib.parse import parse_qs, urlparse
+
+from . import errors, stats, store
+from .util import format_span_id, format_trace_id
+from .wrapper import WrapperTarget
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8081
+DEFAULT_MAX_TRACES = 1000
+DEFAULT_MAX_SPANS_PER_TRACE = 100
+DEFAULT_LATENCY_WINDOW = 1000
+DEFAULT_MAX_ERRORS = 100
+DEFAULT_TOP = 10
+PERCENTILES = (50, 90, 99)
+
+
+class DebugServerTarget(WrapperTarget):
+    """A target that serves recent telemetry over HTTP, for inspecting a live process.
+
+    Finished spans and errors are kept in bounded in-memory buffers and served as JSON from a
+    background thread:
+
+    - `/traces?n=10`: the slowest of the last `max_traces` traces to finish
+    - `/latency`: percentiles of the last `latency_window` durations of each span name
+    - `/errors`: error counts by exception type and the last `max_errors` errors
+    - `/queues`: depths of jot's internal queues
+    - `/`: all of the above
+    """
+
+    @classmethod
+    def from_environment(cls):
+        # DEBUG_PORT is too generic to be sure it's meant for jot, so only the JOT_ names are read
+        portstr = os.getenv("JOT_DEBUG_PORT")
+        if portstr:
+            port = int(portstr)
+            if port < 0 or port > 65535:
+                raise ValueError(f"Invalid JOT_DEBUG_PORT: {portstr}")
+            return cls(host=os.getenv("JOT_DEBUG_HOST", DEFAULT_HOST), port=port)
+
+    def __init__(
+        self,
+        target=None,
+        host=DEFAULT_HOST,
+        port=DEFAULT_PORT,
+        max_traces=DEFAULT_MAX_TRACES,
+        max_spans_per_trace=DEFAULT_MAX_SPANS_PER_TRACE,
+        latency_window=DEFAULT_LATENCY_WINDOW,
+        max_errors=DEFAULT_MAX_ERRORS,
+        level=None,
+    ):
+        super().__init__(target, level)
+        self.max_spans_per_trace = max_spans_per_trace
+        self.latency_window = latency_window
+        self._open_traces = store.BoundedStore(max_traces)
+        self._traces = deque(maxlen=max_traces)
+        self._durations = store.BoundedStore(ttl=None)
+        self._error_counts = {}
+        self._errors = deque(maxlen=max_errors)
+        self._lock = threading.Lock()
+
+        self.server = ThreadingHTTPServer((host, port), _handler(self))
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(
+            target=self.server.serve_forever,
+            kwargs={"poll_interval": 0.1},
+            name="jot-debug-server",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join(3.0)
+
+    def finish(self, tags, span):
+        duration = span.duration
+        entry = {
+            "span_id": format_span_id(span.id),
+            "parent_id": format_span_id(span.parent_id),
+            "name": span.name,
+            "start_time": span.start_time,
+            "duration": duration,
+        }
+        durations = self._durations.get_or_create(
+            span.name, lambda: deque(maxlen=self.latency_window)
+        )
+        with self._lock:
+            durations.append(duration)
+
+        spans = self._open_traces.get_or_create(span.trace_id, list)
+        if len(spans) < self.max_spans_per_trace:
+            spans.append(entry)
+
+        # the local root of a trace finishes last, so that's when the trace is complete
+        if span.is_local_root:
+            self._open_traces.pop(span.trace_id)
+            trace = {
+                "trace_id": format_trace_id(span.trace_id),
+                "name": span.name,
+                "start_time": span.start_time,
+                "duration": duration,
+                "spans": spans,
+            }
+            with self._lock:
+                self._traces.append(trace)
+
+        self.target.finish(tags, span)
+
+    def error(self, message, exception, tags, span=None):
+        record = errors.describe(exception)
+        entry = {
+            "timestamp": time_ns(),
+            "message": message,
+            "exception.type": record.type,
+            "exception.message": record.message,
+            "trace_id": format_trace_id(span.trace_id) if span is not None else None,
+            "span_id": format_span_id(span.id) if span is not None else None,
+        }
+        with self._lock:
+            self._error_counts[record.type] = self._error_counts.get(record.type, 0) + 1
+            self._errors.append(entry)
+        self.target.error(message, exception, tags, span)
+
+    def slowest_traces(self, n=DEFAULT_TOP):
+        with self._lock:
+            traces = list(self._traces)
+        return sorted(traces, key=lambda t: t["duration"], reverse=True)[:n]
+
+    def latency(self):
+        with self._lock:
+            windows = [(name, sorted(durations)) for name, durations in self._durations.items()]
+        results = {}
+        for name, values in sorted(windows, key=lambda w: str(w[0])):
+            if not values:
+                continue
+            result = {"count": len(values)}
+            for p in PERCENTILES:
+                result[f"p{p}"] = values[max(math.ceil(p / 100 * len(values)), 1) - 1]
+            result["max"] = values[-1]
+            results[name] = result
+        return results
+
+    def error_summary(self):
+        with self._lock:
+            return {"counts": dict(self._error_counts), "recent": list(self._errors)}
+
+    def summary(self, n=DEFAULT_TOP):
+        return {
+            "traces": self.slowest_traces(n),
+            "latency": self.latency(),
+            "errors": self.error_summary(),
+            "queues": stats.queue_depths(),
+        }
+
+
+def _handler(target):
+    class DebugRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            try:
+                n = int(query.get("n", [DEFAULT_TOP])[0])
+            except ValueError:
+                return self._send(400, {"error": "n must be an integer"})
+
+            if url.path == "/":
+                body = target.summary(n)
+            elif url.path == "/traces":
+                body = target.slowest_traces(n)
+            elif url.path == "/latency":
+                body = target.latency()
+            elif url.path == "/errors":
+                body = target.error_summary()
+            elif url.path == "/queues":
+                body = stats.queue_depths()
+            else:
+                return self._send(404, {"error": f"Not found: {url.path}"})
+            self._send(200, body)
+
+        def _send(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return DebugRequestHandler
@@ -1,4 +1,3 @@
-import asyncio
 import functools
 import inspect
 from copy import copy
@@ -26,6 +25,9 @@ def make_decorator(dtags, stags):
 
 
 def wrap_async(func, dynamic_tag_names, static_tags):
+    # asyncio is slow to import, and only needed by programs that already use it
+    import asyncio
+
     name = func.__name__
 
     @functools.wraps(func)
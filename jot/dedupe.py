@@ -0,0 +1,105 @@
+import threading
+from time import monotonic
+
+from . import errors, flush, log
+from .periodic import Periodic
+from .wrapper import WrapperTarget
+
+DEFAULT_LIMIT = 10
+DEFAULT_WINDOW = 60.0
+
+
+class _Window:
+    def __init__(self, start, record):
+        self.start = start
+        self.type = record.type
+        self.message = record.message
+        self.forwarded = 0
+        self.suppressed = 0
+
+
+class ErrorDedupeTarget(WrapperTarget):
+    """A target that stops identical errors from flooding the target it wraps.
+
+    Errors are grouped by fingerprint. The first `limit` errors with a given fingerprint in each
+    `window` are forwarded in full. After that they are only counted, and at the end of the window
+    the number suppressed is reported as a `jot.errors.suppressed` count and a warning.
+    """
+
+    def __init__(
+        self,
+        target=None,
+        limit=DEFAULT_LIMIT,
+        window=DEFAULT_WINDOW,
+        interval=DEFAULT_WINDOW,
+        level=None,
+        clock=monotonic,
+    ):
+        super().__init__(target, level)
+        self.limit = limit
+        self.window = window
+        self._clock = clock
+        self._windows = {}
+        self._lock = threading.Lock()
+        self._periodic = None
+        if interval:
+            self._periodic = Periodic(interval, self.report_expired, "jot-error-dedupe")
+            self._periodic.start()
+        flush.add_handler(self.report)
+
+    def close(self):
+        flush.remove_handler(self.report)
+        if self._periodic is not None:
+            self._periodic.stop()
+            self._periodic = None
+
+    def error(self, message, exception, tags, span=None):
+        record = errors.describe(exception)
+        fingerprint = record.fingerprint
+        now = self._clock()
+        with self._lock:
+            expired = self._pop_windows(now)
+            window = self._windows.get(fingerprint)
+            if window is None:
+                window = self._windows[fingerprint] = _Window(now, record)
+            forward = window.forwarded < self.limit
+            if forward:
+                window.forwarded += 1
+            else:
+                window.suppressed += 1
+
+        self._report_windows(expired)
+        if forward:
+            tags["error.fingerprint"] = fingerprint
+            self.target.error(message, exception, tags, span)
+
+    def report_expired(self):
+        with self._lock:
+            expired = self._pop_windows(self._clock())
+        self._report_windows(expired)
+
+    def report(self):
+        with self._lock:
+            expired = self._pop_windows(None)
+        self._report_windows(expired)
+
+    def _pop_windows(self, now):
+        expired = []
+        for fingerprint, window in list(self._windows.items()):
+            if now is None or now - window.start >= self.window:
+                del self._windows[fingerprint]
+                expired.append((fingerprint, window))
+        return expired
+
+    def _report_windows(self, expired):
+        for fingerprint, window in expired:
+            if window.suppressed == 0:
+                continue
+            tags = {
+                "error.fingerprint": fingerprint,
+                "exception.type": window.type,
+                "exception.message": window.message,
+            }
+            self.target.count("jot.errors.suppressed", window.suppressed, dict(tags))
+            message = f"Suppressed {window.suppressed} repeats of {window.type}: {window.message}"
+            self.target.maybe_log(log.WARNING, message, tags)
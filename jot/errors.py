@@ -0,0 +1,80 @@
+import hashlib
+import weakref
+from traceback import format_exception
+
+
+def describe(exception):
+    """Return the ErrorRecord for an exception.
+
+    The record is cached on the exception, so every target that reports the same error while the
+    record is in use shares it, and the expensive parts are computed at most once. The exception
+    only holds a weak reference to the record, since the record refers back to the exception and
+    a cycle would keep the traceback's frames alive until the garbage collector runs. If the
+    exception has been re-raised since the record was made, its traceback has grown, so a new
+    record is created.
+    """
+    ref = getattr(exception, "_jot_error_record", None)
+    record = ref() if ref is not None else None
+    if record is not None and record.traceback is getattr(exception, "__traceback__", None):
+        return record
+
+    record = ErrorRecord(exception)
+    try:
+        exception._jot_error_record = weakref.ref(record)
+    except AttributeError:
+        pass
+    return record
+
+
+class ErrorRecord:
+    """Details of an exception, computed on demand and cached"""
+
+    def __init__(self, exception):
+        self.exception = exception
+        self.traceback = getattr(exception, "__traceback__", None)
+        self._message = None
+        self._stacktrace = None
+        self._fingerprint = None
+
+    @property
+    def type(self):
+        return type(self.exception).__name__
+
+    @property
+    def message(self):
+        if self._message is None:
+            self._message = str(self.exception)
+        return self._message
+
+    @property
+    def stacktrace(self):
+        if self._stacktrace is None:
+            if self.exception is None or isinstance(self.exception, BaseException):
+                lines = format_exception(type(self.exception), self.exception, self.traceback)
+                self._stacktrace = "".join(lines)
+            else:
+                self._stacktrace = f"{self.type}: {self.message}\n"
+        return self._stacktrace
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = fingerprint(self.exception)
+        return self._fingerprint
+
+
+def fingerprint(exception):
+    """Identify an exception by its type and the frames it passed through.
+
+    Two exceptions raised from the same place have the same fingerprint, even if their messages
+    differ.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    exc_type = type(exception)
+    digest.update(f"{exc_type.__module__}.{exc_type.__qualname__}".encode())
+    tb = getattr(exception, "__traceback__", None)
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        digest.update(f"|{code.co_filename}:{code.co_name}:{tb.tb_lineno}".encode())
+        tb = tb.tb_next
+    return digest.hexdigest()
@@ -1,6 +1,7 @@
 import sys
 from copy import copy
 
+from . import errors, stats
 from .base import Target
 
 
@@ -16,6 +17,7 @@ def _forward(method):
             try:
                 method(target, *rest, tags, span)
             except Exception as e:
+                stats.record_export(stats.name_of(target), failed=True)
                 print(f"Error forwarding to {target}: {e}", file=sys.stderr)
 
     return wrapped
@@ -34,6 +36,10 @@ class FanOutTarget(Target):
     def finish(target, tags, span):
         target.finish(tags, span)
 
+    @_forward
+    def finish_unsampled(target, tags, span):
+        target.finish_unsampled(tags, span)
+
     @_forward
     def event(target, name, tags, span=None):
         target.event(name, tags, span)
@@ -43,8 +49,13 @@ class FanOutTarget(Target):
         if target.accepts_log_level(level):
             target.log(level, message, tags, span)
 
+    def error(self, message, exception, tags, span=None):
+        # keep the error record alive while the targets report it, so that they share it
+        record = errors.describe(exception)  # noqa: F841
+        self._forward_error(message, exception, tags, span)
+
     @_forward
-    def error(target, message, exception, tags, span=None):
+    def _forward_error(target, message, exception, tags, span=None):
         target.error(message, exception, tags, span)
 
     @_forward
@@ -0,0 +1,208 @@
+import gzip
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+
+from . import stats
+
+FSYNC_NEVER = "never"
+FSYNC_ALWAYS = "always"
+FSYNC_INTERVAL = "interval"
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BACKUP_COUNT = 5
+
+_FLUSH = object()
+_STOP = object()
+
+
+class RotatingFileWriter:
+    """A file-like object that writes to a file on a background thread.
+
+    Calls to `write` put text on a bounded queue and return immediately; if the queue is full, the
+    text is dropped and counted. The writer thread appends it to the file, and rotates the file
+    when it grows past `max_bytes` or has been open for `interval` seconds. Rotated files get a
+    timestamp suffix, are optionally gzipped in the background, and only the newest
+    `backup_count` are kept. If `header` is given, it is written at the start of every new file.
+
+    `fsync` controls durability: "never" leaves it to the OS, "always" syncs after every batch of
+    writes, and "interval" syncs at most every `fsync_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        path,
+        max_bytes=0,
+        interval=None,
+        backup_count=DEFAULT_BACKUP_COUNT,
+        compress=False,
+        fsync=FSYNC_NEVER,
+        fsync_interval=1.0,
+        queue_size=DEFAULT_QUEUE_SIZE,
+        header=None,
+    ):
+        if fsync not in (FSYNC_NEVER, FSYNC_ALWAYS, FSYNC_INTERVAL):
+            raise ValueError(f"Unsupported fsync policy: {fsync}")
+        self.name = path
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = backup_count
+        self.compress = compress
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.header = header
+        self.closed = False
+        self.dropped = 0
+        self.queue = queue.Queue(queue_size)
+        self._compressors = []
+        stats.register_queue(f"file:{path}", self)
+        self._open()
+        self._synced = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="jot-file-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, text):
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        try:
+            self.queue.put_nowait(text)
+        except queue.Full:
+            self.dropped += 1
+        return len(text)
+
+    def flush(self, timeout=5.0):
+        """Wait until everything written so far has been handed to the operating system"""
+        if self.closed:
+            return
+        done = threading.Event()
+        try:
+            self.queue.put((_FLUSH, done), timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        if self.closed:
+            return
+        self.closed = True
+        stats.unregister_queue(f"file:{self.name}", self)
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+        for compressor in self._compressors:
+            compressor.join(timeout)
+
+    def _open(self):
+        # the file is written in binary, so that its size is counted in bytes rather than characters
+        self._file = open(self.name, "ab")
+        self._size = self._file.tell()
+        if self.header and self._size == 0:
+            self._write_bytes(self.header.encode("utf-8", "replace"))
+        self._opened = time.monotonic()
+
+    def _run(self):
+        while True:
+            items = [self.queue.get()]
+            # drain whatever else is waiting, so that we flush once per batch
+            while True:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            waiters = []
+            stop = False
+            try:
+                for item in items:
+                    if item is _STOP:
+                        stop = True
+                    elif isinstance(item, tuple) and item[0] is _FLUSH:
+                        waiters.append(item[1])
+                    else:
+                        self._write(item)
+                self._file.flush()
+                self._sync(force=bool(waiters) or stop)
+            except Exception as e:
+                print(f"Error writing to {self.name}: {e}", file=sys.stderr)
+            finally:
+                for waiter in waiters:
+                    waiter.set()
+
+            if stop:
+                self._file.close()
+                return
+
+    def _write(self, text):
+        self._write_bytes(text.encode("utf-8", "replace"))
+        if self._should_rotate():
+            self._rotate()
+
+    def _write_bytes(self, data):
+        self._file.write(data)
+        self._size += len(data)
+
+    def _sync(self, force=False):
+        if self.fsync == FSYNC_NEVER:
+            return
+        now = time.monotonic()
+        if self.fsync == FSYNC_ALWAYS or force or now - self._synced >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._synced = now
+
+    def _should_rotate(self):
+        if self.max_bytes and self._size >= self.max_bytes:
+            return True
+        return bool(self.interval) and time.monotonic() - self._opened >= self.interval
+
+    def _rotate(self):
+        self._file.flush()
+        self._sync(force=True)
+        self._file.close()
+
+        rotated = f"{self.name}.{time.strftime('%Y%m%d-%H%M%S')}"
+        suffix = 1
+        while os.path.exists(rotated) or os.path.exists(f"{rotated}.gz"):
+            rotated = f"{self.name}.{time.strftime('%Y%m%d-%H%M%S')}.{suffix}"
+            suffix += 1
+        os.rename(self.name, rotated)
+        self._open()
+
+        if self.compress:
+            self._compressors = [c for c in self._compressors if c.is_alive()]
+            compressor = threading.Thread(
+                target=self._compress, args=(rotated,), name="jot-file-compressor", daemon=True
+            )
+            self._compressors.append(compressor)
+            compressor.start()
+        else:
+            self._prune()
+
+    def _compress(self, path):
+        try:
+            with open(path, "rb") as src, gzip.open(f"{path}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path)
+        except Exception as e:
+            print(f"Error compressing {path}: {e}", file=sys.stderr)
+        self._prune()
+
+    def _prune(self):
+        if self.backup_count is None:
+            return
+        directory = os.path.dirname(os.path.abspath(self.name))
+        prefix = os.path.basename(self.name) + "."
+        backups = []
+        for entry in os.scandir(directory):
+            if entry.name.startswith(prefix) and entry.name[len(prefix) :][:1].isdigit():
+                # skip files that are still being compressed
+                if self.compress and not entry.name.endswith(".gz"):
+                    continue
+                backups.append((entry.stat().st_mtime, entry.path))
+        backups.sort()
+        for _, path in backups[: max(len(backups) - self.backup_count, 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
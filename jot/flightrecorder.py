@@ -0,0 +1,279 @@
+"""A target that records recent telemetry in a memory-mapped ring buffer.
+
+Everything sent to the target, including debug logs, is written to a fixed-size file in a compact
+binary encoding. Writes go to shared memory, so they make no system calls, and the data survives
+if the process crashes or is killed. Decode a recording with:
+
+    python -m jot.flightrecorder dump PATH [--json]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from datetime import datetime, timezone
+from time import time_ns
+
+from . import errors, flush, log, util
+from .base import Target
+from .util import get_env
+
+MAGIC = b"JOTFR001"
+DEFAULT_SIZE = 16 * 1024 * 1024
+
+# The file header holds the magic number, the size of the data region, the offset of the next
+# write and the next sequence number.
+_FILE_HEADER = struct.Struct("<8sQQQ")
+_POSITION = struct.Struct("<QQ")
+_POSITION_OFFSET = 16
+DATA_OFFSET = 64
+
+# Each record starts with a sync marker, its total length and a checksum of everything after the
+# checksum. The body holds a sequence number, the kind of record, the log level, a numeric value,
+# a timestamp and span identifiers, followed by a list of length-prefixed strings.
+SYNC = b"\xf1\x7e"
+_LENGTH_CRC = struct.Struct("<II")
+_BODY = struct.Struct("<QBBdQ16s8s")
+_HEADER_SIZE = len(SYNC) + _LENGTH_CRC.size
+_U16 = struct.Struct("<H")
+_MAX_FIELD = 0xFFFF
+
+START = 1
+FINISH = 2
+EVENT = 3
+LOG = 4
+ERROR = 5
+MAGNITUDE = 6
+COUNT = 7
+
+KIND_NAMES = {
+    START: "start",
+    FINISH: "finish",
+    EVENT: "event",
+    LOG: "log",
+    ERROR: "error",
+    MAGNITUDE: "magnitude",
+    COUNT: "count",
+}
+
+_NO_TRACE = b"\x00" * 16
+_NO_SPAN = b"\x00" * 8
+
+
+class FlightRecorderTarget(Target):
+    """A target that writes all telemetry into a memory-mapped ring buffer file"""
+
+    @classmethod
+    def from_environment(cls):
+        path = get_env("FLIGHT_RECORDER_PATH")
+        if path:
+            size = int(get_env("FLIGHT_RECORDER_SIZE", DEFAULT_SIZE))
+            return cls(path, size)
+
+    def __init__(self, path, size=DEFAULT_SIZE, level=log.ALL):
+        super().__init__(level)
+        self.path = path
+        self.size = size
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._seq = 0
+
+        # keep the recording from the previous run, which may be the one that crashed
+        if os.path.exists(path):
+            os.replace(path, f"{path}.prev")
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.ftruncate(self._fd, DATA_OFFSET + size)
+        self._mm = mmap.mmap(self._fd, DATA_OFFSET + size)
+        _FILE_HEADER.pack_into(self._mm, 0, MAGIC, size, 0, 0)
+        flush.add_handler(self.flush)
+
+    def flush(self):
+        if not self._mm.closed:
+            self._mm.flush()
+
+    def close(self):
+        flush.remove_handler(self.flush)
+        if not self._mm.closed:
+            self._mm.flush()
+            self._mm.close()
+            os.close(self._fd)
+
+    def start(self, tags, span):
+        self._append(START, 0, 0.0, span, [span.name], tags)
+
+    def finish(self, tags, span):
+        self._append(FINISH, 0, float(span.duration), span, [span.name], tags)
+
+    def event(self, name, tags, span=None):
+        self._append(EVENT, 0, 0.0, span, [name], tags)
+
+    def log(self, level, message, tags, span=None):
+        self._append(LOG, level, 0.0, span, [message], tags)
+
+    def error(self, message, exception, tags, span=None):
+        record = errors.describe(exception)
+        fields = [message, record.type, record.message, record.stacktrace]
+        self._append(ERROR, log.ERROR, 0.0, span, fields, tags)
+
+    def magnitude(self, name, value, tags, span=None):
+        self._append(MAGNITUDE, 0, float(value), span, [name], tags)
+
+    def count(self, name, value, tags, span=None):
+        self._append(COUNT, 0, float(value), span, [name], tags)
+
+    def _append(self, kind, level, value, span, fields, tags):
+        if span is not None:
+            trace_id, span_id = span.trace_id, span.id
+        else:
+            trace_id, span_id = _NO_TRACE, _NO_SPAN
+        payload = _encode_fields(fields, tags)
+        length = _HEADER_SIZE + _BODY.size + len(payload)
+        if length > self.size:
+            self.dropped += 1
+            return
+
+        # Only reserving space needs the lock; the record itself is copied in afterwards. If the
+        # process dies part way through a copy, the checksum won't match and the reader skips it.
+        with self._lock:
+            offset = self._offset
+            if offset + length > self.size:
+                offset = 0
+            self._offset = offset + length
+            seq = self._seq
+            self._seq += 1
+            if self._mm.closed:
+                return
+
+        body = _BODY.pack(seq, kind, level, value, time_ns(), trace_id, span_id) + payload
+        start = DATA_OFFSET + offset
+        self._mm[start : start + length] = SYNC + _LENGTH_CRC.pack(length, zlib.crc32(body)) + body
+        _POSITION.pack_into(self._mm, _POSITION_OFFSET, self._offset, self._seq)
+
+
+def _encode_fields(fields, tags):
+    items = [str(f) for f in fields]
+    for k, v in tags.items():
+        items.append(str(k))
+        items.append(v.hex() if isinstance(v, bytes) else str(v))
+
+    parts = [_U16.pack(len(fields)), _U16.pack(len(tags))]
+    for item in items:
+        data = item.encode("utf-8", "replace")[:_MAX_FIELD]
+        parts.append(_U16.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def _decode_fields(data, offset):
+    nfields, ntags = struct.unpack_from("<HH", data, offset)
+    offset += 4
+    items = []
+    for _ in range(nfields + 2 * ntags):
+        (size,) = _U16.unpack_from(data, offset)
+        offset += 2
+        items.append(bytes(data[offset : offset + size]).decode("utf-8", "replace"))
+        offset += size
+    fields = items[:nfields]
+    tags = dict(zip(items[nfields::2], items[nfields + 1 :: 2]))
+    return fields, tags
+
+
+def read(path):
+    """Decode all intact records in a recording, oldest first"""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, size, _, _ = _FILE_HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a jot flight recording")
+
+    region = memoryview(data)[DATA_OFFSET : DATA_OFFSET + size]
+    records = []
+    pos = data.find(SYNC, DATA_OFFSET) - DATA_OFFSET
+    while 0 <= pos <= size - _HEADER_SIZE - _BODY.size:
+        record = _decode_record(region, pos)
+        if record is None:
+            pos += 1
+        else:
+            records.append(record)
+            pos += record["length"]
+        found = data.find(SYNC, DATA_OFFSET + pos, DATA_OFFSET + size)
+        pos = found - DATA_OFFSET if found >= 0 else -1
+
+    records.sort(key=lambda r: r["seq"])
+    return records
+
+
+def _decode_record(region, pos):
+    length, crc = _LENGTH_CRC.unpack_from(region, pos + len(SYNC))
+    if length < _HEADER_SIZE + _BODY.size or pos + length > len(region):
+        return None
+    body = region[pos + _HEADER_SIZE : pos + length]
+    if zlib.crc32(body) != crc:
+        return None
+    seq, kind, level, value, timestamp, trace_id, span_id = _BODY.unpack_from(body, 0)
+    try:
+        fields, tags = _decode_fields(body, _BODY.size)
+    except (struct.error, UnicodeDecodeError):
+        return None
+    return {
+        "length": length,
+        "seq": seq,
+        "kind": KIND_NAMES.get(kind, str(kind)),
+        "level": log.name(level) if level else None,
+        "value": value,
+        "timestamp": timestamp,
+        "trace_id": util.format_trace_id(trace_id) if trace_id != _NO_TRACE else None,
+        "span_id": util.format_span_id(span_id) if span_id != _NO_SPAN else None,
+        "fields": fields,
+        "tags": tags,
+    }
+
+
+def format_record(record):
+    ts = datetime.fromtimestamp(record["timestamp"] / 1e9, timezone.utc).isoformat()
+    kind = record["kind"]
+    chunks = [ts, f"[{record['span_id'] or ''}]", kind.upper()]
+    if kind == "log":
+        chunks.append(record["level"].upper())
+    chunks.append(record["fields"][0])
+    if kind in ("magnitude", "count"):
+        chunks.append(f"= {record['value']:g}")
+    elif kind == "finish":
+        chunks.append(f"duration={int(record['value'])}")
+    chunks.extend(f"{k}={v}" for k, v in record["tags"].items())
+    line = " ".join(chunks)
+    if kind == "error":
+        line += "\n" + record["fields"][3].rstrip("\n")
+    return line
+
+
+def dump(path, as_json=False, file=None):
+    file = file if file is not None else sys.stdout
+    for record in read(path):
+        if as_json:
+            record = {k: v for k, v in record.items() if k != "length"}
+            print(json.dumps(record), file=file)
+        else:
+            print(format_record(record), file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m jot.flightrecorder")
+    commands = parser.add_subparsers(dest="command", required=True)
+    dump_parser = commands.add_parser("dump", help="decode a flight recording")
+    dump_parser.add_argument("path")
+    dump_parser.add_argument("--json", action="store_true", help="print records as JSON lines")
+    args = parser.parse_args(argv)
+
+    if args.command == "dump":
+        dump(args.path, as_json=args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import sys
 import time
+from urllib.parse import urlencode
 
 import requests
 
+from . import stats
 from .base import Target
 from .util import get_env
 
@@ -10,11 +12,12 @@ from .util import get_env
 class InfluxLineProtocolTarget(Target):
     """Abstract base class for InfluxDB line protocol targets."""
 
-    def __init__(self, url, params, headers, level=None):
+    def __init__(self, url, params, headers, level=None, name=None):
         super().__init__(level=level)
         self.url = url
         self.params = params
         self.headers = headers
+        self.stats_name = stats.exporter_name(self, name or f"{url}?{urlencode(params)}")
         self.session = requests.Session()
 
     def magnitude(self, name, value, tags, span=None):
@@ -72,6 +75,8 @@ class InfluxLineProtocolTarget(Target):
         return str(tag_value).replace(" ", "\\ ").replace(",", "\\,").replace("=", "\\=")
 
     def _send(self, line_protocol):
+        started = time.perf_counter()
+        failed = True
         try:
             # Send HTTP request
             response = self.session.post(
@@ -84,10 +89,16 @@ class InfluxLineProtocolTarget(Target):
                     f"InfluxDB3 error: HTTP {response.status_code} - {response.text}",
                     file=sys.stderr,
                 )
+            else:
+                failed = False
 
         except Exception as e:
             # Handle network errors and other exceptions gracefully
             print(f"InfluxDB3 error: {str(e)}", file=sys.stderr)
+        finally:
+            size = len(line_protocol.encode("utf-8"))
+            duration = time.perf_counter() - started
+            stats.record_export(self.stats_name, 1, size, duration, failed)
 
 
 class InfluxDB2Target(InfluxLineProtocolTarget):
@@ -103,13 +114,13 @@ class InfluxDB2Target(InfluxLineProtocolTarget):
 
         return cls(endpoint=endpoint, bucket=bucket, token=token, org=org)
 
-    def __init__(self, endpoint, bucket, token=None, org=None, level=None):
+    def __init__(self, endpoint, bucket, token=None, org=None, level=None, name=None):
         url = f"{endpoint}/api/v2/write"
         params = {"bucket": bucket}
         if org:
             params["org"] = org
         headers = self._headers_from_token(token)
-        super().__init__(url=url, params=params, headers=headers, level=level)
+        super().__init__(url=url, params=params, headers=headers, level=level, name=name)
 
 
 class InfluxDB3Target(InfluxLineProtocolTarget):
@@ -122,8 +133,8 @@ class InfluxDB3Target(InfluxLineProtocolTarget):
             return None
         return cls(endpoint=endpoint, database=database, token=token)
 
-    def __init__(self, endpoint, database, token=None, level=None):
+    def __init__(self, endpoint, database, token=None, level=None, name=None):
         url = f"{endpoint}/api/v3/write_lp"
         params = {"db": database}
         headers = self._headers_from_token(token)
-        super().__init__(url=url, params=params, headers=headers, level=level)
+        super().__init__(url=url, params=params, headers=headers, level=level, name=name)
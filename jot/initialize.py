@@ -12,21 +12,49 @@ TAG_PREFIX = "JOT_TAG_"
 TAG_PREFIX_LEN = len(TAG_PREFIX)
 
 
-def autoinit():
-    if os.getenv("JOT_AUTOINIT", "true").lower() != "false":
-        from .print import PrintTarget
+# Modules that define targets, and the environment variables that configure them. Unused targets
+# and their dependencies shouldn't slow down `import jot`, so a module is only imported if one of
+# its variables is set. Only JOT_ variables import a module automatically, since variables like
+# SENTRY_DSN may be meant for the application itself; LOG_PATH is the exception, since PrintTarget
+# has always been configured by it. Listing a module in JOT_MODULES opts in to all its variables.
+TARGET_MODULES = {
+    "jot.print": ("JOT_LOG_PATH", "LOG_PATH"),
+    "jot.zipkin": ("JOT_ZIPKIN_URL", "ZIPKIN_URL"),
+    "jot.influxdb": (
+        "JOT_INFLUXDB2_ENDPOINT",
+        "INFLUXDB2_ENDPOINT",
+        "JOT_INFLUXDB3_ENDPOINT",
+        "INFLUXDB3_ENDPOINT",
+    ),
+    "jot.otlp": (
+        "OTEL_EXPORTER_OTLP_TRACES_ENDPOINT",
+        "OTEL_EXPORTER_OTLP_LOGS_ENDPOINT",
+        "OTEL_EXPORTER_OTLP_METRICS_ENDPOINT",
+    ),
+    "jot.prometheus": ("JOT_PROMETHEUS_PORT", "PROMETHEUS_PORT"),
+    "jot.sentry": ("JOT_SENTRY_DSN", "SENTRY_DSN"),
+    "jot.flightrecorder": ("JOT_FLIGHT_RECORDER_PATH", "FLIGHT_RECORDER_PATH"),
+    "jot.chrometrace": ("JOT_CHROME_TRACE_PATH", "CHROME_TRACE_PATH"),
+    "jot.sqlite": ("JOT_SQLITE_PATH", "SQLITE_PATH"),
+    "jot.debugserver": ("JOT_DEBUG_PORT",),
+}
 
-        # ensure PrintTarget is registered, others can be registered with env vars
-        PrintTarget()
 
+def autoinit():
+    if os.getenv("JOT_AUTOINIT", "true").lower() != "false":
         init_from_environment()
 
 
 def init_from_environment():
+    _import_target_modules_from_environment()
     _import_modules_from_environment()
     target = _get_target_from_environment()
     tags = _get_tags_from_environment()
     init(target, **tags)
+    if os.getenv("JOT_PROFILE_OVERHEAD", "false").lower() not in ("", "0", "false"):
+        from . import overhead
+
+        overhead.enable()
 
 
 def init(target, /, **tags):
@@ -34,15 +62,29 @@ def init(target, /, **tags):
     flush.init()
 
 
+def _import_target_modules_from_environment():
+    for module, variables in TARGET_MODULES.items():
+        if module not in sys.modules and any(
+            os.getenv(v) for v in variables if v.startswith("JOT_") or v == "LOG_PATH"
+        ):
+            _import_module(module)
+
+
 def _import_modules_from_environment():
     modules = os.getenv("JOT_MODULES")
     if not modules:
         return
     for module in modules.split(","):
-        try:
-            importlib.import_module(module)
-        except ImportError:
-            pass
+        variables = TARGET_MODULES.get(module)
+        if variables is None or any(os.getenv(v) for v in variables):
+            _import_module(module)
+
+
+def _import_module(module):
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        pass
 
 
 def _get_target_from_environment():
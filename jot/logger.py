@@ -1,9 +1,15 @@
 import logging
+import queue
+import sys
+import threading
+from time import monotonic
 
 import jot
-from jot import facade, log, util
+from jot import facade, flush, log, stats, util
 from jot.base import Target
 
+DEFAULT_QUEUE_SIZE = 10000
+
 PY2JOT_MAP = {
     logging.CRITICAL: jot.log.CRITICAL,
     logging.ERROR: jot.log.ERROR,
@@ -40,14 +46,36 @@ EXCLUDE = [
     "threadName",
 ]
 
+# All the attributes a record has before `extra` is applied. Anything else on a record is a tag.
+RECORD_ATTRS = frozenset(
+    [*logging.LogRecord("", logging.NOTSET, "", 0, "", (), None).__dict__, *EXCLUDE, "asctime"]
+)
+
+
+_listener = None
+
 
-def handle_logs(name=""):
+def handle_logs(name="", async_=False, queue_size=DEFAULT_QUEUE_SIZE):
+    """Route records from a python logger through jot.
+
+    If `async_` is true, records are put on a queue and delivered to jot targets on a background
+    thread, so that slow targets don't block the threads doing the logging.
+    """
     logger = logging.getLogger(name)
     if not any(isinstance(handler, JotLoggingHandler) for handler in logger.handlers):
-        handler = JotLoggingHandler()
+        handler = QueueingJotHandler(get_listener(queue_size)) if async_ else JotLoggingHandler()
         logger.addHandler(handler)
 
 
+def get_listener(queue_size=DEFAULT_QUEUE_SIZE):
+    global _listener
+    if _listener is None:
+        _listener = LogListener(queue_size)
+        _listener.start()
+        flush.add_handler(_listener.flush)
+    return _listener
+
+
 def ignore_logs(name=""):
     logger = logging.getLogger(name)
     jot_handlers = [h for h in logger.handlers if isinstance(h, JotLoggingHandler)]
@@ -57,8 +85,17 @@ def ignore_logs(name=""):
 
 class JotLoggingHandler(logging.Handler):
     def emit(self, record):
-        # translate python logging level into jot level
+        entry = self.prepare(record)
+        if entry is not None:
+            target, level, message, tags, span = entry
+            target.log(level, message, tags, span)
+
+    def prepare(self, record):
+        # translate python logging level into jot level, and bail out early if it's not wanted
         level = PY2JOT_MAP.get(record.levelno, jot.log.NOTHING)
+        meter = facade.active_meter
+        if not meter.target.accepts_log_level(level):
+            return None
 
         # basic tags
         tags = {
@@ -68,17 +105,77 @@ class JotLoggingHandler(logging.Handler):
             "logger": record.name,
         }
 
-        # It's a bit tricky to fish out the extra tags passed in the call the logger. They just
-        # appear as attributes on the record object. We get all the attributes that don't start with
-        # an underscore and aren't part of the standard record attributes.
-        for attr in dir(record):
-            if attr.startswith("_") or attr in EXCLUDE:
-                continue
-            tags[attr] = str(getattr(record, attr))
-
-        target = facade.active_meter.target
-        if target.accepts_log_level(level):
-            target.log(level, record.getMessage(), tags, facade.active_meter.active_span)
+        # The extra tags passed in the call to the logger just appear as attributes on the record
+        # object. We get all the attributes that don't start with an underscore and aren't part of
+        # the standard record attributes.
+        for attr, value in record.__dict__.items():
+            if attr not in RECORD_ATTRS and not attr.startswith("_"):
+                tags[attr] = str(value)
+
+        # keep the unformatted message, so that records from the same call can be grouped
+        if record.args:
+            tags["log.template"] = str(record.msg)
+
+        return meter.target, level, record.getMessage(), tags, meter.active_span
+
+
+class QueueingJotHandler(JotLoggingHandler):
+    """A logging handler that hands records to a LogListener instead of calling the target"""
+
+    def __init__(self, listener, level=logging.NOTSET):
+        super().__init__(level)
+        self.listener = listener
+
+    def emit(self, record):
+        entry = self.prepare(record)
+        if entry is not None:
+            self.listener.enqueue(entry)
+
+
+class LogListener:
+    """Delivers queued log records to jot targets on a background thread.
+
+    Records are captured with the target and span that were active when they were logged. If the
+    queue is full, records are dropped and counted.
+    """
+
+    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE):
+        self.queue = queue.Queue(queue_size)
+        self.dropped = 0
+        self._thread = None
+        stats.register_queue("logging", self)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="jot-log-listener", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, entry):
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout=5.0):
+        """Wait for queued records to be delivered. Returns False if the timeout expires first."""
+        deadline = monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            target, level, message, tags, span = self.queue.get()
+            try:
+                target.log(level, message, tags, span)
+            except Exception as e:
+                print(f"Error delivering log record to {target}: {e}", file=sys.stderr)
+            finally:
+                self.queue.task_done()
 
 
 class LoggerTarget(Target):
@@ -0,0 +1,138 @@
+import threading
+import weakref
+from collections import deque
+from time import monotonic
+
+from . import base, facade, flush, log, util
+from .periodic import Periodic
+
+DEFAULT_THRESHOLD = 60.0
+DEFAULT_INTERVAL = 30.0
+
+_tracker = None
+_periodic = None
+
+
+def enable(threshold=DEFAULT_THRESHOLD, interval=DEFAULT_INTERVAL, report=None):
+    """Start tracking open spans and reporting the ones that are never finished.
+
+    Spans that have been open for longer than `threshold` seconds, or that were garbage
+    collected without being finished, are reported every `interval` seconds and when
+    `jot.flush` is called. By default they are logged as warnings to the active target.
+    """
+    global _tracker, _periodic
+    disable()
+    _tracker = OrphanTracker(threshold, report)
+    base.add_observer(_tracker)
+    flush.add_handler(_tracker.check)
+    if interval:
+        _periodic = Periodic(interval, _tracker.check, "jot-orphans")
+        _periodic.start()
+    return _tracker
+
+
+def disable():
+    global _tracker, _periodic
+    if _periodic is not None:
+        _periodic.stop()
+        _periodic = None
+    if _tracker is not None:
+        base.remove_observer(_tracker)
+        flush.remove_handler(_tracker.check)
+        _tracker = None
+
+
+class OpenSpan:
+    def __init__(self, key, name, started, site):
+        self.key = key
+        self.ref = None
+        self.name = name
+        self.started = started
+        self.site = site
+        self.collected = None
+        self.reported = False
+
+    def tags(self, now):
+        file, line, function = self.site
+        end = self.collected if self.collected is not None else now
+        return {
+            "span.name": self.name,
+            "span.age": round(end - self.started, 3),
+            "file": file,
+            "line": line,
+            "function": function,
+        }
+
+
+class OrphanTracker:
+    """A span observer that remembers open spans using weak references"""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, report=None, clock=monotonic):
+        self.threshold = threshold
+        self.report = report if report is not None else _report_to_active_target
+        self._clock = clock
+        self._open = {}
+        self._collected = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def open_count(self):
+        return len(self._open)
+
+    def span_started(self, span):
+        entry = OpenSpan(id(span), span.name, self._clock(), _caller_site())
+        entry.ref = weakref.ref(span, lambda ref: self._on_collected(entry))
+        with self._lock:
+            self._open[entry.key] = entry
+
+    def span_finished(self, span, tags):
+        with self._lock:
+            entry = self._open.pop(id(span), None)
+        if entry is not None:
+            # dropping the weak reference cancels its callback, so the span isn't reported when
+            # it is freed later
+            entry.ref = None
+
+    def check(self):
+        now = self._clock()
+        collected = []
+        while self._collected:
+            collected.append(self._collected.popleft())
+
+        with self._lock:
+            # only spans that were still open when they were freed are orphans
+            collected = [e for e in collected if self._open.get(e.key) is e]
+            for entry in collected:
+                del self._open[entry.key]
+            stale = [
+                e
+                for e in self._open.values()
+                if not e.reported and now - e.started >= self.threshold
+            ]
+            for entry in stale:
+                entry.reported = True
+
+        for entry in collected:
+            self.report("collected", entry, entry.tags(now))
+        for entry in stale:
+            self.report("open", entry, entry.tags(now))
+
+    def _on_collected(self, entry):
+        # This can run inside the garbage collector on any thread, so it must not take the lock.
+        entry.collected = self._clock()
+        self._collected.append(entry)
+
+
+def _caller_site():
+    frame = util.caller_frame()
+    if frame is None:
+        return None, None, None
+    return frame.f_globals.get("__file__"), frame.f_lineno, frame.f_code.co_name
+
+
+def _report_to_active_target(kind, entry, tags):
+    if kind == "collected":
+        message = f"Span {entry.name} was garbage collected without being finished"
+    else:
+        message = f"Span {entry.name} has been open for more than {tags['span.age']}s"
+    facade.active_meter.target.maybe_log(log.WARNING, message, tags)
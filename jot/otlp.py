@@ -1,12 +1,10 @@
+import importlib
 import os
+import sys
 import warnings
-from time import time_ns
-from traceback import format_exception
+from time import perf_counter, time_ns
 
 from opentelemetry._logs.severity import SeverityNumber
-from opentelemetry.exporter.otlp.proto.http._log_exporter import OTLPLogExporter
-from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 from opentelemetry.sdk._logs import LogData, LogRecord
 from opentelemetry.sdk.metrics.export import (
     AggregationTemporality,
@@ -37,7 +35,7 @@ from opentelemetry.trace import (
     TraceFlags,
 )
 
-from . import log
+from . import errors, log, stats, store
 from .base import Target
 from .util import get_env, hex_encode_bytes
 
@@ -78,19 +76,21 @@ class OTLPTarget(Target):
         metric_exporter=None,
         level=None,
         resource_attributes={},
+        max_spans=store.DEFAULT_MAX_SIZE,
+        span_ttl=store.DEFAULT_TTL,
+        name=None,
     ):
         super().__init__(level)
+        self.stats_name = stats.exporter_name(self, name)
         self.span_exporter = span_exporter
         self.log_exporter = log_exporter
         self.metric_exporter = metric_exporter
         self.resource = _create_resource(resource_attributes)
         self.scope = InstrumentationScope("unknown", version=None, schema_url=SCHEMA_URL)
-        self.span_data = {}
+        self.span_data = store.BoundedStore(max_spans, span_ttl)
 
     def _get_span_data(self, span):
-        if span.id not in self.span_data:
-            self.span_data[span.id] = OtelSpanData()
-        return self.span_data[span.id]
+        return self.span_data.get_or_create(span.id, OtelSpanData)
 
     def _pop_span_data(self, span):
         span_data = self.span_data.pop(span.id, None)
@@ -98,6 +98,19 @@ class OTLPTarget(Target):
             span_data = OtelSpanData()
         return span_data
 
+    def _export(self, exporter, data):
+        # the exporters serialise the data themselves, so the size isn't known
+        started = perf_counter()
+        failed = True
+        try:
+            result = exporter.export(data)
+            failed = getattr(result, "name", "SUCCESS") != "SUCCESS"
+        except Exception as e:
+            # report the error like the other exporters do, rather than raising it at the caller
+            print(f"OTLP error: {e}", file=sys.stderr)
+        finally:
+            stats.record_export(self.stats_name, 1, None, perf_counter() - started, failed)
+
     def _attributes_from_tags(self, tags):
         return {k: self._convert_tag_value(v) for k, v in tags.items() if v is not None}
 
@@ -130,19 +143,18 @@ class OTLPTarget(Target):
             )
 
         log_data = LogData(log_record, self.scope)
-        self.log_exporter.export([log_data])
+        self._export(self.log_exporter, [log_data])
 
     def error(self, message, exception, tags, span=None):
+        record = errors.describe(exception)
         attributes = {
-            "exception.type": type(exception).__name__,
-            "exception.message": str(exception),
-            "exception.stacktrace": "".join(
-                format_exception(type(exception), exception, exception.__traceback__)
-            ),
+            "exception.type": record.type,
+            "exception.message": record.message,
+            "exception.stacktrace": record.stacktrace,
             **self._attributes_from_tags(tags),
         }
         self.event(message, attributes, span)
-        self._get_span_data(span).note_error(exception)
+        self._get_span_data(span).note_error(record.message)
 
     def magnitude(self, name, value, tags, span=None):
         if self.metric_exporter is None:
@@ -170,7 +182,7 @@ class OTLPTarget(Target):
         )
         data = MetricsData(resource_metrics=[resource_metrics])
 
-        self.metric_exporter.export(data)
+        self._export(self.metric_exporter, data)
 
     def count(self, name, value, tags, span=None):
         if self.metric_exporter is None:
@@ -198,7 +210,7 @@ class OTLPTarget(Target):
         )
         data = MetricsData(resource_metrics=[resource_metrics])
 
-        self.metric_exporter.export(data)
+        self._export(self.metric_exporter, data)
 
     def finish(self, tags, span):
         if self.span_exporter is None:
@@ -207,7 +219,11 @@ class OTLPTarget(Target):
         span_data = self._pop_span_data(span)
         span_data.finish(attributes)
         ot_span = span_data.create_readable_span(self.resource, span)
-        self.span_exporter.export([ot_span])
+        self._export(self.span_exporter, [ot_span])
+
+    def finish_unsampled(self, tags, span):
+        # errors in the span may have left state for it, which must be released without exporting
+        self.span_data.pop(span.id, None)
 
 
 class OtelSpanData:
@@ -260,16 +276,32 @@ def _create_resource(resource_attibutes):
     return aggregated
 
 
+# The HTTP exporters are slow to import and applications that create their own exporters may not
+# use them, so they're only imported when they're configured or accessed as attributes of this
+# module, as in `from jot.otlp import OTLPSpanExporter`.
+_EXPORTERS = {
+    "OTLPLogExporter": "opentelemetry.exporter.otlp.proto.http._log_exporter",
+    "OTLPMetricExporter": "opentelemetry.exporter.otlp.proto.http.metric_exporter",
+    "OTLPSpanExporter": "opentelemetry.exporter.otlp.proto.http.trace_exporter",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTERS:
+        return getattr(importlib.import_module(_EXPORTERS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def _env_log_exporter():
     if "OTEL_EXPORTER_OTLP_LOGS_ENDPOINT" in os.environ:
-        return OTLPLogExporter()
+        return __getattr__("OTLPLogExporter")()
 
 
 def _env_metric_exporter():
     if "OTEL_EXPORTER_OTLP_METRICS_ENDPOINT" in os.environ:
-        return OTLPMetricExporter()
+        return __getattr__("OTLPMetricExporter")()
 
 
 def _env_span_exporter():
     if "OTEL_EXPORTER_OTLP_TRACES_ENDPOINT" in os.environ:
-        return OTLPSpanExporter()
+        return __getattr__("OTLPSpanExporter")()
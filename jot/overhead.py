@@ -0,0 +1,188 @@
+"""Measure how much time jot itself adds to the code it instruments.
+
+Set `JOT_PROFILE_OVERHEAD=true`, or call `enable()` after `jot.init`, to time every `Meter` call
+and every call to each target. The totals are reported when `jot.flush` is called.
+"""
+
+import functools
+import threading
+from time import perf_counter_ns
+
+from . import facade, flush, log, stats
+from .base import Meter
+from .fanout import FanOutTarget
+from .wrapper import WrapperTarget
+
+METER_METHODS = (
+    "span",
+    "start",
+    "finish",
+    "event",
+    "debug",
+    "info",
+    "warning",
+    "error",
+    "magnitude",
+    "count",
+)
+TARGET_METHODS = (
+    "start",
+    "finish",
+    "finish_unsampled",
+    "event",
+    "log",
+    "error",
+    "magnitude",
+    "count",
+)
+
+_profiler = None
+
+
+def enable():
+    """Start timing calls to `Meter` methods and to the methods of the active target"""
+    global _profiler
+    disable()
+    _profiler = OverheadProfiler()
+    _profiler.start()
+    return _profiler
+
+
+def disable():
+    global _profiler
+    if _profiler is not None:
+        _profiler.stop()
+        _profiler = None
+
+
+class TimedTarget(WrapperTarget):
+    """A target that times each call to the target it wraps"""
+
+    def __init__(self, target, profiler):
+        super().__init__(target)
+        self.name = type(target).__name__
+        # FanOutTarget records failures of the targets it forwards to under this name
+        self.stats_name = stats.name_of(target)
+        self.profiler = profiler
+        for method in TARGET_METHODS:
+            setattr(self, method, self._timed(method, getattr(target, method)))
+
+    def _timed(self, method, fn):
+        key = (self.name, method)
+        record = self.profiler.record
+
+        @functools.wraps(fn)
+        def timed(*args):
+            started = perf_counter_ns()
+            try:
+                return fn(*args)
+            finally:
+                record(key, perf_counter_ns() - started)
+
+        return timed
+
+
+class OverheadProfiler:
+    """Aggregates the time spent in jot by (class, method).
+
+    Times are inclusive: the time for `Meter.finish` includes the time its target takes, and a
+    target that wraps others includes their time too. Only the outermost `Meter` call on each
+    thread counts towards the total overhead, which is reported as a fraction of the total
+    duration of local root spans, including those that continue a remote trace.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.overhead_ns = 0
+        self.span_ns = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._patches = []
+
+    def start(self):
+        for method in METER_METHODS:
+            self._patch(Meter, method, self._time_meter(method, getattr(Meter, method)))
+        meter = facade.active_meter
+        self._patch(meter, "target", self._wrap(meter.target))
+        flush.add_handler(self.report)
+
+    def stop(self):
+        flush.remove_handler(self.report)
+        for obj, name, original in reversed(self._patches):
+            setattr(obj, name, original)
+        self._patches = []
+
+    def record(self, key, elapsed):
+        with self._lock:
+            count, total = self.calls.get(key, (0, 0))
+            self.calls[key] = (count + 1, total + elapsed)
+
+    def snapshot(self):
+        """Return the totals so far and reset them"""
+        with self._lock:
+            calls, self.calls = self.calls, {}
+            overhead_ns, self.overhead_ns = self.overhead_ns, 0
+            span_ns, self.span_ns = self.span_ns, 0
+        return {
+            "overhead_ns": overhead_ns,
+            "span_ns": span_ns,
+            "fraction": overhead_ns / span_ns if span_ns else None,
+            "calls": {f"{cls}.{method}": value for (cls, method), value in sorted(calls.items())},
+        }
+
+    def report(self):
+        result = self.snapshot()
+        if not result["calls"]:
+            return
+        lines = [
+            f"{name} calls={count} total_ns={total} mean_ns={total // count}"
+            for name, (count, total) in result["calls"].items()
+        ]
+        tags = {
+            "overhead.ns": result["overhead_ns"],
+            "overhead.span_ns": result["span_ns"],
+            "overhead.calls": "\n".join(lines),
+        }
+        if result["fraction"] is not None:
+            tags["overhead.fraction"] = result["fraction"]
+        target = facade.active_meter.target
+        target.maybe_log(log.INFO, "Instrumentation overhead", tags)
+
+    def _patch(self, obj, name, value):
+        self._patches.append((obj, name, getattr(obj, name)))
+        setattr(obj, name, value)
+
+    def _wrap(self, target):
+        if isinstance(target, TimedTarget):
+            return target
+        if isinstance(target, FanOutTarget):
+            self._patch(target, "targets", tuple(self._wrap(t) for t in target.targets))
+        elif isinstance(target, WrapperTarget):
+            self._patch(target, "target", self._wrap(target.target))
+        return TimedTarget(target, self)
+
+    def _time_meter(self, method, fn):
+        key = ("Meter", method)
+        local = self._local
+
+        @functools.wraps(fn)
+        def timed(meter, *args, **kwargs):
+            depth = getattr(local, "depth", 0)
+            local.depth = depth + 1
+            started = perf_counter_ns()
+            try:
+                return fn(meter, *args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - started
+                local.depth = depth
+                self.record(key, elapsed)
+                span = meter.active_span
+                root_finished = method == "finish" and span is not None and span.is_local_root
+                if depth == 0 or root_finished:
+                    with self._lock:
+                        if depth == 0:
+                            self.overhead_ns += elapsed
+                        if root_finished and span.is_finished:
+                            self.span_ns += span.duration
+
+        return timed
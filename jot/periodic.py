@@ -0,0 +1,37 @@
+import sys
+import threading
+
+
+class Periodic:
+    """Calls a function on a daemon thread at a fixed interval, until stopped"""
+
+    def __init__(self, interval, fn, name=None):
+        self.interval = interval
+        self.fn = fn
+        self.name = name or f"jot-periodic-{getattr(fn, '__name__', 'fn')}"
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=3.0):
+        self._stopped.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.fn()
+            except Exception as e:
+                print(f"Error in {self.name}: {e}", file=sys.stderr)
@@ -1,14 +1,24 @@
 import sys
+import threading
 import time
-import traceback
+from datetime import datetime, timezone
+from json.encoder import encode_basestring
 
 from jot import util
 
-from . import log
+from . import errors, log
 from .base import Target
+from .filesink import DEFAULT_BACKUP_COUNT, FSYNC_NEVER, RotatingFileWriter
 from .flush import add_handler
+from .periodic import Periodic
 from .util import get_env, hex_encode_bytes
 
+TEXT = "text"
+JSON = "json"
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0
+
 
 def _now():
     return time.monotonic_ns() // 1000000
@@ -26,43 +36,111 @@ class PrintTarget(Target):
         elif filepath == "stderr":
             f = sys.stderr
         elif filepath:
-            f = open(filepath, "a")
-
-            def close_file():
-                f.close()
-
-            add_handler(close_file)
-
-        return cls(file=f) if f else None
-
-    def __init__(self, level=log.DEFAULT, file=sys.stderr):
+            f = RotatingFileWriter(
+                filepath,
+                max_bytes=int(get_env("LOG_MAX_BYTES", 0)),
+                interval=float(get_env("LOG_ROTATE_INTERVAL", 0)),
+                backup_count=int(get_env("LOG_BACKUP_COUNT", DEFAULT_BACKUP_COUNT)),
+                compress=get_env("LOG_COMPRESS", "false").lower() == "true",
+                fsync=get_env("LOG_FSYNC", FSYNC_NEVER).lower(),
+            )
+            add_handler(f.close)
+
+        if not f:
+            return None
+
+        format = get_env("LOG_FORMAT", TEXT).lower()
+        default_buffer_size = DEFAULT_BUFFER_SIZE if format == JSON else 0
+        buffer_size = int(get_env("LOG_BUFFER_SIZE", default_buffer_size))
+        flush_interval = float(get_env("LOG_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL))
+        return cls(file=f, format=format, buffer_size=buffer_size, flush_interval=flush_interval)
+
+    def __init__(
+        self,
+        level=log.DEFAULT,
+        file=sys.stderr,
+        format=TEXT,
+        buffer_size=0,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+    ):
         super().__init__(level)
+        if format not in (TEXT, JSON):
+            raise ValueError(f"Unsupported log format: {format}")
         self._file = file
+        self._format = format
+        self._buffer_size = buffer_size
+        self._buffer = []
+        self._buffered = 0
+        self._lock = threading.Lock()
+        self._periodic = None
+        if buffer_size > 0:
+            add_handler(self.flush)
+            if flush_interval:
+                self._periodic = Periodic(flush_interval, self.flush, "jot-print-flush")
+                self._periodic.start()
 
     def start(self, tags, span):
-        self._write(span, {}, "start", span.name)
+        if self._format == JSON:
+            self._emit(_json_line(span, None, "start", "name", span.name))
+        else:
+            self._write(span, {}, "start", span.name)
 
     def finish(self, tags, span):
         tags["duration"] = span.duration
-        self._write(span, tags, "finish", span.name)
+        if self._format == JSON:
+            self._emit(_json_line(span, tags, "finish", "name", span.name))
+        else:
+            self._write(span, tags, "finish", span.name)
 
     def event(self, name, tags, span=None):
-        self._write(span, tags, name)
+        if self._format == JSON:
+            self._emit(_json_line(span, tags, "event", "name", name))
+        else:
+            self._write(span, tags, name)
 
     def log(self, level, message, tags, span=None):
-        if self.accepts_log_level(level):
+        if not self.accepts_log_level(level):
+            return
+        if self._format == JSON:
+            self._emit(_json_line(span, tags, log.name(level), "message", message))
+        else:
             self._write(span, tags, log.name(level).upper(), message)
 
     def error(self, message, exception, tags, span=None):
-        self._write(span, tags, "Error:", message)
-        lines = traceback.format_exception(type(exception), exception, exception.__traceback__)
-        print("".join(lines), file=self._file)
+        record = errors.describe(exception)
+        if self._format == JSON:
+            line = _json_line(
+                span,
+                tags,
+                "error",
+                "message",
+                message,
+                {
+                    "exception.type": record.type,
+                    "exception.message": record.message,
+                    "exception.stacktrace": record.stacktrace,
+                },
+            )
+            self._emit(line)
+        else:
+            self._write(span, tags, "Error:", message)
+            self._emit(record.stacktrace + "\n")
 
     def magnitude(self, name, value, tags, span=None):
-        self._write(span, tags, f"{name}={value}")
+        if self._format == JSON:
+            self._emit(_json_line(span, tags, "magnitude", "name", name, {"value": value}))
+        else:
+            self._write(span, tags, f"{name}={value}")
 
     def count(self, name, value, tags, span=None):
-        self._write(span, tags, f"{name}={value}")
+        if self._format == JSON:
+            self._emit(_json_line(span, tags, "count", "name", name, {"value": value}))
+        else:
+            self._write(span, tags, f"{name}={value}")
+
+    def flush(self):
+        with self._lock:
+            self._flush()
 
     def _write(self, span, tags=None, *more):
         mns = _now()
@@ -74,6 +152,104 @@ class PrintTarget(Target):
                     v = hex_encode_bytes(v)
                 chunks.append(f"{k}={v}")
         else:
-            chunks.append(tags)
-        chunks.extend(more)
-        print(*chunks, file=self._file)
+            chunks.append(str(tags))
+        chunks.extend(str(c) for c in more)
+        self._emit(" ".join(chunks) + "\n")
+
+    def _emit(self, line):
+        with self._lock:
+            if self._buffer_size <= 0:
+                self._file.write(line)
+                return
+            self._buffer.append(line)
+            self._buffered += len(line)
+            if self._buffered >= self._buffer_size:
+                self._flush()
+
+    def _flush(self):
+        if self._file.closed:
+            return
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        self._file.flush()
+
+
+#
+# JSON encoding
+#
+
+# Keys and punctuation are precomputed, so that encoding a record is mostly string concatenation.
+_KEY_TS = '{"ts":"'
+_KEY_KIND = '","kind":"'
+_KEY_TRACE_ID = ',"trace_id":"'
+_KEY_PARENT_ID = '","parent_id":"'
+_KEY_SPAN_ID = '","span_id":"'
+_KEY_TAGS = ',"tags":{'
+
+# the formatted second is cached as one tuple, so that threads always read a matching pair
+_cached_second = (None, None)
+
+
+def _iso_timestamp(ns):
+    global _cached_second
+    second, fraction = divmod(ns, 1000000000)
+    cached, prefix = _cached_second
+    if second != cached:
+        dt = datetime.fromtimestamp(second, timezone.utc)
+        prefix = dt.strftime("%Y-%m-%dT%H:%M:%S.")
+        _cached_second = (second, prefix)
+    return f"{prefix}{fraction // 1000:06d}Z"
+
+
+def _json_value(value):
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        if value != value or value in (float("inf"), float("-inf")):
+            return "null"
+        return float.__repr__(value)
+    if isinstance(value, bytes):
+        return f'"{value.hex()}"'
+    return encode_basestring(str(value))
+
+
+def _json_line(span, tags, kind, key, text, extra=None):
+    parts = [_KEY_TS, _iso_timestamp(time.time_ns()), _KEY_KIND, kind, '"']
+    if span is not None:
+        parts.append(_KEY_TRACE_ID)
+        parts.append(span.trace_id.hex())
+        if span.parent_id is not None:
+            parts.append(_KEY_PARENT_ID)
+            parts.append(span.parent_id.hex())
+        parts.append(_KEY_SPAN_ID)
+        parts.append(span.id.hex())
+        parts.append('"')
+    parts.append(f',"{key}":')
+    parts.append(_json_value(text))
+    if extra:
+        for k, v in extra.items():
+            parts.append(f',"{k}":')
+            parts.append(_json_value(v))
+    if tags:
+        parts.append(_KEY_TAGS)
+        first = True
+        for k, v in tags.items():
+            if not first:
+                parts.append(",")
+            first = False
+            parts.append(encode_basestring(str(k)))
+            parts.append(":")
+            parts.append(_json_value(v))
+        parts.append("}")
+    parts.append("}\n")
+    return "".join(parts)
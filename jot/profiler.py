@@ -0,0 +1,158 @@
+import os
+import sys
+import threading
+import weakref
+from collections import Counter
+
+from . import base, facade, flush, log
+from .periodic import Periodic
+
+DEFAULT_INTERVAL = 0.01
+DEFAULT_EXPORT_INTERVAL = 60.0
+DEFAULT_MAX_DEPTH = 64
+
+_profiler = None
+
+
+def enable(
+    interval=DEFAULT_INTERVAL,
+    export_interval=DEFAULT_EXPORT_INTERVAL,
+    path=None,
+    max_depth=DEFAULT_MAX_DEPTH,
+):
+    """Start sampling the stacks of threads that are inside spans.
+
+    Every `interval` seconds, the stack of each thread with an open span is recorded against the
+    innermost span on that thread. Every `export_interval` seconds, and when `jot.flush` is
+    called, the samples are exported as folded stacks, one line per distinct stack, with the span
+    name as the root frame. If `path` is given they are appended to that file, ready for
+    flamegraph tools; otherwise they are logged to the active target, one record per span name.
+
+    Samples are attributed by thread, so asyncio tasks that interleave on one thread are all
+    charged to whichever span was started most recently on it.
+    """
+    global _profiler
+    disable()
+    _profiler = SpanProfiler(interval, export_interval, path, max_depth)
+    _profiler.start()
+    return _profiler
+
+
+def disable():
+    global _profiler
+    if _profiler is not None:
+        _profiler.stop()
+        _profiler = None
+
+
+class SpanProfiler:
+    """A span observer that samples the stacks of threads inside spans.
+
+    Open spans are held by weak reference, so a span that is never finished stops being charged
+    samples once it is garbage collected.
+    """
+
+    def __init__(
+        self,
+        interval=DEFAULT_INTERVAL,
+        export_interval=DEFAULT_EXPORT_INTERVAL,
+        path=None,
+        max_depth=DEFAULT_MAX_DEPTH,
+    ):
+        self.path = path
+        self.max_depth = max_depth
+        self.sample_count = 0
+        self._spans = {}
+        self._samples = Counter()
+        self._lock = threading.Lock()
+        self._sampler = Periodic(interval, self.sample, "jot-profiler")
+        self._exporter = Periodic(export_interval, self.export, "jot-profiler-export")
+
+    def start(self):
+        base.add_observer(self)
+        flush.add_handler(self.export)
+        self._sampler.start()
+        if self._exporter.interval:
+            self._exporter.start()
+
+    def stop(self):
+        self._sampler.stop()
+        self._exporter.stop()
+        base.remove_observer(self)
+        flush.remove_handler(self.export)
+        self.export()
+
+    def span_started(self, span):
+        thread = threading.get_ident()
+        with self._lock:
+            self._spans.setdefault(thread, []).append(weakref.ref(span))
+
+    def span_finished(self, span, tags):
+        # spans can finish on a different thread than they started on, so look everywhere
+        with self._lock:
+            for thread, stack in list(self._spans.items()):
+                for i, ref in enumerate(stack):
+                    if ref() is span:
+                        del stack[i]
+                        if not stack:
+                            del self._spans[thread]
+                        return
+
+    def sample(self):
+        me = threading.get_ident()
+        active = {}
+        with self._lock:
+            for thread, stack in list(self._spans.items()):
+                stack[:] = [ref for ref in stack if ref() is not None]
+                span = stack[-1]() if stack else None
+                if not stack:
+                    del self._spans[thread]
+                elif span is not None:
+                    active[thread] = span.name
+        frames = sys._current_frames()
+        samples = []
+        for thread, name in active.items():
+            frame = frames.get(thread)
+            if frame is not None and thread != me:
+                samples.append((name, _fold(frame, self.max_depth)))
+        with self._lock:
+            self._samples.update(samples)
+            self.sample_count += len(samples)
+
+    def export(self):
+        with self._lock:
+            samples, self._samples = self._samples, Counter()
+        if not samples:
+            return
+
+        if self.path is not None:
+            with open(self.path, "a") as f:
+                for (name, stack), count in sorted(samples.items()):
+                    f.write(f"{name};{stack} {count}\n")
+            return
+
+        by_name = {}
+        for (name, stack), count in samples.items():
+            lines, total = by_name.get(name, ([], 0))
+            lines.append(f"{name};{stack} {count}")
+            by_name[name] = (lines, total + count)
+        target = facade.active_meter.target
+        for name, (lines, total) in sorted(by_name.items()):
+            tags = {
+                "span.name": name,
+                "profile.samples": total,
+                "profile.folded": "\n".join(sorted(lines)),
+            }
+            target.maybe_log(log.INFO, f"Profile of {name}", tags)
+
+
+def _fold(frame, max_depth):
+    frames = []
+    while frame is not None and len(frames) < max_depth:
+        code = frame.f_code
+        frames.append(
+            f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        )
+        frame = frame.f_back
+    frames.reverse()
+    return ";".join(frames)
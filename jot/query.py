@@ -0,0 +1,160 @@
+"""Query a database written by `jot.sqlite.SQLiteTarget`.
+
+python -m jot.query slowest PATH [--name NAME] [--limit N]
+python -m jot.query percentiles PATH [--name NAME]
+python -m jot.query trace PATH TRACE_ID
+"""
+
+import argparse
+import json
+import math
+import sqlite3
+import sys
+
+from . import log
+
+PERCENTILES = (50, 90, 99)
+
+
+def connect(path):
+    # open read-only, so that querying never creates or modifies a database
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def slowest(db, name=None, limit=20):
+    """Return the slowest spans, optionally only those with the given name"""
+    sql = "SELECT trace_id, span_id, name, start_time, duration FROM spans"
+    args = []
+    if name is not None:
+        sql += " WHERE name = ?"
+        args.append(name)
+    sql += " ORDER BY duration DESC LIMIT ?"
+    args.append(limit)
+    keys = ("trace_id", "span_id", "name", "start_time", "duration")
+    return [dict(zip(keys, row)) for row in db.execute(sql, args)]
+
+
+def percentiles(db, name=None):
+    """Return the count and duration percentiles of spans, grouped by name"""
+    sql = "SELECT name, duration FROM spans"
+    args = []
+    if name is not None:
+        sql += " WHERE name = ?"
+        args.append(name)
+    sql += " ORDER BY name, duration"
+
+    durations = {}
+    for span_name, duration in db.execute(sql, args):
+        durations.setdefault(span_name, []).append(duration)
+
+    results = []
+    for span_name, values in durations.items():
+        result = {"name": span_name, "count": len(values)}
+        for p in PERCENTILES:
+            result[f"p{p}"] = _nearest_rank(values, p)
+        result["max"] = values[-1]
+        results.append(result)
+    return results
+
+
+def trace(db, trace_id):
+    """Return the spans of a trace as a list of root spans, each with nested children"""
+    rows = db.execute(
+        "SELECT span_id, parent_id, name, start_time, duration, tags FROM spans"
+        " WHERE trace_id = ? ORDER BY start_time",
+        (trace_id,),
+    )
+    spans = {}
+    for span_id, parent_id, name, start_time, duration, tags in rows:
+        spans[span_id] = {
+            "span_id": span_id,
+            "parent_id": parent_id,
+            "name": name,
+            "start_time": start_time,
+            "duration": duration,
+            "tags": json.loads(tags),
+            "logs": [],
+            "children": [],
+        }
+
+    logs = db.execute(
+        "SELECT span_id, timestamp, level, message FROM logs WHERE trace_id = ? ORDER BY timestamp",
+        (trace_id,),
+    )
+    for span_id, timestamp, level, message in logs:
+        if span_id in spans:
+            spans[span_id]["logs"].append(
+                {"timestamp": timestamp, "level": level, "message": message}
+            )
+
+    roots = []
+    for span in spans.values():
+        parent = spans.get(span["parent_id"])
+        (parent["children"] if parent is not None else roots).append(span)
+    return roots
+
+
+def _nearest_rank(values, percentile):
+    rank = max(math.ceil(percentile / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def _ms(ns):
+    return f"{ns / 1e6:.3f}ms"
+
+
+def print_slowest(rows, file):
+    for row in rows:
+        print(f"{_ms(row['duration']):>14}  {row['name']}  {row['trace_id']}", file=file)
+
+
+def print_percentiles(rows, file):
+    columns = ["count", *(f"p{p}" for p in PERCENTILES), "max"]
+    print("name".ljust(32) + "".join(c.rjust(14) for c in columns), file=file)
+    for row in rows:
+        cells = [str(row["count"]), *(_ms(row[c]) for c in columns[1:])]
+        print(row["name"].ljust(32) + "".join(c.rjust(14) for c in cells), file=file)
+
+
+def print_trace(roots, file, depth=0):
+    for span in roots:
+        indent = "  " * depth
+        print(f"{indent}{span['name']} {_ms(span['duration'])}", file=file)
+        for entry in span["logs"]:
+            print(f"{indent}  - {log.name(entry['level'])}: {entry['message']}", file=file)
+        print_trace(span["children"], file, depth + 1)
+
+
+def main(argv=None, file=None):
+    file = file if file is not None else sys.stdout
+    parser = argparse.ArgumentParser(prog="python -m jot.query")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    slowest_parser = commands.add_parser("slowest", help="list the slowest spans")
+    slowest_parser.add_argument("path")
+    slowest_parser.add_argument("--name", help="only spans with this name")
+    slowest_parser.add_argument("--limit", type=int, default=20)
+
+    percentiles_parser = commands.add_parser("percentiles", help="duration percentiles by name")
+    percentiles_parser.add_argument("path")
+    percentiles_parser.add_argument("--name", help="only spans with this name")
+
+    trace_parser = commands.add_parser("trace", help="show the spans of a trace as a tree")
+    trace_parser.add_argument("path")
+    trace_parser.add_argument("trace_id")
+
+    args = parser.parse_args(argv)
+    db = connect(args.path)
+    try:
+        if args.command == "slowest":
+            print_slowest(slowest(db, args.name, args.limit), file)
+        elif args.command == "percentiles":
+            print_percentiles(percentiles(db, args.name), file)
+        elif args.command == "trace":
+            print_trace(trace(db, args.trace_id), file)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
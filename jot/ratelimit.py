@@ -0,0 +1,104 @@
+import threading
+from time import monotonic
+
+from . import store
+from .wrapper import WrapperTarget
+
+SITE = "site"
+MESSAGE = "message"
+
+
+class TokenBucket:
+    """Allow `rate` records per second on average, with bursts of up to `burst` records"""
+
+    def __init__(self, rate, burst=None, now=0.0):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1)
+        self.tokens = self.burst
+        self.updated = now
+
+    def allow(self, now):
+        elapsed = now - self.updated
+        self.updated = now
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class FirstThenEvery:
+    """Allow the first `first` records, then every `every`th record after that.
+
+    If `window` is given, the count starts over every `window` seconds.
+    """
+
+    def __init__(self, first, every, window=None, now=0.0):
+        self.first = first
+        self.every = every
+        self.window = window
+        self.started = now
+        self.seen = 0
+
+    def allow(self, now):
+        if self.window is not None and now - self.started >= self.window:
+            self.started = now
+            self.seen = 0
+        self.seen += 1
+        if self.seen <= self.first:
+            return True
+        return self.every > 0 and (self.seen - self.first) % self.every == 0
+
+
+class _Limit:
+    def __init__(self, policy):
+        self.policy = policy
+        self.suppressed = 0
+
+
+class RateLimitTarget(WrapperTarget):
+    """A target that limits how many log records each call site can produce.
+
+    Records are grouped by call site (the `file` and `line` tags added by `Meter` and the logging
+    bridge) or by message, and each group gets its own instance of the policy returned by
+    `policy(now)`. Records the policy rejects are dropped and counted; the next record from the
+    same group that gets through carries the number dropped in the `log.suppressed` tag. Records
+    from the logging bridge are grouped by the unformatted message in their `log.template` tag.
+    """
+
+    def __init__(
+        self,
+        target=None,
+        policy=None,
+        key=SITE,
+        max_keys=store.DEFAULT_MAX_SIZE,
+        level=None,
+        clock=monotonic,
+    ):
+        super().__init__(target, level)
+        self.policy = policy if policy is not None else lambda now: TokenBucket(10, 100, now)
+        self.key = key
+        self.suppressed = 0
+        self._clock = clock
+        self._limits = store.BoundedStore(max_keys, None)
+        self._lock = threading.Lock()
+
+    def log(self, level, message, tags, span=None):
+        key = self._key_for(level, message, tags)
+        now = self._clock()
+        with self._lock:
+            limit = self._limits.get_or_create(key, lambda: _Limit(self.policy(now)))
+            if not limit.policy.allow(now):
+                limit.suppressed += 1
+                self.suppressed += 1
+                return
+            suppressed, limit.suppressed = limit.suppressed, 0
+
+        if suppressed:
+            tags["log.suppressed"] = suppressed
+        self.target.log(level, message, tags, span)
+
+    def _key_for(self, level, message, tags):
+        if self.key == SITE and "file" in tags:
+            return (level, tags["file"], tags.get("line"))
+        return (level, tags.get("log.template", message))
@@ -0,0 +1,83 @@
+import threading
+import time
+import tracemalloc
+
+from . import base
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+# Linux can report usage for the calling thread alone, which is what we want for a span.
+_RUSAGE_THREAD = getattr(resource, "RUSAGE_THREAD", None)
+_RUSAGE_WHO = _RUSAGE_THREAD if _RUSAGE_THREAD is not None else getattr(resource, "RUSAGE_SELF", 0)
+
+_observer = None
+
+
+def enable(rusage=True, allocations=False):
+    """Record the resources used by each span, and add them to the span's tags when it finishes.
+
+    Thread and process CPU time are always recorded. If `rusage` is true, page faults and block
+    I/O are recorded too, where the platform supports it. If `allocations` is true, tracemalloc
+    is started and the net bytes allocated during the span are recorded.
+    """
+    global _observer
+    disable()
+    if allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _observer = ResourceObserver(rusage and resource is not None, allocations)
+    base.add_observer(_observer)
+    return _observer
+
+
+def disable():
+    global _observer
+    if _observer is not None:
+        base.remove_observer(_observer)
+        _observer = None
+
+
+class _Snapshot:
+    __slots__ = ("thread", "thread_time", "process_time", "rusage", "allocated")
+
+    def __init__(self, rusage, allocations):
+        self.thread = threading.get_ident()
+        self.thread_time = time.thread_time_ns()
+        self.process_time = time.process_time_ns()
+        self.rusage = resource.getrusage(_RUSAGE_WHO) if rusage else None
+        self.allocated = tracemalloc.get_traced_memory()[0] if allocations else None
+
+
+class ResourceObserver:
+    """A span observer that measures the resources each span uses"""
+
+    def __init__(self, rusage=True, allocations=False):
+        self.rusage = rusage
+        self.allocations = allocations
+
+    def span_started(self, span):
+        span._jot_resources = _Snapshot(self.rusage, self.allocations)
+
+    def span_finished(self, span, tags):
+        start = getattr(span, "_jot_resources", None)
+        if start is None:
+            return
+        del span._jot_resources
+        end = _Snapshot(self.rusage, self.allocations)
+        same_thread = start.thread == end.thread
+
+        # thread CPU time only makes sense if the span finished on the thread that started it
+        if same_thread:
+            tags["cpu.thread_time_ns"] = end.thread_time - start.thread_time
+        tags["cpu.process_time_ns"] = end.process_time - start.process_time
+
+        if start.rusage is not None and (same_thread or _RUSAGE_WHO != _RUSAGE_THREAD):
+            tags["rusage.minor_faults"] = end.rusage.ru_minflt - start.rusage.ru_minflt
+            tags["rusage.major_faults"] = end.rusage.ru_majflt - start.rusage.ru_majflt
+            tags["rusage.block_input"] = end.rusage.ru_inblock - start.rusage.ru_inblock
+            tags["rusage.block_output"] = end.rusage.ru_oublock - start.rusage.ru_oublock
+
+        if start.allocated is not None and end.allocated is not None:
+            tags["memory.allocated_bytes"] = end.allocated - start.allocated
@@ -0,0 +1,95 @@
+import random
+import threading
+from time import monotonic
+
+from . import base
+
+DEFAULT_WINDOW = 10.0
+DEFAULT_MIN_RATE = 0.01
+
+_sampler = None
+
+
+def enable(budget, window=DEFAULT_WINDOW, min_rate=DEFAULT_MIN_RATE):
+    """Sample new traces to keep to a budget of `budget` traces per second.
+
+    See `AdaptiveSampler`. Returns the sampler, which is consulted for every root span.
+    """
+    global _sampler
+    _sampler = AdaptiveSampler(budget, window, min_rate)
+    base.set_sampler(_sampler)
+    return _sampler
+
+
+def disable():
+    global _sampler
+    _sampler = None
+    base.set_sampler(None)
+
+
+class AdaptiveSampler:
+    """Chooses sampling rates per span name to keep to a budget of sampled traces per second.
+
+    Root spans are counted by name, and every `window` seconds the rates are recalculated from
+    those counts. The budget is shared equally between names, and any share that a name doesn't
+    use is redistributed to the busier ones, so rare names are kept in full while frequent ones
+    are thinned out. No name is sampled at less than `min_rate`. Names seen for the first time
+    are sampled in full until the next recalculation.
+    """
+
+    def __init__(
+        self,
+        budget,
+        window=DEFAULT_WINDOW,
+        min_rate=DEFAULT_MIN_RATE,
+        clock=monotonic,
+        random=random.random,
+    ):
+        if budget <= 0:
+            raise ValueError(f"Sampling budget must be positive: {budget}")
+        self.budget = budget
+        self.window = window
+        self.min_rate = min_rate
+        self.rates = {}
+        self._counts = {}
+        self._clock = clock
+        self._random = random
+        self._window_start = clock()
+        self._lock = threading.Lock()
+
+    def sample(self, name):
+        with self._lock:
+            now = self._clock()
+            if now - self._window_start >= self.window:
+                self._recalculate(now)
+            self._counts[name] = self._counts.get(name, 0) + 1
+            rate = self.rates.get(name, 1.0)
+        return rate >= 1.0 or self._random() < rate, rate
+
+    def _recalculate(self, now):
+        elapsed = now - self._window_start
+        demand = {name: count / elapsed for name, count in self._counts.items()}
+        self.rates = {
+            name: max(rate, self.min_rate) for name, rate in _allocate(self.budget, demand).items()
+        }
+        self._counts = {}
+        self._window_start = now
+
+
+def _allocate(budget, demand):
+    """Divide a budget between names by max-min fairness, returning a sampling rate for each"""
+    rates = {}
+    remaining = budget
+    pending = sorted(demand.items(), key=lambda item: item[1])
+    while pending:
+        share = remaining / len(pending)
+        name, wanted = pending[0]
+        if wanted > share:
+            break
+        # this name fits in its share, so keep all of it and leave the rest for the others
+        rates[name] = 1.0
+        remaining -= wanted
+        pending.pop(0)
+    for name, wanted in pending:
+        rates[name] = (remaining / len(pending)) / wanted
+    return rates
@@ -5,7 +5,7 @@ from sentry_sdk.integrations.modules import ModulesIntegration
 from sentry_sdk.integrations.stdlib import StdlibIntegration
 from sentry_sdk.integrations.threading import ThreadingIntegration
 
-from . import flush, log, util
+from . import flush, log, store, util
 from .base import Target
 
 
@@ -39,14 +39,21 @@ class SentryTarget(Target):
         if client is not None:
             client.flush()
 
-    def __init__(self, level=log.DEFAULT, **kwargs):
+    def __init__(
+        self,
+        level=log.DEFAULT,
+        max_spans=store.DEFAULT_MAX_SIZE,
+        span_ttl=store.DEFAULT_TTL,
+        **kwargs,
+    ):
         self.init_sentry(**kwargs)
         super().__init__(level)
-        self.spans = {}
+        self.spans = store.BoundedStore(max_spans, span_ttl)
 
     def start(self, tags, span):
-        if span.parent_id is not None and span.parent_id in self.spans:
-            sentry_span = self.spans[span.parent_id].start_child(
+        parent = self.spans.get(span.parent_id) if span.parent_id is not None else None
+        if parent is not None:
+            sentry_span = parent.start_child(
                 op=span.name,
                 description=span.name,
                 span_id=util.format_span_id(span.id),
@@ -75,6 +82,10 @@ class SentryTarget(Target):
                 sentry_span.set_tag(k, v)
             sentry_span.finish()
 
+    def finish_unsampled(self, tags, span):
+        # an unfinished transaction is discarded rather than sent
+        self.spans.pop(span.id, None)
+
     def log(self, level, message, tags, span=None):
         sentry.capture_message(
             message,
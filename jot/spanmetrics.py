@@ -0,0 +1,110 @@
+import threading
+
+from . import flush, store
+from .periodic import Periodic
+from .wrapper import WrapperTarget
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_INTERVAL = 60.0
+
+
+class _Series:
+    def __init__(self, buckets):
+        self.requests = 0
+        self.errors = 0
+        self.duration_sum = 0.0
+        self.buckets = [0] * (len(buckets) + 1)
+
+
+class SpanMetricsTarget(WrapperTarget):
+    """A target that derives request, error and duration metrics from finished spans.
+
+    Every finished span is counted in a series keyed by its name and the values of `tag_keys`.
+    Every `interval` seconds, and when `jot.flush` is called, the counts since the last export are
+    sent to `metrics_target` (by default, the wrapped target) as `span_requests`, `span_errors`,
+    `span_duration_seconds_bucket` (one count per bucket, tagged with its upper bound `le`) and
+    `span_duration_seconds_sum` (the total duration since the last export, also a count), all
+    tagged with `span_name` and the selected tags. Set
+    `forward_spans` to false to compute metrics without exporting the spans themselves.
+    """
+
+    def __init__(
+        self,
+        target=None,
+        metrics_target=None,
+        tag_keys=(),
+        buckets=DEFAULT_BUCKETS,
+        interval=DEFAULT_INTERVAL,
+        forward_spans=True,
+        level=None,
+    ):
+        super().__init__(target, level)
+        self.metrics_target = metrics_target if metrics_target is not None else self.target
+        self.tag_keys = tuple(tag_keys)
+        self.buckets = tuple(sorted(buckets))
+        self.forward_spans = forward_spans
+        self._series = {}
+        self._failed = store.BoundedStore()
+        self._lock = threading.Lock()
+        self._periodic = None
+        if interval:
+            self._periodic = Periodic(interval, self.export, "jot-span-metrics")
+            self._periodic.start()
+        flush.add_handler(self.export)
+
+    def close(self):
+        flush.remove_handler(self.export)
+        if self._periodic is not None:
+            self._periodic.stop()
+            self._periodic = None
+
+    def error(self, message, exception, tags, span=None):
+        if span is not None:
+            self._failed[span.id] = True
+        self.target.error(message, exception, tags, span)
+
+    def finish(self, tags, span):
+        self._record(tags, span)
+        if self.forward_spans:
+            self.target.finish(tags, span)
+
+    def finish_unsampled(self, tags, span):
+        # spans that weren't sampled still count towards the metrics
+        self._record(tags, span)
+        self.target.finish_unsampled(tags, span)
+
+    def _record(self, tags, span):
+        key = (span.name, tuple(str(tags.get(k, "")) for k in self.tag_keys))
+        failed = self._failed.pop(span.id, False)
+        duration = span.duration / 1e9
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.buckets)
+            series.requests += 1
+            if failed:
+                series.errors += 1
+            series.duration_sum += duration
+            series.buckets[self._bucket_index(duration)] += 1
+
+    def export(self):
+        with self._lock:
+            exported, self._series = self._series, {}
+
+        bounds = [*(str(b) for b in self.buckets), "+Inf"]
+        for (name, values), series in exported.items():
+            tags = {"span_name": name, **dict(zip(self.tag_keys, values))}
+            self.metrics_target.count("span_requests", series.requests, dict(tags))
+            self.metrics_target.count("span_errors", series.errors, dict(tags))
+            cumulative = 0
+            for bound, count in zip(bounds, series.buckets):
+                cumulative += count
+                bucket_tags = {**tags, "le": bound}
+                self.metrics_target.count("span_duration_seconds_bucket", cumulative, bucket_tags)
+            self.metrics_target.count("span_duration_seconds_sum", series.duration_sum, tags)
+
+    def _bucket_index(self, duration):
+        for i, bound in enumerate(self.buckets):
+            if duration <= bound:
+                return i
+        return len(self.buckets)
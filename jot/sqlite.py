@@ -0,0 +1,225 @@
+"""A target that stores telemetry in a local SQLite database.
+
+Query a database with:
+
+    python -m jot.query slowest PATH
+    python -m jot.query percentiles PATH
+    python -m jot.query trace PATH TRACE_ID
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from time import perf_counter, time_ns
+
+from . import errors, flush, log, stats
+from .base import Target
+from .periodic import Periodic
+from .util import format_span_id, format_trace_id, get_env
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_PENDING = 100000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spans (
+    trace_id TEXT NOT NULL,
+    span_id TEXT NOT NULL,
+    parent_id TEXT,
+    name TEXT NOT NULL,
+    start_time INTEGER NOT NULL,
+    duration INTEGER NOT NULL,
+    tags TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS spans_trace_id ON spans (trace_id);
+CREATE INDEX IF NOT EXISTS spans_name_duration ON spans (name, duration);
+CREATE INDEX IF NOT EXISTS spans_duration ON spans (duration);
+
+CREATE TABLE IF NOT EXISTS events (
+    trace_id TEXT,
+    span_id TEXT,
+    timestamp INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    tags TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_trace_id ON events (trace_id);
+
+CREATE TABLE IF NOT EXISTS logs (
+    trace_id TEXT,
+    span_id TEXT,
+    timestamp INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    tags TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logs_trace_id ON logs (trace_id);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    trace_id TEXT,
+    span_id TEXT,
+    timestamp INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    tags TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metrics_name ON metrics (name);
+"""
+
+_INSERTS = {
+    "spans": "INSERT INTO spans VALUES (?, ?, ?, ?, ?, ?, ?)",
+    "events": "INSERT INTO events VALUES (?, ?, ?, ?, ?)",
+    "logs": "INSERT INTO logs VALUES (?, ?, ?, ?, ?, ?)",
+    "metrics": "INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?)",
+}
+
+
+class SQLiteTarget(Target):
+    """A target that writes spans, events, logs and metrics to a SQLite database.
+
+    Rows are queued in memory and written in a single transaction every `flush_interval`
+    seconds on a background thread, and when `jot.flush` is called. If more than `max_pending`
+    rows are waiting, new ones are dropped and counted. The database uses write-ahead logging,
+    so it can be queried while the process is still writing to it.
+    """
+
+    @classmethod
+    def from_environment(cls):
+        path = get_env("SQLITE_PATH")
+        if path:
+            interval = float(get_env("SQLITE_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL))
+            return cls(path, interval)
+
+    def __init__(
+        self,
+        path,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+        max_pending=DEFAULT_MAX_PENDING,
+        level=None,
+        name=None,
+    ):
+        super().__init__(level)
+        self.path = path
+        self.stats_name = stats.exporter_name(self, name or path)
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._periodic = None
+        if flush_interval:
+            self._periodic = Periodic(flush_interval, self.flush, "jot-sqlite-flush")
+            self._periodic.start()
+        flush.add_handler(self.flush)
+
+    def flush(self):
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return
+
+        tables = {}
+        for table, row in rows:
+            tables.setdefault(table, []).append(row)
+        with self._write_lock:
+            if self._db is None:
+                return
+            started = perf_counter()
+            failed = True
+            try:
+                with self._db:
+                    for table, values in tables.items():
+                        self._db.executemany(_INSERTS[table], values)
+                failed = False
+            except Exception as e:
+                # flush runs from jot.flush and the flush thread, so report the error rather than
+                # raising it at the caller
+                print(f"SQLite error: {e}", file=sys.stderr)
+            finally:
+                duration = perf_counter() - started
+                stats.record_export(self.stats_name, len(rows), None, duration, failed)
+
+    def close(self):
+        flush.remove_handler(self.flush)
+        if self._periodic is not None:
+            self._periodic.stop()
+            self._periodic = None
+        self.flush()
+        with self._write_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def finish(self, tags, span):
+        row = (
+            format_trace_id(span.trace_id),
+            format_span_id(span.id),
+            format_span_id(span.parent_id),
+            span.name,
+            span.start_time,
+            span.duration,
+            _json(tags),
+        )
+        self._add("spans", row)
+        for event in span.events:
+            self._add("events", (*_ids(span), event.timestamp, event.name, _json(event.tags)))
+
+    def event(self, name, tags, span=None):
+        if span is not None:
+            super().event(name, tags, span)
+        else:
+            self._add("events", (None, None, time_ns(), name, _json(tags)))
+
+    def log(self, level, message, tags, span=None):
+        self._add("logs", (*_ids(span), time_ns(), level, message, _json(tags)))
+
+    def error(self, message, exception, tags, span=None):
+        record = errors.describe(exception)
+        tags = {
+            **tags,
+            "exception.type": record.type,
+            "exception.message": record.message,
+            "exception.stacktrace": record.stacktrace,
+        }
+        self._add("logs", (*_ids(span), time_ns(), log.ERROR, message, _json(tags)))
+
+    def magnitude(self, name, value, tags, span=None):
+        self._add("metrics", (*_ids(span), time_ns(), "magnitude", name, value, _json(tags)))
+
+    def count(self, name, value, tags, span=None):
+        self._add("metrics", (*_ids(span), time_ns(), "count", name, value, _json(tags)))
+
+    def _add(self, table, row):
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                stats.record_drop(self.stats_name)
+                return
+            self._pending.append((table, tuple(map(_column, row))))
+
+
+def _ids(span):
+    if span is None:
+        return None, None
+    return format_trace_id(span.trace_id), format_span_id(span.id)
+
+
+def _column(value):
+    # values sqlite3 can't bind, such as Decimal, would fail the whole batch
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return value
+    return str(value)
+
+
+def _json(tags):
+    return json.dumps(tags, default=_default)
+
+
+def _default(value):
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
@@ -0,0 +1,219 @@
+"""Jot's own telemetry: how much exporters send, how long it takes and what goes wrong."""
+
+import threading
+import weakref
+
+from . import facade
+from .periodic import Periodic
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+DEFAULT_REPORT_INTERVAL = 60.0
+
+_queues = weakref.WeakValueDictionary()
+_targets = {}
+_lock = threading.Lock()
+_reporter = None
+
+
+def register_queue(name, owner):
+    """Report the depth of `owner.queue` in `queue_depths`.
+
+    The owner is held weakly, so it doesn't need to be unregistered. If it has a `dropped`
+    attribute, that is reported too.
+    """
+    with _lock:
+        _queues[name] = owner
+
+
+def unregister_queue(name, owner):
+    with _lock:
+        if _queues.get(name) is owner:
+            del _queues[name]
+
+
+def queue_depths():
+    """Return {name: {"depth", "capacity", "dropped"}} for every registered queue"""
+    with _lock:
+        owners = dict(_queues)
+    depths = {}
+    for name, owner in sorted(owners.items()):
+        depths[name] = {
+            "depth": owner.queue.qsize(),
+            "capacity": owner.queue.maxsize,
+            "dropped": getattr(owner, "dropped", 0),
+        }
+    return depths
+
+
+class TargetStats:
+    """Running totals for one exporter"""
+
+    def __init__(self):
+        self.sent = 0
+        # None until an export reports its size; some exporters can't measure it
+        self.bytes = None
+        self.failures = 0
+        self.dropped = 0
+        self.duration_count = 0
+        self.duration_sum = 0.0
+        self.duration_max = 0.0
+        self.duration_buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        self._lock = threading.Lock()
+
+    def record_export(self, items=1, size=None, duration=None, failed=False):
+        with self._lock:
+            if failed:
+                self.failures += 1
+            else:
+                self.sent += items
+                if size is not None:
+                    self.bytes = (self.bytes or 0) + size
+            if duration is not None:
+                self.duration_count += 1
+                self.duration_sum += duration
+                self.duration_max = max(self.duration_max, duration)
+                self.duration_buckets[_bucket_index(duration)] += 1
+
+    def record_drop(self, count=1):
+        with self._lock:
+            self.dropped += count
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "sent": self.sent,
+                "bytes": self.bytes,
+                "failures": self.failures,
+                "dropped": self.dropped,
+                "duration": {
+                    "count": self.duration_count,
+                    "sum": self.duration_sum,
+                    "max": self.duration_max,
+                    "buckets": dict(
+                        zip([*map(str, DURATION_BUCKETS), "+Inf"], self.duration_buckets)
+                    ),
+                },
+            }
+
+
+def target_stats(name):
+    with _lock:
+        stats = _targets.get(name)
+        if stats is None:
+            stats = _targets[name] = TargetStats()
+        return stats
+
+
+def exporter_name(target, label=None):
+    """Return the name to record the exports of `target` under: its class name, then `label`.
+
+    Exporters pass their endpoint, or a name they were given, so that several instances of the
+    same class are recorded separately.
+    """
+    name = type(target).__name__
+    return f"{name}:{label}" if label else name
+
+
+def name_of(target):
+    """Return the name `target` records its exports under"""
+    return getattr(target, "stats_name", None) or type(target).__name__
+
+
+def record_export(name, items=1, size=None, duration=None, failed=False):
+    """Record an attempt by the exporter `name` to send `items` items in `size` bytes.
+
+    Leave `size` as None if the exporter doesn't know how many bytes it sent.
+    """
+    target_stats(name).record_export(items, size, duration, failed)
+
+
+def record_drop(name, count=1):
+    """Record that the exporter `name` discarded items without trying to send them"""
+    target_stats(name).record_drop(count)
+
+
+def snapshot():
+    """Return the totals for every exporter and the depths of every registered queue"""
+    with _lock:
+        targets = dict(_targets)
+    return {
+        "targets": {name: stats.snapshot() for name, stats in sorted(targets.items())},
+        "queues": queue_depths(),
+    }
+
+
+def reset():
+    with _lock:
+        _targets.clear()
+
+
+def enable_reporting(target=None, interval=DEFAULT_REPORT_INTERVAL):
+    """Send jot's own telemetry to `target` every `interval` seconds.
+
+    If `target` is None, the active target at the time of each report is used. Counts are the
+    changes since the previous report: `jot.exporter.sent`, `jot.exporter.bytes`,
+    `jot.exporter.failures`, `jot.exporter.dropped` and `jot.queue.dropped`. Magnitudes are the
+    mean export duration in seconds over the interval, `jot.exporter.duration`, the longest so
+    far, `jot.exporter.duration.max`, and `jot.queue.depth`.
+    """
+    global _reporter
+    disable_reporting()
+    _reporter = Reporter(target, interval)
+    _reporter.start()
+    return _reporter
+
+
+def disable_reporting():
+    global _reporter
+    if _reporter is not None:
+        _reporter.stop()
+        _reporter = None
+
+
+class Reporter:
+    def __init__(self, target=None, interval=DEFAULT_REPORT_INTERVAL):
+        self.target = target
+        self._previous = {"targets": {}, "queues": {}}
+        self._periodic = Periodic(interval, self.report, "jot-stats-report")
+
+    def start(self):
+        self._periodic.start()
+
+    def stop(self):
+        self._periodic.stop()
+
+    def report(self):
+        target = self.target if self.target is not None else facade.active_meter.target
+        current = snapshot()
+        previous, self._previous = self._previous, current
+
+        for name, stats in current["targets"].items():
+            before = previous["targets"].get(name)
+            tags = {"target": name}
+            for key in ("sent", "bytes", "failures", "dropped"):
+                if stats[key] is None:
+                    continue
+                delta = stats[key] - ((before[key] or 0) if before else 0)
+                if delta:
+                    target.count(f"jot.exporter.{key}", delta, dict(tags))
+            duration = stats["duration"]
+            count = duration["count"] - (before["duration"]["count"] if before else 0)
+            if count:
+                total = duration["sum"] - (before["duration"]["sum"] if before else 0.0)
+                target.magnitude("jot.exporter.duration", total / count, dict(tags))
+                target.magnitude("jot.exporter.duration.max", duration["max"], dict(tags))
+
+        for name, queue in current["queues"].items():
+            before = previous["queues"].get(name)
+            tags = {"queue": name}
+            target.magnitude("jot.queue.depth", queue["depth"], dict(tags))
+            delta = queue["dropped"] - (before["dropped"] if before else 0)
+            if delta:
+                target.count("jot.queue.dropped", delta, dict(tags))
+
+
+def _bucket_index(duration):
+    for i, bound in enumerate(DURATION_BUCKETS):
+        if duration <= bound:
+            return i
+    return len(DURATION_BUCKETS)
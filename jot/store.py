@@ -0,0 +1,113 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+DEFAULT_MAX_SIZE = 10000
+DEFAULT_TTL = 3600.0
+
+
+class BoundedStore:
+    """A thread-safe mapping that evicts its oldest entries when it is full or they expire.
+
+    Targets use this to hold per-span state between calls. If a span is never finished, its
+    state would otherwise be held forever.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL, clock=monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evicted_expired = 0
+        self.evicted_overflow = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def evicted(self):
+        return self.evicted_expired + self.evicted_overflow
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def __getitem__(self, key):
+        with self._lock:
+            entry = self._lookup(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[1]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._insert(key, value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._lookup(key)
+        return default if entry is None else entry[1]
+
+    def get_or_create(self, key, factory):
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry[1]
+            value = factory()
+            self._insert(key, value)
+            return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                return default
+            del self._entries[key]
+            return entry[1]
+
+    def items(self):
+        """Return a list of the (key, value) pairs that haven't expired"""
+        with self._lock:
+            self._evict_expired(self._clock())
+            return [(key, value) for key, (_, value) in self._entries.items()]
+
+    def evict_expired(self):
+        with self._lock:
+            self._evict_expired(self._clock())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.ttl is not None and entry[0] <= self._clock() - self.ttl:
+            del self._entries[key]
+            self.evicted_expired += 1
+            return None
+        return entry
+
+    def _insert(self, key, value):
+        now = self._clock()
+        self._entries.pop(key, None)
+        self._entries[key] = (now, value)
+        self._evict_expired(now)
+        if self.max_size is not None:
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evicted_overflow += 1
+
+    def _evict_expired(self, now):
+        # entries are kept in insertion order, so the expired ones are all at the front
+        if self.ttl is None:
+            return
+        deadline = now - self.ttl
+        while self._entries:
+            stamp, _ = next(iter(self._entries.values()))
+            if stamp > deadline:
+                break
+            self._entries.popitem(last=False)
+            self.evicted_expired += 1
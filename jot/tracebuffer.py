@@ -0,0 +1,100 @@
+import threading
+from collections import deque
+
+from . import log, store
+from .wrapper import WrapperTarget
+
+DEFAULT_MAX_RECORDS = 1000
+
+
+class _TraceBuffer:
+    def __init__(self, max_records):
+        self.records = deque(maxlen=max_records)
+        self.failed = False
+
+
+class TraceBufferTarget(WrapperTarget):
+    """A target that holds back detailed logs until it knows whether a trace went wrong.
+
+    Log records at or above `level` are forwarded to the wrapped target straight away. Less
+    severe records, down to `buffer_level`, are kept in a per-trace buffer of up to `max_records`
+    records. If an error is reported anywhere in the trace, the buffer is forwarded and later
+    records in that trace are forwarded directly. If the trace's local root span finishes first,
+    the buffer is forwarded if the root took longer than `latency_threshold` seconds and discarded
+    otherwise. The local root is the first span of the trace in this process, which may continue
+    a remote trace.
+
+    The wrapped target should accept every level it will be sent, normally `log.ALL`.
+    """
+
+    def __init__(
+        self,
+        target=None,
+        level=log.WARNING,
+        buffer_level=log.DEBUG,
+        max_records=DEFAULT_MAX_RECORDS,
+        latency_threshold=None,
+        max_traces=store.DEFAULT_MAX_SIZE,
+        ttl=store.DEFAULT_TTL,
+    ):
+        super().__init__(target, level)
+        self.buffer_level = buffer_level
+        self.max_records = max_records
+        self.latency_threshold = latency_threshold
+        self._traces = store.BoundedStore(max_traces, ttl)
+        self._lock = threading.Lock()
+
+    def accepts_log_level(self, level):
+        return level <= self.buffer_level
+
+    def log(self, level, message, tags, span=None):
+        if level <= self.level or span is None:
+            if level <= self.level:
+                self.target.log(level, message, tags, span)
+            return
+        if level > self.buffer_level:
+            return
+
+        with self._lock:
+            trace = self._traces.get_or_create(span.trace_id, self._new_buffer)
+            if not trace.failed:
+                trace.records.append((level, message, tags, span))
+                return
+        self.target.log(level, message, tags, span)
+
+    def error(self, message, exception, tags, span=None):
+        if span is not None:
+            with self._lock:
+                trace = self._traces.get_or_create(span.trace_id, self._new_buffer)
+                trace.failed = True
+                records = list(trace.records)
+                trace.records.clear()
+            self._release(records)
+        self.target.error(message, exception, tags, span)
+
+    def finish(self, tags, span):
+        self._root_finished(span)
+        self.target.finish(tags, span)
+
+    def finish_unsampled(self, tags, span):
+        self._root_finished(span)
+        self.target.finish_unsampled(tags, span)
+
+    def _root_finished(self, span):
+        if span.is_local_root:
+            with self._lock:
+                trace = self._traces.pop(span.trace_id)
+            if trace is not None and not trace.failed and self._is_slow(span):
+                self._release(trace.records)
+
+    def _new_buffer(self):
+        return _TraceBuffer(self.max_records)
+
+    def _is_slow(self, span):
+        if self.latency_threshold is None:
+            return False
+        return span.duration >= self.latency_threshold * 1e9
+
+    def _release(self, records):
+        for level, message, tags, span in records:
+            self.target.log(level, message, tags, span)
@@ -62,12 +62,13 @@ def hex_decode_bytes(id):
     return _from_hex(hexbytes)[0]
 
 
-def add_caller_tags(tags):
+def caller_frame():
+    """Return the innermost frame on the stack that is not part of this package"""
     frame = inspect.currentframe()
 
     # some versions of python do not give access to frames
     if frame is None:  # pragma: no cover
-        return
+        return None
 
     # this frame is for this function, so skip it
     frame = frame.f_back
@@ -76,12 +77,14 @@ def add_caller_tags(tags):
     pdir = os.path.basename(os.path.dirname(__file__))
     while frame:
         fpath = frame.f_globals.get("__file__")
-        if fpath is None:
-            continue
-        fdir = os.path.basename(os.path.dirname(fpath))
-        if fdir != pdir:
+        if fpath is not None and os.path.basename(os.path.dirname(fpath)) != pdir:
             break
         frame = frame.f_back
+    return frame
+
+
+def add_caller_tags(tags):
+    frame = caller_frame()
 
     # if we ran out of frames, just return
     if frame is None:
@@ -0,0 +1,39 @@
+from .base import Target
+
+
+class WrapperTarget(Target):
+    """A target that forwards all calls to another target.
+
+    Subclasses override the methods they are interested in and call the superclass to forward.
+    """
+
+    def __init__(self, target=None, level=None):
+        super().__init__(level)
+        self.target = target if target is not None else Target()
+
+    def accepts_log_level(self, level):
+        return self.target.accepts_log_level(level)
+
+    def start(self, tags, span):
+        self.target.start(tags, span)
+
+    def finish(self, tags, span):
+        self.target.finish(tags, span)
+
+    def finish_unsampled(self, tags, span):
+        self.target.finish_unsampled(tags, span)
+
+    def event(self, name, tags, span=None):
+        self.target.event(name, tags, span)
+
+    def log(self, level, message, tags, span=None):
+        self.target.log(level, message, tags, span)
+
+    def error(self, message, exception, tags, span=None):
+        self.target.error(message, exception, tags, span)
+
+    def magnitude(self, name, value, tags, span=None):
+        self.target.magnitude(name, value, tags, span)
+
+    def count(self, name, value, tags, span=None):
+        self.target.count(name, value, tags, span)
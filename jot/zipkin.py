@@ -1,10 +1,14 @@
+import json
 import traceback
+from time import perf_counter
 
 import requests
 
-from . import util
+from . import stats, util
 from .base import Target
 
+_HEADERS = {"Content-Type": "application/json"}
+
 
 class ZipkinTarget(Target):
     """A target that sends traces to a zipkin server"""
@@ -15,20 +19,29 @@ class ZipkinTarget(Target):
         if url:
             return cls(url)
 
-    def __init__(self, url, level=None):
+    def __init__(self, url, level=None, name=None):
         super().__init__(level)
         self.url = url
+        self.stats_name = stats.exporter_name(self, name or url)
         self.session = requests.Session()
 
     def _send(self, payload):
+        data = json.dumps(payload).encode("utf-8")
+        started = perf_counter()
+        failed = True
         try:
-            response = self.session.post(self.url, json=payload)
+            response = self.session.post(self.url, data=data, headers=_HEADERS)
             if response.status_code > 299:
                 print(f"Zipkin response status code: {response.status_code}")
                 print(response.text)
+            else:
+                failed = False
         except Exception:
             # TODO: implement a better error handling mechanism
             print(traceback.format_exc())
+        finally:
+            duration = perf_counter() - started
+            stats.record_export(self.stats_name, len(payload), len(data), duration, failed)
 
     def finish(self, tags, span):
         obj = {
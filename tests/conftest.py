@@ -3,6 +3,21 @@ import inspect
 import pytest
 
 
+class FakeClock:
+    """A clock for code that takes a `clock` function; tests move time on by setting `now`"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
 @pytest.fixture(params=[{}, {"floozy": 72}, {"bink": 64, "floozy": 72}])
 def tags(request):
     return request.param
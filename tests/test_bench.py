@@ -0,0 +1,149 @@
+import json
+
+import pytest
+
+from jot.bench import __main__ as bench_main
+from jot.bench import imports, load, memory, micro
+
+
+def test_micro_run():
+    results = micro.run("^meter\\.|^ids\\.", number=10, repeat=1)
+    names = [r["name"] for r in results]
+    assert "meter.start_finish" in names
+    assert "ids.span_id" in names
+    assert all(r["best_ns"] > 0 for r in results)
+
+
+def test_micro_benchmarks_all_run():
+    results = micro.run(number=2, repeat=1)
+    names = {r["name"] for r in results}
+    assert {"instrument.async", "fanout.count", "target.print.json"} <= names
+    # running again must not collide with state left by the first run
+    assert len(micro.run("^target\\.", number=2, repeat=1)) > 0
+
+
+def test_compare():
+    baseline = [{"name": "a", "best_ns": 100.0}]
+    results = [{"name": "a", "best_ns": 150.0}, {"name": "b", "best_ns": 10.0}]
+    a, b = micro.compare(results, baseline)
+    assert a.split()[-1] == "+50.0%"
+    assert b.endswith("(new)")
+
+
+def test_main_json(tmp_path, capsys):
+    path = tmp_path / "results.json"
+    bench_main.main(
+        ["micro", "--filter", "^ids\\.", "--number", "10", "--repeat", "1", "--json", str(path)]
+    )
+    document = json.loads(path.read_text())
+    assert document["environment"]["python"]
+    assert [r["name"] for r in document["results"]] == ["ids.trace_id", "ids.span_id"]
+
+    bench_main.main(
+        ["micro", "--filter", "^ids\\.", "--number", "10", "--repeat", "1", "--compare", str(path)]
+    )
+    assert "ids.trace_id" in capsys.readouterr().out
+
+
+def test_load_run():
+    results = load.run(["zipkin", "influxdb2"], operations=20, workers=2)
+    zipkin, influx = results
+    assert zipkin["target"] == "zipkin"
+    assert zipkin["operations"] == 40
+    assert zipkin["requests"] > 0
+    assert zipkin["bytes"] > 0
+    assert zipkin["failures"] == 0
+    assert zipkin["latency_ns"]["p50"] <= zipkin["latency_ns"]["max"]
+    assert influx["requests"] > 0
+
+
+def test_load_asyncio():
+    [result] = load.run(["zipkin"], operations=10, workers=2, mix={"spans": 1}, use_asyncio=True)
+    assert result["mode"] == "asyncio"
+    assert result["requests"] == 20
+
+
+def test_stub_collector_counts():
+    collector = load.StubCollector().start()
+    try:
+        target = load.create_target("influxdb3", collector.url)
+        target.count("requests", 1, {})
+        requests, size = collector.totals(["/api/v3/write_lp"])
+        assert requests == 1
+        assert size > 0
+    finally:
+        collector.stop()
+
+
+def test_parse_mix():
+    assert load.parse_mix("spans=2,logs") == {"spans": 2, "logs": 1}
+    with pytest.raises(ValueError):
+        load.parse_mix("traces=1")
+
+
+def test_memory_run():
+    results = memory.run(["Target", "PrometheusTarget"], items=20, open_spans=100, series=100)
+    by_name = {r["name"]: r for r in results}
+    assert set(by_name) == {
+        "span.Target",
+        "log.Target",
+        "metric.Target",
+        "span.PrometheusTarget",
+        "log.PrometheusTarget",
+        "metric.PrometheusTarget",
+        "open_spans",
+        "counter_series",
+    }
+    assert by_name["span.Target"]["bytes"] > 0
+    assert by_name["open_spans"]["count"] == 100
+    assert by_name["open_spans"]["bytes_per_item"] > 0
+    assert by_name["counter_series"]["retained_bytes"] > 0
+
+
+def test_check_budgets():
+    results = [{"name": "span.Target", "bytes": 900.0}, {"name": "log.Target", "bytes": 100.0}]
+    budgets = {"span.Target": 800, "log.Target": 200, "metric.Target": 10}
+    assert memory.check_budgets(results, budgets) == ["span.Target: 900 bytes > budget 800"]
+
+
+def test_memory_within_default_budgets():
+    budgets = memory.load_budgets()
+    results = memory.run(list(memory.TARGETS), items=200, open_spans=1000, series=1000)
+    assert {r["name"] for r in results} <= set(budgets)
+    assert memory.check_budgets(results, budgets) == []
+
+
+def test_main_memory_budget(tmp_path):
+    budget = tmp_path / "budget.json"
+    budget.write_text(json.dumps({"metric.Target": 1}))
+    args = ["memory", "--targets", "Target", "--items", "10", "--open-spans", "10"]
+    with pytest.raises(SystemExit) as info:
+        bench_main.main([*args, "--budget", str(budget)])
+    assert info.value.code == 1
+
+    path = tmp_path / "memory.json"
+    bench_main.main([*args, "--json", str(path)])
+    assert json.loads(path.read_text())["results"]
+
+
+def test_parse_importtime():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   jot.log\n"
+        "import time:       300 |        420 | jot\n"
+    )
+    assert imports.parse_importtime(output) == [("jot.log", 120, 120, 1), ("jot", 300, 420, 0)]
+
+
+def test_imports_run():
+    results = imports.run(["jot"], runs=1, env={"JOT_AUTOINIT": "false"}, top=3)
+    result = results["jot"]
+    assert result["total_us"] > 0
+    assert len(result["top"]) == 3
+    assert "site" not in {m["module"] for m in result["top"]}
+
+
+def test_parse_env():
+    assert imports.parse_env(["A=1", "B=x=y"]) == {"A": "1", "B": "x=y"}
+    with pytest.raises(ValueError):
+        imports.parse_env(["A"])
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from jot import calltree, log
+from jot.base import Meter, Span, Target
+
+
+@pytest.fixture(autouse=True)
+def cleanup():
+    yield
+    calltree.disable()
+
+
+@pytest.fixture
+def tree():
+    return calltree.CallTree(export_interval=None)
+
+
+def run(tree, name, duration, parent=None, children=()):
+    span = Span(name=name, parent_id=parent.id if parent else None)
+    span.start()
+    tree.span_started(span)
+    for child_name, child_duration in children:
+        run(tree, child_name, child_duration, span)
+    span.duration = duration
+    tree.span_finished(span, {})
+    return span
+
+
+def test_self_time(tree):
+    run(tree, "request", 10_000_000, children=[("db", 3_000_000), ("render", 2_000_000)])
+    nodes = tree._snapshot()
+    request = nodes[("request",)]
+    assert request.count == 1
+    assert request.total == 10_000_000
+    assert request.self_time == 5_000_000
+    assert nodes[("request", "db")].self_time == 3_000_000
+
+
+def test_concurrent_children_clamped(tree):
+    run(tree, "request", 1_000_000, children=[("a", 800_000), ("b", 800_000)])
+    assert tree._snapshot()[("request",)].self_time == 0
+
+
+def test_edges(tree):
+    run(tree, "request", 10_000_000, children=[("db", 3_000_000), ("db", 1_000_000)])
+    run(tree, "job", 5_000_000, children=[("db", 2_000_000)])
+    edges = tree.edges()
+    assert edges[("request", "db")] == (2, 4_000_000, 4_000_000)
+    assert edges[("job", "db")] == (1, 2_000_000, 2_000_000)
+    assert edges[(None, "request")] == (1, 10_000_000, 6_000_000)
+
+
+def test_folded(tree):
+    run(tree, "request", 10_000_000, children=[("db", 3_000_000)])
+    assert tree.folded() == "request 7000\nrequest;db 3000"
+
+
+def test_json(tree):
+    run(tree, "request", 10_000_000, children=[("db", 3_000_000)])
+    [root] = tree.tree()
+    assert root["name"] == "request"
+    assert root["self_ns"] == 7_000_000
+    assert [c["name"] for c in root["children"]] == ["db"]
+
+
+def test_unknown_parent(tree):
+    span = Span(name="remote-child", parent_id=b"12345678")
+    span.start()
+    tree.span_started(span)
+    tree.span_finished(span, {})
+    assert ("remote-child",) in tree._snapshot()
+
+
+def test_export_to_file(tmp_path):
+    path = tmp_path / "calltree.folded"
+    calltree.enable(export_interval=None, path=str(path))
+    meter = Meter(Target())
+    with meter.span("outer") as outer:
+        with outer.span("inner"):
+            pass
+    calltree.disable()
+    stacks = [line.rsplit(" ", 1)[0] for line in path.read_text().splitlines()]
+    assert set(stacks) <= {"outer", "outer;inner"}
+
+
+def test_export_json_to_file(tmp_path):
+    path = tmp_path / "calltree.json"
+    tree = calltree.CallTree(export_interval=None, path=str(path), format="json")
+    run(tree, "request", 10_000_000, children=[("db", 3_000_000)])
+    tree.export()
+    [root] = json.loads(path.read_text())
+    assert root["children"][0]["name"] == "db"
+
+
+def test_export_logs(tree, mocker):
+    target = Target(log.ALL)
+    mocker.patch("jot.facade.active_meter", Meter(target))
+    log_spy = mocker.spy(target, "log")
+    run(tree, "request", 10_000_000)
+    tree.export()
+    level, message, tags, _ = log_spy.call_args.args
+    assert message == "Call tree"
+    assert tags["calltree.spans"] == 1
+    assert tags["calltree.tree"] == "request 10000"
+
+    log_spy.reset_mock()
+    tree.export()
+    log_spy.assert_not_called()
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        calltree.CallTree(format="xml")
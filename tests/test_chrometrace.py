@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+from jot import flush, log
+from jot.base import Meter
+from jot.chrometrace import ChromeTraceTarget
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "trace.json")
+
+
+@pytest.fixture
+def target(path):
+    target = ChromeTraceTarget(path, level=log.ALL)
+    yield target
+    target.close()
+
+
+def load(path):
+    # the array is left open, as chrome://tracing allows
+    with open(path) as f:
+        text = f.read()
+    assert text.startswith("[\n")
+    assert text.endswith(",\n")
+    return json.loads(text.rstrip(",\n") + "]")
+
+
+def by_phase(events, phase):
+    return [e for e in events if e["ph"] == phase]
+
+
+def test_metadata(target, path):
+    target.flush()
+    [metadata] = load(path)
+    assert metadata["ph"] == "M"
+    assert metadata["name"] == "process_name"
+
+
+def test_span(target, path):
+    meter = Meter(target, None, service="test")
+    with meter.span("outer", color="red") as outer:
+        with outer.span("inner"):
+            pass
+    target.flush()
+
+    inner, outer = by_phase(load(path), "X")
+    assert inner["name"] == "inner"
+    assert outer["name"] == "outer"
+    assert outer["args"]["color"] == "red"
+    assert outer["args"]["service"] == "test"
+    assert inner["args"]["parent_id"] == outer["args"]["span_id"]
+    assert "parent_id" not in outer["args"]
+    assert outer["ts"] <= inner["ts"]
+    assert outer["dur"] >= inner["dur"]
+    assert inner["pid"] == outer["pid"]
+
+
+def test_span_events(target, path):
+    meter = Meter(target)
+    with meter.span("work") as span:
+        span.event("checkpoint", step=1)
+    target.flush()
+
+    [instant] = by_phase(load(path), "i")
+    assert instant["name"] == "checkpoint"
+    assert instant["args"] == {"step": 1}
+
+
+def test_event_without_span(target, path):
+    Meter(target).event("boot")
+    target.flush()
+    [instant] = by_phase(load(path), "i")
+    assert instant["name"] == "boot"
+
+
+def test_log_and_error(target, path):
+    meter = Meter(target)
+    meter.info("hello")
+    try:
+        raise ValueError("oops")
+    except ValueError as e:
+        meter.error("failed", e)
+    target.flush()
+
+    hello, failed = by_phase(load(path), "i")
+    assert hello["cat"] == "log"
+    assert hello["args"]["level"] == "info"
+    assert failed["cat"] == "error"
+    assert failed["args"]["exception.type"] == "ValueError"
+
+
+def test_counters(target, path):
+    meter = Meter(target)
+    meter.magnitude("queue.depth", 5)
+    meter.count("requests", 2)
+    meter.count("requests", 3)
+    target.flush()
+
+    counters = [(e["name"], e["args"]["value"]) for e in by_phase(load(path), "C")]
+    assert counters == [("queue.depth", 5), ("requests", 2), ("requests", 5)]
+
+
+def test_rotation(path, tmp_path):
+    target = ChromeTraceTarget(path, max_bytes=400)
+    meter = Meter(target)
+    for i in range(5):
+        with meter.span(f"span-{i}"):
+            pass
+        target.flush()
+    target.close()
+
+    files = sorted(tmp_path.iterdir())
+    assert len(files) > 1
+    names = []
+    for file in files:
+        names.extend(e["name"] for e in by_phase(load(str(file)), "X"))
+    assert sorted(names) == [f"span-{i}" for i in range(5)]
+
+
+def test_flush_handler(target):
+    assert target.flush in flush._flush_handlers
+
+
+def test_from_environment(monkeypatch, path):
+    monkeypatch.setenv("JOT_CHROME_TRACE_PATH", path)
+    monkeypatch.setenv("JOT_CHROME_TRACE_MAX_BYTES", "1000")
+    target = ChromeTraceTarget.from_environment()
+    assert target.file.name == path
+    assert target.file.max_bytes == 1000
+    target.close()
+
+
+def test_from_environment_unset(monkeypatch):
+    monkeypatch.delenv("JOT_CHROME_TRACE_PATH", raising=False)
+    assert ChromeTraceTarget.from_environment() is None
@@ -0,0 +1,169 @@
+import json
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from jot import log, stats
+from jot.base import Meter, Span, Target
+from jot.debugserver import DebugServerTarget
+
+
+@pytest.fixture
+def inner():
+    return Target(log.ALL)
+
+
+@pytest.fixture
+def target(inner):
+    target = DebugServerTarget(inner, port=0)
+    yield target
+    target.close()
+
+
+def get(target, path):
+    with urlopen(f"http://127.0.0.1:{target.port}{path}", timeout=5) as response:
+        assert response.headers["Content-Type"] == "application/json"
+        return json.load(response)
+
+
+def finish_trace(target, name, duration, children=()):
+    root = Span(name=name)
+    root.start()
+    for child_name in children:
+        child = Span(trace_id=root.trace_id, parent_id=root.id, name=child_name)
+        child.start()
+        child.duration = duration // 2
+        target.finish({}, child)
+    root.duration = duration
+    target.finish({}, root)
+    return root
+
+
+def test_slowest_traces(target):
+    for i in range(1, 6):
+        finish_trace(target, f"trace-{i}", i * 1_000_000, children=["child"])
+    traces = get(target, "/traces?n=2")
+    assert [t["name"] for t in traces] == ["trace-5", "trace-4"]
+    assert [s["name"] for s in traces[0]["spans"]] == ["child", "trace-5"]
+
+
+def test_remote_parent_trace(target):
+    root = Meter(target).start("request", trace_id=b"1" * 16, parent_id=b"2" * 8)
+    root.start("child").finish()
+    root.finish()
+    [trace] = get(target, "/traces")
+    assert trace["name"] == "request"
+    assert [s["name"] for s in trace["spans"]] == ["child", "request"]
+    assert len(target._open_traces) == 0
+
+
+def test_max_traces(inner):
+    target = DebugServerTarget(inner, port=0, max_traces=2)
+    for i in range(1, 4):
+        finish_trace(target, f"trace-{i}", (4 - i) * 1_000_000)
+    assert [t["name"] for t in target.slowest_traces()] == ["trace-2", "trace-3"]
+    target.close()
+
+
+def test_max_spans_per_trace(inner):
+    target = DebugServerTarget(inner, port=0, max_spans_per_trace=2)
+    finish_trace(target, "root", 1_000_000, children=["a", "b", "c"])
+    [trace] = target.slowest_traces()
+    assert len(trace["spans"]) == 2
+    target.close()
+
+
+def test_latency(target):
+    for i in range(1, 11):
+        finish_trace(target, "request", i * 1_000_000)
+    assert get(target, "/latency")["request"] == {
+        "count": 10,
+        "p50": 5_000_000,
+        "p90": 9_000_000,
+        "p99": 10_000_000,
+        "max": 10_000_000,
+    }
+
+
+def test_latency_window(inner):
+    target = DebugServerTarget(inner, port=0, latency_window=2)
+    for i in range(1, 4):
+        finish_trace(target, "request", i)
+    assert target.latency()["request"]["count"] == 2
+    target.close()
+
+
+def test_errors(target, inner, mocker):
+    error = mocker.spy(inner, "error")
+    meter = Meter(target)
+    with pytest.raises(ValueError):
+        with meter.span("work"):
+            raise ValueError("oops")
+    errors = get(target, "/errors")
+    assert errors["counts"] == {"ValueError": 1}
+    [recent] = errors["recent"]
+    assert recent["exception.message"] == "oops"
+    assert recent["span_id"] is not None
+    error.assert_called_once()
+
+
+def test_queues(target):
+    class Owner:
+        def __init__(self):
+            import queue
+
+            self.queue = queue.Queue(5)
+
+    owner = Owner()
+    stats.register_queue("test", owner)
+    assert get(target, "/queues")["test"] == {"depth": 0, "capacity": 5, "dropped": 0}
+    stats.unregister_queue("test", owner)
+
+
+def test_summary(target):
+    finish_trace(target, "request", 1_000_000)
+    summary = get(target, "/")
+    assert set(summary) == {"traces", "latency", "errors", "queues"}
+
+
+def test_not_found(target):
+    with pytest.raises(HTTPError) as info:
+        get(target, "/nope")
+    assert info.value.code == 404
+
+
+def test_bad_n(target):
+    with pytest.raises(HTTPError) as info:
+        get(target, "/traces?n=many")
+    assert info.value.code == 400
+
+
+def test_forwards(target, inner, mocker):
+    finish = mocker.spy(inner, "finish")
+    finish_trace(target, "request", 1_000_000)
+    finish.assert_called_once()
+
+
+def test_from_environment(monkeypatch):
+    monkeypatch.setenv("JOT_DEBUG_PORT", "0")
+    target = DebugServerTarget.from_environment()
+    assert target.port > 0
+    target.close()
+
+
+def test_from_environment_invalid(monkeypatch):
+    monkeypatch.setenv("JOT_DEBUG_PORT", "70000")
+    with pytest.raises(ValueError):
+        DebugServerTarget.from_environment()
+
+
+def test_from_environment_unset(monkeypatch):
+    monkeypatch.delenv("JOT_DEBUG_PORT", raising=False)
+    assert DebugServerTarget.from_environment() is None
+
+
+def test_from_environment_ignores_unprefixed(monkeypatch):
+    monkeypatch.delenv("JOT_DEBUG_PORT", raising=False)
+    monkeypatch.setenv("DEBUG_PORT", "0")
+    assert DebugServerTarget.from_environment() is None
@@ -0,0 +1,98 @@
+import pytest
+
+from jot import errors, log
+from jot.base import Span, Target
+from jot.dedupe import ErrorDedupeTarget
+
+
+@pytest.fixture
+def inner():
+    return Target(log.ALL)
+
+
+@pytest.fixture
+def target(inner, clock):
+    target = ErrorDedupeTarget(inner, limit=2, window=10.0, interval=None, clock=clock)
+    yield target
+    target.close()
+
+
+def boom():
+    try:
+        1 / 0
+    except ZeroDivisionError as e:
+        return e
+
+
+def test_forwards_first_errors(target, inner, mocker):
+    spy = mocker.spy(inner, "error")
+    span = Span()
+    exception = boom()
+    target.error("message", exception, {"plonk": 1}, span)
+    spy.assert_called_once()
+    assert spy.call_args.args[1] is exception
+    assert spy.call_args.args[2]["error.fingerprint"] == errors.fingerprint(exception)
+    assert spy.call_args.args[3] is span
+
+
+def test_suppresses_storm(target, inner, mocker):
+    spy = mocker.spy(inner, "error")
+    for _ in range(5):
+        target.error("message", boom(), {})
+    assert spy.call_count == 2
+
+
+def test_different_fingerprints(target, inner, mocker):
+    spy = mocker.spy(inner, "error")
+    for _ in range(3):
+        target.error("message", boom(), {})
+        target.error("message", ValueError("other"), {})
+    assert spy.call_count == 4
+
+
+def test_summary_after_window(target, inner, mocker):
+    error = mocker.spy(inner, "error")
+    count = mocker.spy(inner, "count")
+    logspy = mocker.spy(inner, "log")
+    for _ in range(5):
+        target.error("message", boom(), {})
+    count.assert_not_called()
+
+    target._clock.now = 10.0
+    target.report_expired()
+    count.assert_called_once()
+    name, value, tags = count.call_args.args[:3]
+    assert name == "jot.errors.suppressed"
+    assert value == 3
+    assert tags["exception.type"] == "ZeroDivisionError"
+    logspy.assert_called_once()
+    assert logspy.call_args.args[0] == log.WARNING
+
+    # a new window forwards errors again
+    target.error("message", boom(), {})
+    assert error.call_count == 3
+
+
+def test_summary_on_next_error(target, inner, mocker):
+    count = mocker.spy(inner, "count")
+    for _ in range(3):
+        target.error("message", boom(), {})
+    target._clock.now = 11.0
+    target.error("message", boom(), {})
+    count.assert_called_once()
+    assert count.call_args.args[1] == 1
+
+
+def test_report_on_flush(target, inner, mocker):
+    count = mocker.spy(inner, "count")
+    for _ in range(4):
+        target.error("message", boom(), {})
+    target.report()
+    assert count.call_args.args[1] == 2
+
+
+def test_no_summary_without_suppression(target, inner, mocker):
+    count = mocker.spy(inner, "count")
+    target.error("message", boom(), {})
+    target.report()
+    count.assert_not_called()
@@ -0,0 +1,145 @@
+import pytest
+
+from jot.errors import describe, fingerprint
+
+
+def raise_value_error(message):
+    raise ValueError(message)
+
+
+def raise_key_error(message):
+    raise KeyError(message)
+
+
+def catch(fn, message):
+    try:
+        fn(message)
+    except Exception as e:
+        return e
+
+
+def test_same_site_same_fingerprint():
+    one = catch(raise_value_error, "one")
+    two = catch(raise_value_error, "two")
+    assert fingerprint(one) == fingerprint(two)
+
+
+def test_different_type_different_fingerprint():
+    one = catch(raise_value_error, "one")
+    two = catch(raise_key_error, "one")
+    assert fingerprint(one) != fingerprint(two)
+
+
+def test_different_site_different_fingerprint():
+    one = catch(raise_value_error, "one")
+    try:
+        raise ValueError("one")
+    except ValueError as e:
+        two = e
+    assert fingerprint(one) != fingerprint(two)
+
+
+def test_unraised_exception():
+    assert fingerprint(ValueError("one")) == fingerprint(ValueError("two"))
+    assert len(fingerprint(ValueError("one"))) == 16
+
+
+def test_describe():
+    exception = catch(raise_value_error, "oops")
+    record = describe(exception)
+    assert record.type == "ValueError"
+    assert record.message == "oops"
+    assert record.stacktrace.startswith("Traceback (most recent call last):")
+    assert "raise_value_error" in record.stacktrace
+    assert record.fingerprint == fingerprint(exception)
+
+
+def test_describe_is_cached():
+    exception = catch(raise_value_error, "oops")
+    assert describe(exception) is describe(exception)
+
+
+def test_stacktrace_formatted_once(mocker):
+    exception = catch(raise_value_error, "oops")
+    spy = mocker.patch("jot.errors.format_exception", return_value=["formatted"])
+    record = describe(exception)
+    assert record.stacktrace == "formatted"
+    assert describe(exception).stacktrace == "formatted"
+    spy.assert_called_once()
+
+
+def test_describe_after_reraise():
+    records = []
+
+    def reraise():
+        try:
+            raise_value_error("oops")
+        except ValueError as e:
+            records.append(describe(e))
+            raise
+
+    try:
+        reraise()
+    except ValueError as e:
+        records.append(describe(e))
+
+    assert records[0] is not records[1]
+    assert "test_describe_after_reraise" not in records[0].stacktrace
+    assert "test_describe_after_reraise" in records[1].stacktrace
+
+
+def test_shared_across_fanout(mocker):
+    from jot import log
+    from jot.base import Meter
+    from jot.fanout import FanOutTarget
+    from jot.print import PrintTarget
+
+    spy = mocker.patch("jot.errors.format_exception", return_value=["formatted"])
+    one = PrintTarget(log.ALL, mocker.MagicMock())
+    two = PrintTarget(log.ALL, mocker.MagicMock())
+    meter = Meter(FanOutTarget(one, two))
+    meter.error("failed", catch(raise_value_error, "oops"))
+    spy.assert_called_once()
+
+
+@pytest.mark.parametrize("value", [None, "boom"])
+def test_describe_non_exception(value):
+    from jot.base import Meter, Target
+
+    record = describe(value)
+    assert record.traceback is None
+    assert record.type == type(value).__name__
+    assert record.stacktrace.startswith(type(value).__name__)
+    assert record.fingerprint == describe(value).fingerprint
+    Meter(Target()).error("failed", value)
+
+
+def test_reported_frames_freed():
+    import gc
+    import io
+    import weakref
+
+    from jot import log
+    from jot.base import Meter
+    from jot.print import PrintTarget
+
+    class Canary:
+        pass
+
+    freed = []
+
+    def fail():
+        canary = Canary()
+        weakref.finalize(canary, freed.append, True)
+        raise ValueError("boom")
+
+    meter = Meter(PrintTarget(log.ALL, io.StringIO()))
+    gc.disable()
+    try:
+        try:
+            fail()
+        except ValueError as e:
+            meter.error("failed", e)
+        assert freed == [True]
+    finally:
+        gc.enable()
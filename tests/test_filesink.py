@@ -0,0 +1,187 @@
+import gzip
+import os
+import threading
+
+import pytest
+
+from jot.filesink import RotatingFileWriter
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "test.log")
+
+
+def backups(path):
+    directory = os.path.dirname(path)
+    prefix = os.path.basename(path) + "."
+    return sorted(name for name in os.listdir(directory) if name.startswith(prefix))
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_write_and_close(path):
+    writer = RotatingFileWriter(path)
+    assert writer.name == path
+    writer.write("one\n")
+    writer.write("two\n")
+    writer.close()
+    assert writer.closed
+    assert read(path) == "one\ntwo\n"
+
+
+def test_appends(path):
+    with open(path, "w") as f:
+        f.write("zero\n")
+    writer = RotatingFileWriter(path)
+    writer.write("one\n")
+    writer.close()
+    assert read(path) == "zero\none\n"
+
+
+def test_flush(path):
+    writer = RotatingFileWriter(path)
+    writer.write("one\n")
+    writer.flush()
+    assert read(path) == "one\n"
+    writer.close()
+
+
+def test_writes_on_background_thread(path, mocker):
+    writer = RotatingFileWriter(path)
+    threads = []
+    original = writer._write
+    mocker.patch.object(
+        writer, "_write", side_effect=lambda t: (threads.append(threading.get_ident()), original(t))
+    )
+    writer.write("one\n")
+    writer.close()
+    assert threads and threads[0] != threading.get_ident()
+
+
+def test_write_after_close(path):
+    writer = RotatingFileWriter(path)
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.write("late\n")
+
+
+def test_drops_when_full(path, mocker):
+    writer = RotatingFileWriter(path, queue_size=1)
+    gate = threading.Event()
+    mocker.patch.object(writer, "_write", side_effect=lambda t: gate.wait(1.0))
+    for _ in range(10):
+        writer.write("x\n")
+    gate.set()
+    writer.close()
+    assert writer.dropped > 0
+
+
+def test_rotate_by_size(path):
+    writer = RotatingFileWriter(path, max_bytes=10)
+    for i in range(3):
+        writer.write(f"line-{i:04d}\n")
+        writer.flush()
+    writer.close()
+    rotated = backups(path)
+    assert len(rotated) == 3
+    assert read(path) == ""
+    assert sorted(read(os.path.join(os.path.dirname(path), r)) for r in rotated) == [
+        "line-0000\n",
+        "line-0001\n",
+        "line-0002\n",
+    ]
+
+
+def test_rotate_by_size_counts_bytes(path):
+    writer = RotatingFileWriter(path, max_bytes=12)
+    writer.write("\u00e9\u00e9\u00e9\u00e9\u00e9\u00e9\n")  # 7 characters, 13 bytes
+    writer.flush()
+    writer.close()
+    assert len(backups(path)) == 1
+    assert read(path) == ""
+
+
+def test_size_of_existing_file_in_bytes(path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\u00e9" * 5)
+    writer = RotatingFileWriter(path, max_bytes=12)
+    writer.write("ab")
+    writer.flush()
+    writer.close()
+    assert len(backups(path)) == 1
+
+
+def test_rotate_by_interval(path, mocker):
+    clock = mocker.patch("jot.filesink.time.monotonic", return_value=100.0)
+    writer = RotatingFileWriter(path, interval=60.0)
+    writer.write("one\n")
+    writer.flush()
+    assert backups(path) == []
+    clock.return_value = 161.0
+    writer.write("two\n")
+    writer.close()
+    assert len(backups(path)) == 1
+
+
+def test_header(path):
+    writer = RotatingFileWriter(path, max_bytes=10, header="[\n")
+    writer.write("line-0000\n")
+    writer.close()
+    [rotated] = backups(path)
+    assert read(os.path.join(os.path.dirname(path), rotated)) == "[\nline-0000\n"
+    assert read(path) == "[\n"
+
+
+def test_header_not_repeated_when_appending(path):
+    with open(path, "w") as f:
+        f.write("[\nzero\n")
+    writer = RotatingFileWriter(path, header="[\n")
+    writer.write("one\n")
+    writer.close()
+    assert read(path) == "[\nzero\none\n"
+
+
+def test_backup_count(path):
+    writer = RotatingFileWriter(path, max_bytes=1, backup_count=2)
+    for i in range(5):
+        writer.write(f"{i}\n")
+        writer.flush()
+    writer.close()
+    assert len(backups(path)) == 2
+
+
+def test_compress(path):
+    writer = RotatingFileWriter(path, max_bytes=1, compress=True)
+    writer.write("one\n")
+    writer.close()
+    (rotated,) = backups(path)
+    assert rotated.endswith(".gz")
+    with gzip.open(os.path.join(os.path.dirname(path), rotated), "rt") as f:
+        assert f.read() == "one\n"
+
+
+@pytest.mark.parametrize("policy", ["always", "interval"])
+def test_fsync(path, mocker, policy):
+    fsync = mocker.patch("jot.filesink.os.fsync")
+    writer = RotatingFileWriter(path, fsync=policy)
+    writer.write("one\n")
+    writer.flush()
+    writer.close()
+    assert fsync.called
+
+
+def test_fsync_never(path, mocker):
+    fsync = mocker.patch("jot.filesink.os.fsync")
+    writer = RotatingFileWriter(path)
+    writer.write("one\n")
+    writer.close()
+    fsync.assert_not_called()
+
+
+def test_bad_fsync_policy(path):
+    with pytest.raises(ValueError):
+        RotatingFileWriter(path, fsync="sometimes")
@@ -0,0 +1,171 @@
+import json
+import os
+from io import StringIO
+
+import pytest
+
+from jot import flightrecorder, log, util
+from jot.base import Meter, Span
+from jot.flightrecorder import FlightRecorderTarget
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "flight.rec")
+
+
+@pytest.fixture
+def target(path):
+    target = FlightRecorderTarget(path, size=4096)
+    yield target
+    target.close()
+
+
+@pytest.fixture
+def span():
+    span = Span(name="test-span")
+    span.start()
+    return span
+
+
+def test_file_size(target, path):
+    assert os.path.getsize(path) == flightrecorder.DATA_OFFSET + 4096
+
+
+def test_accepts_everything(target):
+    assert target.accepts_log_level(log.DEBUG)
+
+
+def test_round_trip(target, path, span):
+    target.log(log.DEBUG, "debug message", {"plonk": 42, "id": b"\x01\x02"}, span)
+    target.magnitude("temperature", 21.5, {})
+    target.count("requests", 3, {"route": "/"}, span)
+    target.event("happened", {}, span)
+    span.duration = 1234
+    target.finish({"status": "ok"}, span)
+
+    records = flightrecorder.read(path)
+    assert [r["kind"] for r in records] == ["log", "magnitude", "count", "event", "finish"]
+
+    debug = records[0]
+    assert debug["level"] == "debug"
+    assert debug["fields"] == ["debug message"]
+    assert debug["tags"] == {"plonk": "42", "id": "0102"}
+    assert debug["trace_id"] == util.format_trace_id(span.trace_id)
+    assert debug["span_id"] == util.format_span_id(span.id)
+
+    assert records[1]["value"] == 21.5
+    assert records[1]["span_id"] is None
+    assert records[2]["value"] == 3
+    assert records[4]["value"] == 1234
+    assert records[4]["tags"] == {"status": "ok"}
+
+
+def test_error(target, path):
+    try:
+        1 / 0
+    except ZeroDivisionError as e:
+        target.error("failed", e, {})
+    (record,) = flightrecorder.read(path)
+    assert record["kind"] == "error"
+    assert record["fields"][:3] == ["failed", "ZeroDivisionError", "division by zero"]
+    assert "1 / 0" in record["fields"][3]
+
+
+def test_wraps_around(target, path):
+    for i in range(200):
+        target.log(log.INFO, f"message {i}", {})
+    records = flightrecorder.read(path)
+    messages = [r["fields"][0] for r in records]
+    assert messages[-1] == "message 199"
+    assert "message 0" not in messages
+    seqs = [r["seq"] for r in records]
+    assert seqs == list(range(seqs[0], 200))
+
+
+def test_record_too_large(target, path):
+    target.log(log.INFO, "x" * 5000, {})
+    assert target.dropped == 1
+    assert flightrecorder.read(path) == []
+
+
+def test_survives_without_close(path):
+    target = FlightRecorderTarget(path, size=4096)
+    target.log(log.INFO, "last words", {})
+    # read the file while the target still has it mapped, as after a crash
+    (record,) = flightrecorder.read(path)
+    assert record["fields"] == ["last words"]
+    target.close()
+
+
+def test_keeps_previous_recording(path):
+    first = FlightRecorderTarget(path, size=4096)
+    first.log(log.INFO, "first run", {})
+    first.close()
+    second = FlightRecorderTarget(path, size=4096)
+    second.close()
+    (record,) = flightrecorder.read(f"{path}.prev")
+    assert record["fields"] == ["first run"]
+
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / "other"
+    path.write_bytes(b"\x00" * 128)
+    with pytest.raises(ValueError):
+        flightrecorder.read(str(path))
+
+
+def test_with_meter(target, path):
+    meter = Meter(target)
+    with meter.span("work") as child:
+        child.debug("inside")
+    kinds = [r["kind"] for r in flightrecorder.read(path)]
+    assert kinds == ["log", "finish"]
+
+
+def test_non_string_fields(target, path):
+    meter = Meter(target)
+    meter.info(123)
+    with meter.span(None):
+        pass
+    records = flightrecorder.read(path)
+    assert records[0]["fields"] == ["123"]
+    assert records[1]["fields"] == ["None"]
+
+
+def test_dump(target, path):
+    target.log(log.WARNING, "warning message", {"plonk": 42})
+    target.count("requests", 3, {})
+    out = StringIO()
+    flightrecorder.dump(path, file=out)
+    lines = out.getvalue().splitlines()
+    assert lines[0].endswith("LOG WARNING warning message plonk=42")
+    assert lines[1].endswith("COUNT requests = 3")
+
+
+def test_dump_json(target, path):
+    target.log(log.WARNING, "warning message", {"plonk": 42})
+    out = StringIO()
+    flightrecorder.dump(path, as_json=True, file=out)
+    record = json.loads(out.getvalue())
+    assert record["fields"] == ["warning message"]
+
+
+def test_main(target, path, capsys):
+    target.log(log.WARNING, "warning message", {})
+    flightrecorder.main(["dump", path])
+    assert "warning message" in capsys.readouterr().out
+
+
+def test_from_environment(monkeypatch, path):
+    monkeypatch.setenv("JOT_FLIGHT_RECORDER_PATH", path)
+    monkeypatch.setenv("JOT_FLIGHT_RECORDER_SIZE", "8192")
+    target = FlightRecorderTarget.from_environment()
+    assert target.size == 8192
+    target.close()
+
+
+def test_from_environment_unset(monkeypatch):
+    monkeypatch.delenv("JOT_FLIGHT_RECORDER_PATH", raising=False)
+    monkeypatch.delenv("FLIGHT_RECORDER_PATH", raising=False)
+    assert FlightRecorderTarget.from_environment() is None
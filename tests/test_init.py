@@ -13,6 +13,7 @@ This module includes tests for:
 import atexit
 import os
 import platform
+import subprocess
 import sys
 import time
 from unittest import mock
@@ -20,7 +21,7 @@ from unittest import mock
 import pytest
 
 import jot
-from jot import base, facade, log
+from jot import base, facade, initialize, log
 from jot.fanout import FanOutTarget
 
 
@@ -323,6 +324,82 @@ def test_init_from_environment_no_modules(reset_env, reset_active_meter, monkeyp
     mock_import.assert_not_called()
 
 
+def _clear_target_variables(monkeypatch):
+    for variables in initialize.TARGET_MODULES.values():
+        for variable in variables:
+            monkeypatch.delenv(variable, raising=False)
+
+
+def test_target_modules_imported_when_configured(reset_env, monkeypatch):
+    """Test that a target module is only imported when one of its JOT_ variables is set"""
+    mock_import = mock.MagicMock()
+    monkeypatch.setattr("importlib.import_module", mock_import)
+    monkeypatch.delitem(sys.modules, "jot.sqlite", raising=False)
+    _clear_target_variables(monkeypatch)
+
+    initialize._import_target_modules_from_environment()
+    mock_import.assert_not_called()
+
+    # variables that may belong to the application don't import anything by themselves
+    monkeypatch.setenv("SENTRY_DSN", "https://key@sentry.example.com/1")
+    monkeypatch.setenv("DEBUG_PORT", "8081")
+    monkeypatch.setenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT", "http://localhost:4318/v1/traces")
+    initialize._import_target_modules_from_environment()
+    mock_import.assert_not_called()
+
+    monkeypatch.setenv("JOT_SQLITE_PATH", "/tmp/jot.db")
+    initialize._import_target_modules_from_environment()
+    mock_import.assert_called_once_with("jot.sqlite")
+
+
+def test_target_module_import_error_ignored(reset_env, monkeypatch):
+    """Test that a target module with missing dependencies doesn't break initialization"""
+    monkeypatch.setattr("importlib.import_module", mock.MagicMock(side_effect=ImportError))
+    monkeypatch.delitem(sys.modules, "jot.sentry", raising=False)
+    monkeypatch.setenv("JOT_SENTRY_DSN", "https://key@sentry.example.com/1")
+
+    initialize._import_target_modules_from_environment()
+
+
+def test_jot_modules_target_needs_variables(reset_env, monkeypatch):
+    """Test that target modules listed in JOT_MODULES are only imported when configured"""
+    mock_import = mock.MagicMock()
+    monkeypatch.setattr("importlib.import_module", mock_import)
+    _clear_target_variables(monkeypatch)
+    monkeypatch.setenv("JOT_MODULES", "jot.otlp,module1")
+
+    initialize._import_modules_from_environment()
+    mock_import.assert_called_once_with("module1")
+
+    mock_import.reset_mock()
+    monkeypatch.setenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT", "http://localhost:4318/v1/traces")
+    initialize._import_modules_from_environment()
+    assert mock_import.call_args_list == [mock.call("jot.otlp"), mock.call("module1")]
+
+
+def test_lazy_submodule_attributes():
+    """Test that submodules not imported by `import jot` can be reached as attributes"""
+    import jot.chrometrace
+
+    assert jot.chrometrace is sys.modules["jot.chrometrace"]
+    assert jot.__getattr__("sqlite") is sys.modules["jot.sqlite"]
+    with pytest.raises(AttributeError):
+        jot.not_a_module  # noqa: B018
+
+
+def test_import_does_not_load_targets():
+    """Test that `import jot` doesn't import targets or asyncio until they are needed"""
+    modules = ("asyncio", "jot.print", "jot.debugserver", "jot.otlp", "opentelemetry.sdk")
+    code = f"import sys, jot; print(sorted(m for m in {modules!r} if m in sys.modules))"
+    configured = {v for vs in initialize.TARGET_MODULES.values() for v in vs}
+    env = {k: v for k, v in os.environ.items() if k not in configured}
+    env.update(JOT_MODULES="jot.otlp", DEBUG_PORT="1", SENTRY_DSN="https://key@example.com/1")
+    proc = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    assert proc.stdout.strip() == "[]"
+
+
 def test_tag_key_transformation(reset_env, reset_active_meter, mock_test_subclasses):
     """Test that JOT_TAG_ keys are properly transformed"""
     os.environ["DUMMY_TARGET_ENABLED"] = "1"
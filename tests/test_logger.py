@@ -126,3 +126,77 @@ def test_log_via_jot(mocker, jot2py, span, level_name):
         "span_name": span.name,
     }
     spy.assert_called_once_with(py_level, message, extra=expected_tags)
+
+
+def test_ignored_level_skips_formatting(mocker, spy, info_level):
+    record = logging.LogRecord("py2jot", logging.DEBUG, __file__, 1, "message %s", ("arg",), None)
+    get_message = mocker.patch.object(record, "getMessage")
+    jot.logger.JotLoggingHandler().emit(record)
+    get_message.assert_not_called()
+    assert spy.call_count == 0
+
+
+def test_standard_attributes_not_tags(py2jot, spy):
+    py2jot.warning("test_message %s", "arg", extra={"plonk": 42}, stack_info=True)
+    tags = spy.call_args.args[2]
+    assert tags.keys() == {"file", "function", "line", "logger", "plonk", "log.template"}
+    assert tags["log.template"] == "test_message %s"
+    assert spy.call_args.args[1] == "test_message arg"
+
+
+def test_no_template_without_args(py2jot, spy):
+    py2jot.warning("test_message")
+    assert "log.template" not in spy.call_args.args[2]
+
+
+@pytest.fixture
+def async_logger():
+    jot.handle_logs("py2jot.async", async_=True)
+    logger = logging.getLogger("py2jot.async")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger
+    jot.ignore_logs("py2jot.async")
+
+
+def test_async_delivers_on_listener_thread(async_logger, mocker):
+    import threading
+
+    threads = []
+    target = facade.active_meter.target
+    mocker.patch.object(
+        target, "log", side_effect=lambda *args: threads.append(threading.get_ident())
+    )
+    async_logger.warning("test message", extra={"plonk": 42})
+    assert jot.logger.get_listener().flush()
+    assert len(threads) == 1
+    assert threads[0] != threading.get_ident()
+
+
+def test_async_preserves_span(async_logger, spy):
+    span = Span(name="captured")
+    meter = jot.base.Meter(facade.active_meter.target, span)
+    old = facade._swap_active(meter)
+    try:
+        async_logger.warning("inside span")
+    finally:
+        facade._swap_active(old)
+    assert jot.logger.get_listener().flush()
+    spy.assert_called_once()
+    assert spy.call_args.args[1] == "inside span"
+    assert spy.call_args.args[3] is span
+
+
+def test_async_drops_when_full(mocker):
+    listener = jot.logger.LogListener(queue_size=2)
+    handler = jot.logger.QueueingJotHandler(listener)
+    for i in range(5):
+        handler.emit(logging.LogRecord("x", logging.ERROR, __file__, 1, "m %d", (i,), None))
+    assert listener.queue.qsize() == 2
+    assert listener.dropped == 3
+
+
+def test_async_not_installed_twice(async_logger):
+    jot.handle_logs("py2jot.async", async_=True)
+    handlers = [h for h in async_logger.handlers if isinstance(h, jot.logger.JotLoggingHandler)]
+    assert len(handlers) == 1
@@ -270,3 +270,25 @@ def test_count_value_tag(jot, target, mocker):
     spy = mocker.spy(target, "count")
     jot.count("zishy", 105, value="worg")
     spy.assert_called_once_with("zishy", 105, tags(value="worg"), jot.active_span)
+
+
+@pytest.fixture
+def observer(mocker):
+    from jot import base
+
+    observer = mocker.Mock()
+    base.add_observer(observer)
+    yield observer
+    base.remove_observer(observer)
+
+
+def test_observer_start(jot, observer):
+    child = jot.start("child")
+    observer.span_started.assert_called_once_with(child.active_span)
+    observer.span_finished.assert_not_called()
+
+
+def test_observer_finish(jot, observer):
+    child = jot.start("child", nork=3)
+    child.finish(plonk=11)
+    observer.span_finished.assert_called_once_with(child.active_span, {"plonk": 11, "nork": 3})
@@ -0,0 +1,113 @@
+import gc
+
+import pytest
+
+import jot
+from jot import flush, log, orphans
+from jot.base import Meter, Target
+
+
+@pytest.fixture
+def reports():
+    return []
+
+
+@pytest.fixture
+def tracker(reports, clock):
+    tracker = orphans.enable(
+        threshold=10.0, interval=None, report=lambda *args: reports.append(args)
+    )
+    clock.now = 100.0
+    tracker._clock = clock
+    yield tracker
+    orphans.disable()
+
+
+@pytest.fixture
+def meter():
+    return Meter(Target(log.ALL))
+
+
+def test_finished_span_not_reported(tracker, meter, reports):
+    child = meter.start("finished")
+    assert tracker.open_count == 1
+    child.finish()
+    assert tracker.open_count == 0
+    tracker._clock.now += 60.0
+    tracker.check()
+    assert reports == []
+
+
+def test_finished_span_not_reported_when_freed(tracker, meter, reports):
+    child = meter.start("finished")
+    child.finish()
+    del child
+    gc.collect()
+    tracker.check()
+    assert reports == []
+
+
+def test_long_open_span(tracker, meter, reports):
+    child = meter.start("slow")
+    tracker._clock.now += 5.0
+    tracker.check()
+    assert reports == []
+
+    tracker._clock.now += 10.0
+    tracker.check()
+    assert len(reports) == 1
+    kind, _, tags = reports[0]
+    assert kind == "open"
+    assert tags["span.name"] == "slow"
+    assert tags["span.age"] == 15.0
+    assert tags["file"] == __file__
+    assert tags["function"] == "test_long_open_span"
+
+    # only reported once
+    tracker.check()
+    assert len(reports) == 1
+    child.finish()
+
+
+def test_collected_span(tracker, meter, reports):
+    meter.start("abandoned")
+    gc.collect()
+    tracker._clock.now += 1.0
+    tracker.check()
+    assert len(reports) == 1
+    kind, _, tags = reports[0]
+    assert kind == "collected"
+    assert tags["span.name"] == "abandoned"
+    assert tracker.open_count == 0
+
+
+def test_checked_on_flush(tracker, meter, reports):
+    meter.start("abandoned")
+    gc.collect()
+    flush.flush()
+    assert len(reports) == 1
+
+
+def test_default_report(mocker):
+    target = Target(log.ALL)
+    spy = mocker.spy(target, "log")
+    jot.init(target)
+    tracker = orphans.enable(interval=None)
+    try:
+        jot.start("abandoned")
+        gc.collect()
+        tracker.check()
+    finally:
+        orphans.disable()
+    spy.assert_called_once()
+    level, message, tags = spy.call_args.args[:3]
+    assert level == log.WARNING
+    assert "abandoned" in message
+    assert tags["span.name"] == "abandoned"
+
+
+def test_disable(meter):
+    tracker = orphans.enable(interval=None)
+    orphans.disable()
+    meter.start("untracked")
+    assert tracker.open_count == 0
@@ -410,3 +410,88 @@ def test_from_environment_with_otel_service_name(monkeypatch):
         assert target.metric_exporter is mock_metric_exporter.return_value
         assert target.span_exporter is None
         assert target.resource.attributes["service.name"] == "otel-named-service"
+
+
+def test_span_data_is_bounded(mocker):
+    target = OTLPTarget(span_exporter=mocker.MagicMock(), max_spans=2, level=log.ALL)
+    for _ in range(3):
+        span = Span(name="abandoned")
+        try:
+            1 / 0
+        except ZeroDivisionError as e:
+            target.error("abandoned error", e, {}, span)
+    assert len(target.span_data) == 2
+    assert target.span_data.evicted_overflow == 1
+
+
+def test_finish_releases_span_data(target, span):
+    try:
+        1 / 0
+    except ZeroDivisionError as e:
+        target.error("test error", e, {}, span)
+    assert len(target.span_data) == 1
+    target.finish({}, span)
+    assert len(target.span_data) == 0
+
+
+def test_finish_unsampled_releases_span_data(target, span):
+    try:
+        1 / 0
+    except ZeroDivisionError as e:
+        target.error("test error", e, {}, span)
+    assert len(target.span_data) == 1
+    target.finish_unsampled({}, span)
+    assert len(target.span_data) == 0
+    target.span_exporter.export.assert_not_called()
+
+
+def test_export_stats(target, span, tags):
+    from opentelemetry.sdk.trace.export import SpanExportResult
+
+    from jot import stats
+
+    stats.reset()
+    target.span_exporter.export.return_value = SpanExportResult.SUCCESS
+    target.finish(tags, span)
+    target.span_exporter.export.return_value = SpanExportResult.FAILURE
+    target.finish(tags, span)
+    snapshot = stats.snapshot()["targets"]["OTLPTarget"]
+    assert snapshot["sent"] == 1
+    assert snapshot["failures"] == 1
+    assert snapshot["bytes"] is None
+    assert snapshot["duration"]["count"] == 2
+    stats.reset()
+
+
+def test_export_stats_name(target, span, tags):
+    from jot import stats
+
+    stats.reset()
+    named = OTLPTarget(span_exporter=target.span_exporter, name="collector")
+    named.finish(tags, span)
+    assert list(stats.snapshot()["targets"]) == ["OTLPTarget:collector"]
+    stats.reset()
+
+
+def test_exporters_importable():
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+    from jot import otlp
+    from jot.otlp import OTLPLogExporter, OTLPMetricExporter  # noqa: F401
+
+    assert otlp.OTLPSpanExporter is OTLPSpanExporter
+    with pytest.raises(AttributeError):
+        otlp.NotAnExporter  # noqa: B018
+
+
+def test_fanout_failures_share_stats(target, span, tags):
+    from jot import stats
+    from jot.fanout import FanOutTarget
+
+    stats.reset()
+    target.span_exporter.export.side_effect = RuntimeError("broken")
+    FanOutTarget(target).finish(tags, span)
+    snapshot = stats.snapshot()["targets"]
+    assert list(snapshot) == ["OTLPTarget"]
+    assert snapshot["OTLPTarget"]["failures"] == 1
+    stats.reset()
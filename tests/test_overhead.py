@@ -0,0 +1,125 @@
+import pytest
+
+from jot import facade, flush, log, overhead
+from jot.base import Meter, Target
+from jot.fanout import FanOutTarget
+from jot.wrapper import WrapperTarget
+
+
+class SlowTarget(Target):
+    def finish(self, tags, span):
+        sum(range(1000))
+
+
+@pytest.fixture
+def targets(mocker):
+    slow = SlowTarget(log.ALL)
+    other = Target(log.ALL)
+    fanout = FanOutTarget(slow, other)
+    mocker.patch("jot.facade.active_meter", Meter(fanout))
+    yield slow, other, fanout
+    overhead.disable()
+
+
+def test_meter_and_targets_timed(targets):
+    slow, _, _ = targets
+    profiler = overhead.enable()
+    with facade.active_meter.span("request") as span:
+        span.info("hello")
+        span.count("requests", 1)
+    result = profiler.snapshot()
+    calls = result["calls"]
+    assert calls["Meter.finish"][0] == 1
+    assert calls["Meter.info"][0] == 1
+    assert calls["SlowTarget.finish"][0] == 1
+    assert calls["Target.finish"][0] == 1
+    assert calls["FanOutTarget.finish"][0] == 1
+    assert calls["SlowTarget.log"][0] == 1
+    assert result["span_ns"] > 0
+    assert result["overhead_ns"] > 0
+    assert 0 < result["fraction"]
+
+
+def test_nested_calls_counted_once(targets):
+    profiler = overhead.enable()
+    # Meter.start(name) calls Meter.span and the child's Meter.start
+    child = facade.active_meter.start("request")
+    child.finish()
+    result = profiler.snapshot()
+    assert result["calls"]["Meter.span"][0] == 1
+    assert result["calls"]["Meter.start"][0] == 2
+    inclusive = result["calls"]["Meter.start"][1] + result["calls"]["Meter.finish"][1]
+    assert result["overhead_ns"] < inclusive
+
+
+def test_child_spans_not_counted_as_duration(targets):
+    profiler = overhead.enable()
+    with facade.active_meter.span("request") as root:
+        with root.span("child"):
+            pass
+    result = profiler.snapshot()
+    assert result["span_ns"] == root.active_span.duration
+
+
+def test_remote_parent_counted_as_duration(targets):
+    profiler = overhead.enable()
+    with facade.active_meter.span("request", trace_id=b"1" * 16, parent_id=b"2" * 8) as root:
+        with root.span("child"):
+            pass
+    result = profiler.snapshot()
+    assert result["span_ns"] == root.active_span.duration
+    assert result["fraction"] > 0
+
+
+def test_snapshot_resets(targets):
+    profiler = overhead.enable()
+    facade.active_meter.count("requests", 1)
+    profiler.snapshot()
+    assert profiler.snapshot()["calls"] == {}
+
+
+def test_report_at_flush(targets, mocker):
+    slow, _, _ = targets
+    log_spy = mocker.spy(slow, "log")
+    profiler = overhead.enable()
+    assert profiler.report in flush._flush_handlers
+    with facade.active_meter.span("request"):
+        pass
+    profiler.report()
+    level, message, tags, _ = log_spy.call_args.args
+    assert message == "Instrumentation overhead"
+    assert "Meter.finish calls=1" in tags["overhead.calls"]
+    assert tags["overhead.fraction"] > 0
+
+
+def test_disable_restores(targets):
+    slow, other, fanout = targets
+    original = Meter.finish
+    overhead.enable()
+    assert Meter.finish is not original
+    overhead.disable()
+    assert Meter.finish is original
+    assert facade.active_meter.target is fanout
+    assert fanout.targets == (slow, other)
+
+
+def test_wraps_wrapper_targets(mocker):
+    inner = SlowTarget()
+    mocker.patch("jot.facade.active_meter", Meter(WrapperTarget(inner)))
+    profiler = overhead.enable()
+    with facade.active_meter.span("request"):
+        pass
+    calls = profiler.snapshot()["calls"]
+    assert "WrapperTarget.finish" in calls
+    assert "SlowTarget.finish" in calls
+    overhead.disable()
+
+
+def test_enabled_from_environment(monkeypatch, mocker):
+    from jot import initialize
+
+    monkeypatch.setenv("JOT_PROFILE_OVERHEAD", "true")
+    enable = mocker.patch("jot.overhead.enable")
+    mocker.patch("jot.facade.active_meter")
+    initialize.init_from_environment()
+    enable.assert_called_once()
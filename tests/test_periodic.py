@@ -0,0 +1,35 @@
+import threading
+
+from jot.periodic import Periodic
+
+
+def test_calls_function():
+    called = threading.Event()
+    periodic = Periodic(0.01, called.set)
+    periodic.start()
+    try:
+        assert called.wait(1.0)
+    finally:
+        periodic.stop()
+    assert not periodic.is_running
+
+
+def test_survives_errors():
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError("boom")
+
+    periodic = Periodic(0.01, fn)
+    periodic.start()
+    try:
+        while len(calls) < 2:
+            pass
+    finally:
+        periodic.stop()
+
+
+def test_stop_without_start():
+    Periodic(1.0, print).stop()
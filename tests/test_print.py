@@ -174,3 +174,159 @@ def test_int_span_id(target):
     target.log(log.WARNING, "test-log-message", {}, span)
     output = target._file.getvalue()
     assert output == f"[{span_id_str}/1] WARNING test-log-message\n"
+
+
+@pytest.fixture
+def json_target():
+    return PrintTarget(log.WARNING, StringIO(), format="json")
+
+
+def json_lines(target):
+    import json
+
+    return [json.loads(line) for line in target._file.getvalue().splitlines()]
+
+
+def test_json_log(json_target, span, tags):
+    json_target.log(log.WARNING, "test-log-message", tags, span)
+    (record,) = json_lines(json_target)
+    assert record["kind"] == "warning"
+    assert record["message"] == "test-log-message"
+    assert record["tags"] == tags
+    assert record["ts"].endswith("Z")
+    if span:
+        assert record["trace_id"] == util.format_trace_id(span.trace_id)
+        assert record["parent_id"] == util.format_span_id(span.parent_id)
+        assert record["span_id"] == util.format_span_id(span.id)
+    else:
+        assert "span_id" not in record
+
+
+def test_json_log_level(json_target):
+    json_target.log(log.INFO, "ignored", {})
+    assert json_target._file.getvalue() == ""
+
+
+def test_json_finish(json_target, span, tags):
+    if span is None:
+        return
+    span.start()
+    span.duration = 432
+    json_target.finish(tags, span)
+    (record,) = json_lines(json_target)
+    assert record["kind"] == "finish"
+    assert record["name"] == "test-span"
+    assert record["tags"] == {**tags, "duration": 432}
+
+
+def test_json_metrics(json_target, tags):
+    json_target.magnitude("test-magnitude", 3.5, tags)
+    json_target.count("test-count", 25, tags)
+    magnitude, count = json_lines(json_target)
+    assert magnitude["kind"] == "magnitude"
+    assert magnitude["name"] == "test-magnitude"
+    assert magnitude["value"] == 3.5
+    assert count["kind"] == "count"
+    assert count["value"] == 25
+
+
+def test_json_error(json_target, span, tags):
+    try:
+        1 / 0
+    except ZeroDivisionError as err:
+        json_target.error("got-error", err, tags, span)
+    (record,) = json_lines(json_target)
+    assert record["kind"] == "error"
+    assert record["message"] == "got-error"
+    assert record["exception.type"] == "ZeroDivisionError"
+    assert "1 / 0" in record["exception.stacktrace"]
+
+
+def test_json_tag_values(json_target):
+    id = util.generate_span_id()
+    tags = {"b": True, "n": None, "f": float("nan"), "i": id, "o": object, "s": 'q"\n'}
+    json_target.log(log.WARNING, "values", tags)
+    (record,) = json_lines(json_target)
+    assert record["tags"] == {
+        "b": True,
+        "n": None,
+        "f": None,
+        "i": util.format_span_id(id),
+        "o": str(object),
+        "s": 'q"\n',
+    }
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        PrintTarget(format="xml")
+
+
+def test_buffered_by_size():
+    target = PrintTarget(log.WARNING, StringIO(), buffer_size=60, flush_interval=None)
+    target.log(log.WARNING, "first", {})
+    assert target._file.getvalue() == ""
+    target.log(log.WARNING, "second-message-which-is-quite-long", {})
+    assert (
+        target._file.getvalue()
+        == "[/1] WARNING first\n[/2] WARNING second-message-which-is-quite-long\n"
+    )
+
+
+def test_buffered_flush():
+    from jot import flush
+
+    target = PrintTarget(log.WARNING, StringIO(), buffer_size=1000, flush_interval=None)
+    target.log(log.WARNING, "first", {})
+    assert target._file.getvalue() == ""
+    assert target.flush in flush._flush_handlers
+    flush.remove_handler(target.flush)
+    target.flush()
+    assert target._file.getvalue() == "[/1] WARNING first\n"
+
+
+def test_buffered_interval():
+    import time
+
+    target = PrintTarget(log.WARNING, StringIO(), buffer_size=1000, flush_interval=0.01)
+    try:
+        target.log(log.WARNING, "first", {})
+        deadline = time.monotonic() + 1.0
+        while target._file.getvalue() == "" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert target._file.getvalue() == "[/1] WARNING first\n"
+    finally:
+        target._periodic.stop()
+
+
+def test_from_environment_json(monkeypatch):
+    monkeypatch.setenv("JOT_LOG_PATH", "stdout")
+    monkeypatch.setenv("JOT_LOG_FORMAT", "JSON")
+    target = PrintTarget.from_environment()
+    assert target._format == "json"
+    assert target._buffer_size == 64 * 1024
+    target._periodic.stop()
+
+
+def test_from_environment_with_rotation(monkeypatch, tmp_path):
+    log_path = str(tmp_path / "test.log")
+    monkeypatch.setenv("JOT_LOG_PATH", log_path)
+    monkeypatch.setenv("JOT_LOG_MAX_BYTES", "1000")
+    monkeypatch.setenv("JOT_LOG_COMPRESS", "true")
+    monkeypatch.setenv("JOT_LOG_FSYNC", "interval")
+    target = PrintTarget.from_environment()
+    assert target._file.max_bytes == 1000
+    assert target._file.compress
+    assert target._file.fsync == "interval"
+    target.log(log.CRITICAL, "message", {})
+    target._file.close()
+    with open(log_path) as f:
+        assert f.read().endswith("CRITICAL message\n")
+
+
+def test_iso_timestamp_across_seconds():
+    from jot.print import _iso_timestamp
+
+    assert _iso_timestamp(1_000_000_000_123_456_789) == "2001-09-09T01:46:40.123456Z"
+    assert _iso_timestamp(1_000_000_001_000_000_000) == "2001-09-09T01:46:41.000000Z"
+    assert _iso_timestamp(1_000_000_000_999_999_999) == "2001-09-09T01:46:40.999999Z"
@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+import jot
+from jot import base, log, profiler
+from jot.base import Meter, Target
+
+
+@pytest.fixture
+def meter():
+    return Meter(Target(log.ALL))
+
+
+@pytest.fixture(autouse=True)
+def cleanup():
+    yield
+    profiler.disable()
+
+
+def busy_work(prof, samples=5):
+    target = prof.sample_count + samples
+    while prof.sample_count < target:
+        sum(i * i for i in range(1000))
+
+
+def test_samples_to_file(meter, tmp_path):
+    path = tmp_path / "profile.folded"
+    prof = profiler.enable(interval=0.001, export_interval=None, path=str(path))
+    with meter.span("busy"):
+        busy_work(prof)
+    profiler.disable()
+
+    lines = path.read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("busy;")
+        assert int(count) > 0
+    assert any("busy_work (test_profiler.py:" in line for line in lines)
+
+
+def test_innermost_span(meter, tmp_path):
+    path = tmp_path / "profile.folded"
+    prof = profiler.enable(interval=0.001, export_interval=None, path=str(path))
+    with meter.span("outer") as outer:
+        with outer.span("inner"):
+            busy_work(prof)
+    profiler.disable()
+    names = {line.split(";", 1)[0] for line in path.read_text().splitlines()}
+    assert names == {"inner"}
+
+
+def test_no_samples_outside_spans(tmp_path):
+    path = tmp_path / "profile.folded"
+    prof = profiler.SpanProfiler(path=str(path))
+    prof.sample()
+    prof.export()
+    assert prof.sample_count == 0
+    assert not path.exists()
+
+
+def test_other_threads(meter, tmp_path):
+    path = tmp_path / "profile.folded"
+    prof = profiler.SpanProfiler(path=str(path))
+    started = threading.Event()
+    done = threading.Event()
+
+    def worker():
+        with meter.span("worker"):
+            started.set()
+            done.wait(1.0)
+
+    base.add_observer(prof)
+    try:
+        thread = threading.Thread(target=worker)
+        thread.start()
+        started.wait(1.0)
+        prof.sample()
+        done.set()
+        thread.join()
+    finally:
+        base.remove_observer(prof)
+    prof.export()
+    (line,) = path.read_text().splitlines()
+    assert line.startswith("worker;")
+    assert "worker (test_profiler.py:" in line
+    assert prof._spans == {}
+
+
+def test_export_to_active_target(meter, mocker):
+    target = Target(log.ALL)
+    spy = mocker.spy(target, "log")
+    jot.init(target)
+    prof = profiler.enable(interval=0.001, export_interval=None)
+    with meter.span("busy"):
+        busy_work(prof)
+    profiler.disable()
+
+    spy.assert_called_once()
+    level, message, tags = spy.call_args.args[:3]
+    assert level == log.INFO
+    assert message == "Profile of busy"
+    assert tags["span.name"] == "busy"
+    assert tags["profile.samples"] >= 5
+    assert tags["profile.folded"].startswith("busy;")
+
+
+def test_unfinished_span_released(meter):
+    prof = profiler.SpanProfiler(export_interval=None)
+    base.add_observer(prof)
+    try:
+        meter.start("abandoned")
+    finally:
+        base.remove_observer(prof)
+    prof.sample()
+    assert prof._spans == {}
@@ -0,0 +1,109 @@
+import io
+import sqlite3
+
+import pytest
+
+from jot import query
+from jot.base import Meter, Span
+from jot.sqlite import SQLiteTarget
+from jot.util import format_trace_id
+
+
+def add_span(target, name, duration, parent=None, **tags):
+    span = Span(
+        trace_id=parent.trace_id if parent else None,
+        parent_id=parent.id if parent else None,
+        name=name,
+    )
+    span.start()
+    span.duration = duration
+    target.finish(tags, span)
+    return span
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "jot.db")
+    target = SQLiteTarget(path, flush_interval=None)
+    for i in range(1, 11):
+        add_span(target, "request", i * 1_000_000)
+    root = add_span(target, "job", 50_000_000)
+    child = add_span(target, "step", 20_000_000, root)
+    add_span(target, "query", 5_000_000, child)
+    Meter(target, child).warning("slow step")
+    target.close()
+    return path, format_trace_id(root.trace_id)
+
+
+@pytest.fixture
+def db(path):
+    db = query.connect(path[0])
+    yield db
+    db.close()
+
+
+def test_slowest(db):
+    rows = query.slowest(db, limit=3)
+    assert [(r["name"], r["duration"]) for r in rows] == [
+        ("job", 50_000_000),
+        ("step", 20_000_000),
+        ("request", 10_000_000),
+    ]
+
+
+def test_slowest_by_name(db):
+    rows = query.slowest(db, name="request", limit=2)
+    assert [r["duration"] for r in rows] == [10_000_000, 9_000_000]
+
+
+def test_percentiles(db):
+    [request] = query.percentiles(db, name="request")
+    assert request == {
+        "name": "request",
+        "count": 10,
+        "p50": 5_000_000,
+        "p90": 9_000_000,
+        "p99": 10_000_000,
+        "max": 10_000_000,
+    }
+    names = [r["name"] for r in query.percentiles(db)]
+    assert names == ["job", "query", "request", "step"]
+
+
+def test_trace(db, path):
+    [root] = query.trace(db, path[1])
+    assert root["name"] == "job"
+    [step] = root["children"]
+    assert step["name"] == "step"
+    assert [log["message"] for log in step["logs"]] == ["slow step"]
+    assert [c["name"] for c in step["children"]] == ["query"]
+
+
+def test_main_slowest(path):
+    out = io.StringIO()
+    query.main(["slowest", path[0], "--limit", "1"], file=out)
+    assert out.getvalue().split()[:2] == ["50.000ms", "job"]
+
+
+def test_main_percentiles(path):
+    out = io.StringIO()
+    query.main(["percentiles", path[0], "--name", "request"], file=out)
+    header, row = out.getvalue().splitlines()
+    assert header.split() == ["name", "count", "p50", "p90", "p99", "max"]
+    assert row.split() == ["request", "10", "5.000ms", "9.000ms", "10.000ms", "10.000ms"]
+
+
+def test_main_trace(path):
+    out = io.StringIO()
+    query.main(["trace", path[0], path[1]], file=out)
+    assert out.getvalue().splitlines() == [
+        "job 50.000ms",
+        "  step 20.000ms",
+        "    - warning: slow step",
+        "    query 5.000ms",
+    ]
+
+
+def test_missing_database(tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        query.main(["slowest", str(tmp_path / "missing.db")], file=io.StringIO())
@@ -0,0 +1,106 @@
+import logging
+
+import pytest
+
+import jot
+from jot import log
+from jot.base import Meter, Target
+from jot.ratelimit import MESSAGE, FirstThenEvery, RateLimitTarget, TokenBucket
+
+
+@pytest.fixture
+def inner():
+    return Target(log.ALL)
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.allow(0.0) for _ in range(4)] == [True, True, True, False]
+    assert bucket.allow(0.5)
+    assert not bucket.allow(0.5)
+    assert [bucket.allow(10.0) for _ in range(4)] == [True, True, True, False]
+
+
+def test_first_then_every():
+    policy = FirstThenEvery(first=2, every=3)
+    allowed = [policy.allow(0.0) for _ in range(10)]
+    assert allowed == [True, True, False, False, True, False, False, True, False, False]
+
+
+def test_first_then_every_window():
+    policy = FirstThenEvery(first=1, every=0, window=10.0)
+    assert policy.allow(0.0)
+    assert not policy.allow(5.0)
+    assert policy.allow(10.0)
+
+
+def test_limits_call_site(inner, clock, mocker):
+    spy = mocker.spy(inner, "log")
+    target = RateLimitTarget(inner, policy=lambda now: FirstThenEvery(2, 0), clock=clock)
+    meter = Meter(target)
+    for _ in range(5):
+        meter.info("in a loop")
+    meter.info("somewhere else")
+    assert spy.call_count == 3
+    assert target.suppressed == 3
+
+
+def test_suppressed_count_tag(inner, clock, mocker):
+    spy = mocker.spy(inner, "log")
+    target = RateLimitTarget(inner, policy=lambda now: TokenBucket(1, 1, now), clock=clock)
+    for _ in range(4):
+        target.log(log.INFO, "message", {"file": "a.py", "line": 3})
+    assert spy.call_count == 1
+    assert "log.suppressed" not in spy.call_args.args[2]
+
+    clock.now = 1.0
+    target.log(log.INFO, "message", {"file": "a.py", "line": 3})
+    assert spy.call_count == 2
+    assert spy.call_args.args[2]["log.suppressed"] == 3
+
+
+def test_limits_message(inner, clock, mocker):
+    spy = mocker.spy(inner, "log")
+    target = RateLimitTarget(inner, policy=lambda now: FirstThenEvery(1, 0), key=MESSAGE)
+    target.log(log.INFO, "one", {"file": "a.py", "line": 3})
+    target.log(log.INFO, "one", {"file": "b.py", "line": 4})
+    target.log(log.INFO, "two", {"file": "a.py", "line": 3})
+    assert spy.call_count == 2
+
+
+def test_other_methods_not_limited(inner, clock, mocker):
+    spy = mocker.spy(inner, "count")
+    target = RateLimitTarget(inner, policy=lambda now: FirstThenEvery(0, 0), clock=clock)
+    for _ in range(3):
+        target.count("metric", 1, {})
+    assert spy.call_count == 3
+
+
+def test_logging_bridge(inner, clock, mocker):
+    spy = mocker.spy(inner, "log")
+    jot.init(RateLimitTarget(inner, policy=lambda now: FirstThenEvery(1, 0), clock=clock))
+    jot.handle_logs("ratelimit")
+    logger = logging.getLogger("ratelimit")
+    logger.setLevel(logging.DEBUG)
+    try:
+        for i in range(3):
+            logger.info("record %d", i)
+    finally:
+        jot.ignore_logs("ratelimit")
+    assert spy.call_count == 1
+
+
+def test_logging_bridge_message_key(inner, clock, mocker):
+    spy = mocker.spy(inner, "log")
+    policy = lambda now: FirstThenEvery(1, 0)
+    jot.init(RateLimitTarget(inner, policy=policy, key=MESSAGE, clock=clock))
+    jot.handle_logs("ratelimit")
+    logger = logging.getLogger("ratelimit")
+    logger.setLevel(logging.DEBUG)
+    try:
+        for i in range(3):
+            logger.info("record %d", i)
+        logger.info("other %d", 0)
+    finally:
+        jot.ignore_logs("ratelimit")
+    assert [call.args[1] for call in spy.call_args_list] == ["record 0", "other 0"]
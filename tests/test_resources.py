@@ -0,0 +1,87 @@
+import threading
+import tracemalloc
+
+import pytest
+
+from jot import log, resources
+from jot.base import Meter, Target
+
+
+@pytest.fixture
+def target():
+    return Target(log.ALL)
+
+
+@pytest.fixture
+def finish(target, mocker):
+    return mocker.spy(target, "finish")
+
+
+@pytest.fixture
+def meter(target):
+    return Meter(target)
+
+
+@pytest.fixture(autouse=True)
+def cleanup():
+    yield
+    resources.disable()
+
+
+def finished_tags(finish):
+    return finish.call_args.args[0]
+
+
+def test_cpu_time(meter, finish):
+    resources.enable(rusage=False)
+    with meter.span("busy"):
+        sum(i * i for i in range(100000))
+    tags = finished_tags(finish)
+    assert tags["cpu.thread_time_ns"] > 0
+    assert tags["cpu.process_time_ns"] > 0
+    assert "rusage.minor_faults" not in tags
+    assert "memory.allocated_bytes" not in tags
+
+
+@pytest.mark.skipif(resources.resource is None, reason="resource module not available")
+def test_rusage(meter, finish):
+    resources.enable()
+    with meter.span("faults"):
+        bytearray(10 * 1024 * 1024)
+    tags = finished_tags(finish)
+    assert tags["rusage.minor_faults"] >= 0
+    assert tags["rusage.major_faults"] >= 0
+    assert tags["rusage.block_input"] >= 0
+    assert tags["rusage.block_output"] >= 0
+
+
+def test_allocations(meter, finish):
+    was_tracing = tracemalloc.is_tracing()
+    resources.enable(rusage=False, allocations=True)
+    try:
+        with meter.span("allocating"):
+            kept = [object() for _ in range(10000)]
+        assert finished_tags(finish)["memory.allocated_bytes"] > 0
+        del kept
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def test_finished_on_other_thread(meter, finish):
+    resources.enable(rusage=False)
+    child = meter.start("moved")
+    thread = threading.Thread(target=child.finish)
+    thread.start()
+    thread.join()
+    tags = finished_tags(finish)
+    assert "cpu.thread_time_ns" not in tags
+    assert "cpu.process_time_ns" in tags
+
+
+def test_disable(meter, finish):
+    resources.enable()
+    resources.disable()
+    with meter.span("untracked"):
+        pass
+    assert "cpu.process_time_ns" not in finished_tags(finish)
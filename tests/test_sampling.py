@@ -0,0 +1,184 @@
+import pytest
+
+from jot import base, log, sampling
+from jot.base import Meter, Target
+from jot.sampling import AdaptiveSampler
+
+
+@pytest.fixture(autouse=True)
+def cleanup():
+    yield
+    sampling.disable()
+
+
+def run_window(sampler, clock, counts):
+    for name, count in counts.items():
+        for _ in range(count):
+            sampler.sample(name)
+    clock.now += sampler.window
+
+
+def test_new_names_sampled(clock):
+    sampler = AdaptiveSampler(10, clock=clock)
+    assert sampler.sample("request") == (True, 1.0)
+
+
+def test_under_budget(clock):
+    sampler = AdaptiveSampler(100, window=10, clock=clock)
+    run_window(sampler, clock, {"a": 100, "b": 200})
+    sampler.sample("a")
+    assert sampler.rates == {"a": 1.0, "b": 1.0}
+
+
+def test_over_budget(clock):
+    sampler = AdaptiveSampler(10, window=10, min_rate=0.001, clock=clock)
+    run_window(sampler, clock, {"busy": 1000})
+    sampler.sample("busy")
+    assert sampler.rates["busy"] == pytest.approx(0.1)
+
+
+def test_rare_names_kept(clock):
+    sampler = AdaptiveSampler(10, window=10, min_rate=0.001, clock=clock)
+    run_window(sampler, clock, {"busy": 1000, "rare": 10, "medium": 30})
+    sampler.sample("busy")
+    # rare uses 1/s of the budget and medium 3/s, so busy gets the remaining 6/s of its 100/s
+    assert sampler.rates["rare"] == 1.0
+    assert sampler.rates["medium"] == 1.0
+    assert sampler.rates["busy"] == pytest.approx(0.06)
+
+
+def test_budget_shared(clock):
+    sampler = AdaptiveSampler(10, window=10, min_rate=0.001, clock=clock)
+    run_window(sampler, clock, {"a": 1000, "b": 500})
+    sampler.sample("a")
+    assert sampler.rates["a"] == pytest.approx(0.05)
+    assert sampler.rates["b"] == pytest.approx(0.1)
+
+
+def test_min_rate(clock):
+    sampler = AdaptiveSampler(1, window=10, min_rate=0.01, clock=clock)
+    run_window(sampler, clock, {"busy": 100000})
+    sampler.sample("busy")
+    assert sampler.rates["busy"] == 0.01
+
+
+def test_adapts(clock):
+    sampler = AdaptiveSampler(10, window=10, min_rate=0.001, clock=clock)
+    run_window(sampler, clock, {"busy": 1000})
+    run_window(sampler, clock, {"busy": 20000})
+    sampler.sample("busy")
+    assert sampler.rates["busy"] == pytest.approx(0.005)
+
+
+def test_random_decision(clock):
+    values = iter([0.05, 0.5])
+    sampler = AdaptiveSampler(
+        10, window=10, min_rate=0.001, clock=clock, random=lambda: next(values)
+    )
+    run_window(sampler, clock, {"busy": 1000})
+    assert sampler.sample("busy") == (True, pytest.approx(0.1))
+    assert sampler.sample("busy") == (False, pytest.approx(0.1))
+
+
+def test_invalid_budget():
+    with pytest.raises(ValueError):
+        AdaptiveSampler(0)
+
+
+class FixedSampler:
+    def __init__(self, sampled, rate):
+        self.result = (sampled, rate)
+        self.names = []
+
+    def sample(self, name):
+        self.names.append(name)
+        return self.result
+
+
+@pytest.fixture
+def target():
+    return Target(log.ALL)
+
+
+def test_unsampled_span_not_finished(target, mocker):
+    finish = mocker.spy(target, "finish")
+    sampler = FixedSampler(False, 0.25)
+    base.set_sampler(sampler)
+    with Meter(target).span("root") as root:
+        with root.span("child") as child:
+            assert child.active_span.sampled is False
+    finish.assert_not_called()
+    assert sampler.names == ["root"]
+
+
+def test_sampled_span_tagged(target, mocker):
+    finish = mocker.spy(target, "finish")
+    base.set_sampler(FixedSampler(True, 0.25))
+    with Meter(target).span("root") as root:
+        with root.span("child"):
+            pass
+    assert [call.args[0]["sampling.rate"] for call in finish.call_args_list] == [0.25, 0.25]
+
+
+def test_full_rate_not_tagged(target, mocker):
+    finish = mocker.spy(target, "finish")
+    base.set_sampler(FixedSampler(True, 1.0))
+    with Meter(target).span("root"):
+        pass
+    assert "sampling.rate" not in finish.call_args.args[0]
+
+
+def test_remote_parent_not_sampled_locally(target, mocker):
+    sampler = FixedSampler(False, 0.25)
+    base.set_sampler(sampler)
+    span = Meter(target).span("remote", trace_id=b"1" * 16, parent_id=b"2" * 8)
+    assert span.active_span.sampled is True
+    assert sampler.names == []
+
+
+def test_unsampled_logs_still_delivered(target, mocker):
+    log_spy = mocker.spy(target, "log")
+    base.set_sampler(FixedSampler(False, 0.25))
+    with Meter(target).span("root") as root:
+        root.info("hello")
+    log_spy.assert_called_once()
+
+
+def test_enable():
+    sampler = sampling.enable(100, window=5, min_rate=0.1)
+    assert base._sampler is sampler
+    assert sampler.window == 5
+    sampling.disable()
+    assert base._sampler is None
+
+
+def test_unsampled_spans_reach_span_metrics(target, mocker):
+    from jot.spanmetrics import SpanMetricsTarget
+
+    finish = mocker.spy(target, "finish")
+    count = mocker.spy(target, "count")
+    metrics = SpanMetricsTarget(target, interval=0)
+    base.set_sampler(FixedSampler(False, 0.01))
+    try:
+        for _ in range(100):
+            with Meter(metrics).span("request"):
+                pass
+        metrics.export()
+    finally:
+        metrics.close()
+    finish.assert_not_called()
+    requests = [c.args[1] for c in count.call_args_list if c.args[0] == "span_requests"]
+    assert requests == [100]
+
+
+def test_unsampled_traces_release_buffers(target, mocker):
+    from jot.tracebuffer import TraceBufferTarget
+
+    finish = mocker.spy(target, "finish")
+    buffer = TraceBufferTarget(target)
+    base.set_sampler(FixedSampler(False, 0.01))
+    for _ in range(50):
+        with Meter(buffer).span("request") as span:
+            span.debug("detail")
+    finish.assert_not_called()
+    assert len(buffer._traces) == 0
@@ -131,3 +131,21 @@ def test_from_environment_with_no_dsn(monkeypatch, mocker):
 
     target = SentryTarget.from_environment()
     assert target is None
+
+
+def test_abandoned_spans_are_evicted(mocker):
+    mocker.patch("sentry_sdk.start_transaction")
+    target = SentryTarget(dsn=DSN, environment=ENV_NAME, max_spans=2)
+    for _ in range(3):
+        target.start({}, Span(name="abandoned"))
+    assert len(target.spans) == 2
+    assert target.spans.evicted_overflow == 1
+
+
+def test_finish_unsampled_discards_span(target, span, mocker):
+    target.start({}, span)
+    mock = mocker.patch.object(target.spans[span.id].__class__, "finish")
+    target.finish_unsampled({}, span)
+
+    assert len(target.spans) == 0
+    mock.assert_not_called()
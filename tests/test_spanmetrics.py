@@ -0,0 +1,108 @@
+import pytest
+
+from jot import log
+from jot.base import Meter, Span, Target
+from jot.spanmetrics import SpanMetricsTarget
+
+
+@pytest.fixture
+def inner():
+    return Target(log.ALL)
+
+
+@pytest.fixture
+def target(inner):
+    target = SpanMetricsTarget(inner, tag_keys=["route"], buckets=[0.1, 1.0], interval=None)
+    yield target
+    target.close()
+
+
+def finish_span(target, name, seconds, failed=False, **tags):
+    span = Span(name=name)
+    span.start()
+    if failed:
+        target.error("failed", ValueError("oops"), {}, span)
+    span.duration = int(seconds * 1e9)
+    target.finish(tags, span)
+
+
+def counts(spy):
+    return {
+        (call.args[0], tuple(sorted(call.args[2].items()))): call.args[1]
+        for call in spy.call_args_list
+    }
+
+
+def test_red_metrics(target, inner, mocker):
+    count = mocker.spy(inner, "count")
+    magnitude = mocker.spy(inner, "magnitude")
+    finish_span(target, "handle", 0.05, route="/a")
+    finish_span(target, "handle", 0.5, route="/a", failed=True)
+    finish_span(target, "handle", 5.0, route="/a", other="ignored")
+    finish_span(target, "handle", 0.05, route="/b")
+    target.export()
+
+    results = counts(count)
+    a = (("route", "/a"), ("span_name", "handle"))
+    assert results[("span_requests", a)] == 3
+    assert results[("span_errors", a)] == 1
+    assert results[("span_duration_seconds_bucket", (("le", "0.1"), *a))] == 1
+    assert results[("span_duration_seconds_bucket", (("le", "1.0"), *a))] == 2
+    assert results[("span_duration_seconds_bucket", (("le", "+Inf"), *a))] == 3
+
+    b = (("route", "/b"), ("span_name", "handle"))
+    assert results[("span_requests", b)] == 1
+    assert results[("span_errors", b)] == 0
+
+    assert results[("span_duration_seconds_sum", a)] == pytest.approx(5.55)
+    assert results[("span_duration_seconds_sum", b)] == pytest.approx(0.05)
+    magnitude.assert_not_called()
+
+
+def test_export_resets(target, inner, mocker):
+    count = mocker.spy(inner, "count")
+    finish_span(target, "handle", 0.05)
+    target.export()
+    count.reset_mock()
+    target.export()
+    count.assert_not_called()
+
+
+def test_missing_tag_key(target, inner, mocker):
+    count = mocker.spy(inner, "count")
+    finish_span(target, "handle", 0.05)
+    target.export()
+    assert count.call_args_list[0].args[2] == {"span_name": "handle", "route": ""}
+
+
+def test_forwards_spans(target, inner, mocker):
+    finish = mocker.spy(inner, "finish")
+    finish_span(target, "handle", 0.05)
+    finish.assert_called_once()
+
+
+def test_without_forwarding_spans(inner, mocker):
+    finish = mocker.spy(inner, "finish")
+    target = SpanMetricsTarget(inner, interval=None, forward_spans=False)
+    with Meter(target).span("handle"):
+        pass
+    finish.assert_not_called()
+    target.close()
+
+
+def test_separate_metrics_target(inner, mocker):
+    metrics = Target()
+    count = mocker.spy(metrics, "count")
+    target = SpanMetricsTarget(inner, metrics_target=metrics, interval=None)
+    finish_span(target, "handle", 0.05)
+    target.export()
+    assert count.called
+    target.close()
+
+
+def test_context_manager_error(target, inner, mocker):
+    count = mocker.spy(inner, "count")
+    with pytest.raises(ValueError), Meter(target).span("handle"):
+        raise ValueError("oops")
+    target.export()
+    assert counts(count)[("span_errors", (("route", ""), ("span_name", "handle")))] == 1
@@ -0,0 +1,141 @@
+import json
+import sqlite3
+from decimal import Decimal
+
+import pytest
+
+from jot import flush, log
+from jot.base import Meter
+from jot.sqlite import SQLiteTarget
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "jot.db")
+
+
+@pytest.fixture
+def target(path):
+    target = SQLiteTarget(path, flush_interval=None, level=log.ALL)
+    yield target
+    target.close()
+
+
+def rows(path, sql):
+    db = sqlite3.connect(path)
+    try:
+        return db.execute(sql).fetchall()
+    finally:
+        db.close()
+
+
+def test_wal_mode(target, path):
+    assert rows(path, "PRAGMA journal_mode") == [("wal",)]
+
+
+def test_indexes(target, path):
+    names = {name for (name,) in rows(path, "SELECT name FROM sqlite_master WHERE type='index'")}
+    assert {"spans_trace_id", "spans_name_duration", "spans_duration"} <= names
+
+
+def test_spans(target, path):
+    meter = Meter(target, None, service="test")
+    with meter.span("outer", color="red") as outer:
+        with outer.span("inner") as inner:
+            inner.event("checkpoint")
+    assert rows(path, "SELECT COUNT(*) FROM spans") == [(0,)]
+
+    target.flush()
+    spans = rows(path, "SELECT span_id, parent_id, name, duration, tags FROM spans")
+    (inner_id, inner_parent, inner_name, _, _), (outer_id, outer_parent, _, duration, tags) = spans
+    assert inner_name == "inner"
+    assert inner_parent == outer_id
+    assert outer_parent is None
+    assert duration > 0
+    assert json.loads(tags) == {"service": "test", "color": "red"}
+    assert rows(path, "SELECT span_id, name FROM events") == [(inner_id, "checkpoint")]
+
+
+def test_logs_and_errors(target, path):
+    meter = Meter(target)
+    with meter.span("work") as span:
+        span.info("hello", n=1)
+        try:
+            raise ValueError("oops")
+        except ValueError as e:
+            span.error("failed", e)
+    target.flush()
+
+    logs = rows(path, "SELECT level, message, tags FROM logs ORDER BY timestamp")
+    assert [(level, message) for level, message, _ in logs] == [
+        (log.INFO, "hello"),
+        (log.ERROR, "failed"),
+    ]
+    assert json.loads(logs[1][2])["exception.type"] == "ValueError"
+
+
+def test_metrics(target, path):
+    meter = Meter(target)
+    meter.magnitude("load", 0.5)
+    meter.count("requests", 3)
+    target.flush()
+    assert rows(path, "SELECT kind, name, value FROM metrics") == [
+        ("magnitude", "load", 0.5),
+        ("count", "requests", 3.0),
+    ]
+
+
+def test_unsupported_values_coerced(target, path):
+    meter = Meter(target)
+    meter.magnitude("a", 1)
+    meter.magnitude("b", Decimal("1.5"))
+    meter.info(ValueError("not a string"))
+    target.flush()
+    assert rows(path, "SELECT name, value FROM metrics") == [("a", 1.0), ("b", 1.5)]
+    assert rows(path, "SELECT message FROM logs") == [("not a string",)]
+
+
+def test_write_error_reported(target, path, capsys):
+    from jot import stats
+
+    stats.reset()
+    Meter(target).count("requests", 1)
+    target._db.execute("DROP TABLE metrics")
+    target.flush()
+    assert "SQLite error: no such table: metrics" in capsys.readouterr().err
+    assert stats.snapshot()["targets"][f"SQLiteTarget:{path}"]["failures"] == 1
+    stats.reset()
+
+
+def test_max_pending(path):
+    target = SQLiteTarget(path, flush_interval=None, max_pending=2)
+    meter = Meter(target)
+    for _ in range(3):
+        meter.count("requests", 1)
+    assert target.dropped == 1
+    target.close()
+    assert rows(path, "SELECT COUNT(*) FROM metrics") == [(2,)]
+
+
+def test_close_flushes(path):
+    target = SQLiteTarget(path, flush_interval=None)
+    Meter(target).count("requests", 1)
+    target.close()
+    assert target.flush not in flush._flush_handlers
+    assert rows(path, "SELECT COUNT(*) FROM metrics") == [(1,)]
+
+
+def test_flush_handler(target):
+    assert target.flush in flush._flush_handlers
+
+
+def test_from_environment(monkeypatch, path):
+    monkeypatch.setenv("JOT_SQLITE_PATH", path)
+    target = SQLiteTarget.from_environment()
+    assert target.path == path
+    target.close()
+
+
+def test_from_environment_unset(monkeypatch):
+    monkeypatch.delenv("JOT_SQLITE_PATH", raising=False)
+    assert SQLiteTarget.from_environment() is None
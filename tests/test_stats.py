@@ -0,0 +1,214 @@
+import queue
+
+import pytest
+
+from jot import stats
+from jot.base import Meter, Target
+
+
+class Owner:
+    def __init__(self, size=10):
+        self.queue = queue.Queue(size)
+
+
+def test_queue_depths():
+    owner = Owner()
+    owner.queue.put(1)
+    owner.dropped = 3
+    stats.register_queue("test", owner)
+    assert stats.queue_depths()["test"] == {"depth": 1, "capacity": 10, "dropped": 3}
+    stats.unregister_queue("test", owner)
+    assert "test" not in stats.queue_depths()
+
+
+def test_dropped_optional():
+    owner = Owner()
+    stats.register_queue("test", owner)
+    assert stats.queue_depths()["test"]["dropped"] == 0
+    stats.unregister_queue("test", owner)
+
+
+def test_unregister_other_owner():
+    first, second = Owner(), Owner()
+    stats.register_queue("test", first)
+    stats.register_queue("test", second)
+    stats.unregister_queue("test", first)
+    assert "test" in stats.queue_depths()
+    stats.unregister_queue("test", second)
+
+
+def test_held_weakly():
+    stats.register_queue("test", Owner())
+    assert "test" not in stats.queue_depths()
+
+
+def test_log_listener_registered():
+    from jot.logger import LogListener
+
+    listener = LogListener()
+    assert stats.queue_depths()["logging"]["capacity"] == listener.queue.maxsize
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    stats.reset()
+    yield
+    stats.disable_reporting()
+    stats.reset()
+
+
+def test_record_export():
+    stats.record_export("test", items=3, size=100, duration=0.02)
+    stats.record_export("test", items=2, size=50, duration=2.0, failed=True)
+    snapshot = stats.snapshot()["targets"]["test"]
+    assert snapshot["sent"] == 3
+    assert snapshot["bytes"] == 100
+    assert snapshot["failures"] == 1
+    duration = snapshot["duration"]
+    assert duration["count"] == 2
+    assert duration["sum"] == pytest.approx(2.02)
+    assert duration["max"] == 2.0
+    assert duration["buckets"]["0.05"] == 1
+    assert duration["buckets"]["5.0"] == 1
+
+
+def test_unknown_size():
+    stats.record_export("test", items=2)
+    assert stats.snapshot()["targets"]["test"]["bytes"] is None
+
+
+def test_report_skips_unknown_size(mocker):
+    target = Target()
+    count = mocker.spy(target, "count")
+    stats.record_export("test", items=2)
+    stats.Reporter(target).report()
+    assert [c.args[0] for c in count.call_args_list] == ["jot.exporter.sent"]
+
+
+def test_record_drop():
+    stats.record_drop("test", 5)
+    assert stats.snapshot()["targets"]["test"]["dropped"] == 5
+
+
+def test_snapshot_includes_queues():
+    owner = Owner()
+    stats.register_queue("test", owner)
+    assert stats.snapshot()["queues"]["test"]["capacity"] == 10
+    stats.unregister_queue("test", owner)
+
+
+def test_report_deltas(mocker):
+    target = Target()
+    count = mocker.spy(target, "count")
+    magnitude = mocker.spy(target, "magnitude")
+    reporter = stats.Reporter(target)
+
+    stats.record_export("test", items=3, size=100, duration=0.1)
+    stats.record_export("test", items=1, size=10, duration=0.3)
+    reporter.report()
+    counts = {c.args[0]: c.args[1] for c in count.call_args_list if c.args[2] == {"target": "test"}}
+    assert counts == {"jot.exporter.sent": 4, "jot.exporter.bytes": 110}
+    mean = {c.args[0]: c.args[1] for c in magnitude.call_args_list}
+    assert mean["jot.exporter.duration"] == pytest.approx(0.2)
+    assert mean["jot.exporter.duration.max"] == pytest.approx(0.3)
+
+    count.reset_mock()
+    magnitude.reset_mock()
+    stats.record_export("test", failed=True)
+    reporter.report()
+    counts = {c.args[0]: c.args[1] for c in count.call_args_list if c.args[2] == {"target": "test"}}
+    assert counts == {"jot.exporter.failures": 1}
+
+
+def test_report_queues(mocker):
+    target = Target()
+    count = mocker.spy(target, "count")
+    magnitude = mocker.spy(target, "magnitude")
+    owner = Owner()
+    owner.queue.put(1)
+    owner.dropped = 2
+    stats.register_queue("test", owner)
+    stats.Reporter(target).report()
+    assert mocker.call("jot.queue.depth", 1, {"queue": "test"}) in magnitude.call_args_list
+    assert mocker.call("jot.queue.dropped", 2, {"queue": "test"}) in count.call_args_list
+    stats.unregister_queue("test", owner)
+
+
+def test_report_to_active_target(mocker):
+    target = Target()
+    mocker.patch("jot.facade.active_meter", Meter(target))
+    count = mocker.spy(target, "count")
+    stats.record_export("test")
+    stats.Reporter().report()
+    assert count.called
+
+
+def test_enable_reporting():
+    reporter = stats.enable_reporting(Target(), interval=60.0)
+    assert reporter._periodic.is_running
+    stats.disable_reporting()
+    assert not reporter._periodic.is_running
+
+
+def test_zipkin_records_export(requests_mock):
+    from jot.zipkin import ZipkinTarget
+
+    target = ZipkinTarget("http://example.com/post")
+    requests_mock.post(target.url, status_code=202)
+    target._send([{"id": "1"}])
+    requests_mock.post(target.url, status_code=500)
+    target._send([{"id": "2"}])
+    snapshot = stats.snapshot()["targets"]["ZipkinTarget:http://example.com/post"]
+    assert snapshot["sent"] == 1
+    assert snapshot["bytes"] == len(b'[{"id": "1"}]')
+    assert snapshot["failures"] == 1
+    assert snapshot["duration"]["count"] == 2
+
+
+def test_exporter_instances_recorded_separately(requests_mock):
+    from jot.influxdb import InfluxDB3Target
+    from jot.zipkin import ZipkinTarget
+
+    requests_mock.post("http://example.com/post", status_code=202)
+    ZipkinTarget("http://example.com/post")._send([{"id": "1"}])
+    ZipkinTarget("http://example.com/post", name="backup")._send([{"id": "2"}])
+    target = InfluxDB3Target("http://example.com", "bench")
+    requests_mock.post(target.url, status_code=204)
+    target.count("requests", 1, {})
+    assert list(stats.snapshot()["targets"]) == [
+        "InfluxDB3Target:http://example.com/api/v3/write_lp?db=bench",
+        "ZipkinTarget:backup",
+        "ZipkinTarget:http://example.com/post",
+    ]
+
+
+def test_fanout_records_failures():
+    from jot.fanout import FanOutTarget
+
+    class BrokenTarget(Target):
+        def count(self, name, value, tags, span=None):
+            raise RuntimeError("broken")
+
+    FanOutTarget(BrokenTarget()).count("requests", 1, {})
+    assert stats.snapshot()["targets"]["BrokenTarget"]["failures"] == 1
+
+
+def test_fanout_records_failures_by_exporter_name(mocker):
+    from jot import overhead
+    from jot.fanout import FanOutTarget
+    from jot.zipkin import ZipkinTarget
+
+    class BrokenZipkin(ZipkinTarget):
+        def count(self, name, value, tags, span=None):
+            raise RuntimeError("broken")
+
+    fanout = FanOutTarget(BrokenZipkin("http://example.com/post", name="broken"))
+    mocker.patch("jot.facade.active_meter", Meter(fanout))
+    # the profiler wraps the targets of the fan-out in TimedTargets
+    overhead.enable()
+    try:
+        assert isinstance(fanout.targets[0], overhead.TimedTarget)
+        fanout.count("requests", 1, {})
+    finally:
+        overhead.disable()
+    assert stats.snapshot()["targets"]["BrokenZipkin:broken"]["failures"] == 1
@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from jot.store import BoundedStore
+
+
+@pytest.fixture
+def store(clock):
+    return BoundedStore(max_size=3, ttl=10.0, clock=clock)
+
+
+def test_set_and_get(store):
+    store["a"] = 1
+    assert store["a"] == 1
+    assert store.get("a") == 1
+    assert "a" in store
+    assert len(store) == 1
+
+
+def test_missing(store):
+    assert store.get("a") is None
+    assert store.get("a", 7) == 7
+    assert "a" not in store
+    with pytest.raises(KeyError):
+        store["a"]
+
+
+def test_pop(store):
+    store["a"] = 1
+    assert store.pop("a") == 1
+    assert store.pop("a") is None
+    assert len(store) == 0
+
+
+def test_get_or_create(store):
+    first = store.get_or_create("a", list)
+    second = store.get_or_create("a", list)
+    assert first is second
+    assert len(store) == 1
+
+
+def test_overflow(store):
+    for key in "abcd":
+        store[key] = key
+    assert len(store) == 3
+    assert "a" not in store
+    assert store.evicted_overflow == 1
+    assert store.evicted == 1
+
+
+def test_ttl(store, clock):
+    store["a"] = 1
+    clock.now = 5.0
+    store["b"] = 2
+    clock.now = 10.0
+    assert "a" not in store
+    assert store["b"] == 2
+    assert store.evicted_expired == 1
+
+
+def test_ttl_evicted_on_insert(store, clock):
+    store["a"] = 1
+    store["b"] = 2
+    clock.now = 11.0
+    store["c"] = 3
+    assert len(store) == 1
+    assert store.evicted_expired == 2
+
+
+def test_evict_expired(store, clock):
+    store["a"] = 1
+    clock.now = 11.0
+    store.evict_expired()
+    assert len(store) == 0
+    assert store.evicted_expired == 1
+
+
+def test_items(store, clock):
+    store["a"] = 1
+    clock.now = 5.0
+    store["b"] = 2
+    assert store.items() == [("a", 1), ("b", 2)]
+    clock.now = 12.0
+    assert store.items() == [("b", 2)]
+
+
+def test_reinsert_refreshes(store, clock):
+    store["a"] = 1
+    clock.now = 5.0
+    store["a"] = 2
+    clock.now = 12.0
+    assert store["a"] == 2
+
+
+def test_unbounded():
+    store = BoundedStore(max_size=None, ttl=None)
+    for i in range(100):
+        store[i] = i
+    assert len(store) == 100
+    assert store.evicted == 0
+
+
+def test_concurrent_access():
+    store = BoundedStore(max_size=50)
+
+    def work(n):
+        for i in range(1000):
+            store.get_or_create((n, i % 100), list)
+            store.pop((n, (i + 50) % 100))
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(store) <= 50
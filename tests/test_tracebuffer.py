@@ -0,0 +1,136 @@
+import pytest
+
+from jot import log
+from jot.base import Meter, Target
+from jot.tracebuffer import TraceBufferTarget
+
+
+@pytest.fixture
+def inner():
+    return Target(log.ALL)
+
+
+@pytest.fixture
+def target(inner):
+    return TraceBufferTarget(inner, max_records=3)
+
+
+@pytest.fixture
+def logspy(inner, mocker):
+    return mocker.spy(inner, "log")
+
+
+def messages(spy):
+    return [call.args[1] for call in spy.call_args_list]
+
+
+def boom():
+    try:
+        1 / 0
+    except ZeroDivisionError as e:
+        return e
+
+
+def test_accepts_log_level(target):
+    assert target.accepts_log_level(log.DEBUG)
+    assert not target.accepts_log_level(log.ALL)
+
+
+def test_severe_logs_forwarded(target, logspy):
+    root = Meter(target).start("root")
+    root.warning("warning")
+    assert messages(logspy) == ["warning"]
+
+
+def test_logs_without_span(target, logspy):
+    meter = Meter(target)
+    meter.warning("warning")
+    meter.debug("debug")
+    assert messages(logspy) == ["warning"]
+
+
+def test_discarded_on_clean_finish(target, logspy):
+    root = Meter(target).start("root")
+    root.info("info")
+    child = root.start("child")
+    child.debug("debug")
+    child.finish()
+    assert logspy.call_count == 0
+    root.finish()
+    assert logspy.call_count == 0
+    assert len(target._traces) == 0
+
+
+def test_remote_parent_is_local_root(target, logspy):
+    for _ in range(5):
+        root = Meter(target).start("request", trace_id=b"1" * 16, parent_id=b"2" * 8)
+        child = root.start("child")
+        child.debug("debug")
+        child.finish()
+        assert len(target._traces) == 1
+        root.finish()
+    assert logspy.call_count == 0
+    assert len(target._traces) == 0
+
+
+def test_forwarded_on_error(target, inner, logspy, mocker):
+    error = mocker.spy(inner, "error")
+    root = Meter(target).start("root")
+    root.info("info")
+    child = root.start("child")
+    child.debug("debug")
+    child.error("failed", boom())
+    assert messages(logspy) == ["info", "debug"]
+    error.assert_called_once()
+
+    # the rest of the trace is forwarded directly
+    child.debug("after")
+    assert messages(logspy) == ["info", "debug", "after"]
+    child.finish()
+    root.finish()
+    assert len(target._traces) == 0
+
+
+def test_traces_are_separate(target, logspy):
+    one = Meter(target).start("one")
+    two = Meter(target).start("two")
+    one.info("one")
+    two.info("two")
+    two.error("failed", boom())
+    assert messages(logspy) == ["two"]
+    one.finish()
+    two.finish()
+
+
+def test_buffer_is_bounded(target, logspy):
+    root = Meter(target).start("root")
+    for i in range(5):
+        root.debug(f"debug {i}")
+    root.error("failed", boom())
+    assert messages(logspy) == ["debug 2", "debug 3", "debug 4"]
+
+
+def test_forwarded_when_slow(inner, logspy):
+    target = TraceBufferTarget(inner, latency_threshold=1.0)
+    root = Meter(target).start("root")
+    root.info("info")
+    root.active_span.duration = 2_000_000_000
+    target.finish({}, root.active_span)
+    assert messages(logspy) == ["info"]
+
+
+def test_not_forwarded_when_fast(inner, logspy):
+    target = TraceBufferTarget(inner, latency_threshold=1.0)
+    root = Meter(target).start("root")
+    root.info("info")
+    root.finish()
+    assert logspy.call_count == 0
+
+
+def test_buffer_level(inner, logspy):
+    target = TraceBufferTarget(inner, buffer_level=log.INFO)
+    root = Meter(target).start("root")
+    root.info("info")
+    target.log(log.DEBUG, "debug", {}, root.active_span)
+    root.error("failed", boom())
+    assert messages(logspy) == ["info"]
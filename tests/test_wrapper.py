@@ -0,0 +1,45 @@
+import pytest
+
+from jot import log
+from jot.base import Span, Target
+from jot.wrapper import WrapperTarget
+
+
+@pytest.fixture
+def inner():
+    return Target(log.WARNING)
+
+
+@pytest.fixture
+def target(inner):
+    return WrapperTarget(inner)
+
+
+def test_default_target():
+    target = WrapperTarget()
+    assert isinstance(target.target, Target)
+
+
+def test_accepts_log_level(target):
+    assert target.accepts_log_level(log.WARNING)
+    assert not target.accepts_log_level(log.INFO)
+
+
+@pytest.mark.parametrize(
+    "method_name,args",
+    [
+        ("start", ()),
+        ("finish", ()),
+        ("event", ("event-name",)),
+        ("log", (log.WARNING, "message")),
+        ("error", ("message", ValueError("oops"))),
+        ("magnitude", ("metric", 3.5)),
+        ("count", ("metric", 2)),
+    ],
+)
+def test_forwards(target, inner, mocker, method_name, args):
+    spy = mocker.spy(inner, method_name)
+    span = Span()
+    tags = {"plonk": 42}
+    getattr(target, method_name)(*args, tags, span)
+    spy.assert_called_once_with(*args, tags, span)